@@ -12,13 +12,19 @@ class UserAdmin(BaseUserAdmin):
     list_display = ('username', 'email', 'role', 'organization', 'country', 'is_active', 'is_blocked', 'date_joined')
     list_filter = ('role', 'is_active', 'is_blocked', 'country')
     search_fields = ('username', 'email', 'organization', 'country')
-    readonly_fields = ('date_joined', 'last_login')
+    readonly_fields = (
+        'date_joined', 'last_login',
+        'active_modules_count', 'likes_received_count', 'publications_count'
+    )
     inlines = [UserProfileInline]
 
     fieldsets = BaseUserAdmin.fieldsets + (
         ('Additional Info', {
             'fields': ('role', 'organization', 'country', 'phone', 'is_blocked')
         }),
+        ('Contribution', {
+            'fields': ('active_modules_count', 'likes_received_count', 'publications_count')
+        }),
     )
 
 @admin.register(UserProfile)
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.accounts.stats import find_drifted_users, recount_user_stats
+
+
+class Command(BaseCommand):
+    help = 'Find and repair drift in denormalized per-user contribution counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report drifted users')
+
+    def handle(self, *args, **options):
+        drifted = find_drifted_users()
+        for user_id, diff in drifted:
+            details = ', '.join(
+                f'{field}: {stored} -> {actual}' for field, (stored, actual) in sorted(diff.items())
+            )
+            self.stdout.write(f'user {user_id}: {details}')
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('✓ All user counters are consistent'))
+            return
+        if options['dry_run']:
+            self.stdout.write(self.style.ERROR(f'✗ {len(drifted)} users have drifted counters'))
+            return
+
+        with transaction.atomic():
+            recount_user_stats([user_id for user_id, _ in drifted])
+        self.stdout.write(self.style.SUCCESS(f'✓ Repaired counters of {len(drifted)} users'))
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:53
+
+from django.db import migrations, models
+
+
+def fill_counters(apps, schema_editor):
+    from apps.accounts.stats import expected_user_stats
+
+    User = apps.get_model('accounts', 'User')
+    User.objects.update(**expected_user_stats(apps))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('ai_modules', '0014_populate_availability_usagestatus'),
+        ('publications', '0004_alter_publication_ai_module'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='active_modules_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Active modules'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='likes_received_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Likes received'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='publications_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Publications'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
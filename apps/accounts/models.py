@@ -2,8 +2,15 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
-class User(AbstractUser):
+from apps.common.tracking import FieldTrackerMixin
+
+from .stats import COUNTER_FIELDS
+
+class User(FieldTrackerMixin, AbstractUser):
     """Расширенная модель пользователя"""
+
+    # Изменения отслеживаются для версий данных (apps.common.versions)
+    tracker_exclude = ('password', 'last_login', 'updated_at')
     
     class Role(models.TextChoices):
         GUEST = 'guest', _('Guest')
@@ -22,12 +29,33 @@ class User(AbstractUser):
     country = models.CharField(max_length=100, blank=True, verbose_name=_('Country'))
     phone = models.CharField(max_length=20, blank=True, verbose_name=_('Phone'))
     is_blocked = models.BooleanField(default=False, verbose_name=_('Is blocked'))
+
+    # Денормализованные счетчики вклада (apps/accounts/stats.py)
+    active_modules_count = models.PositiveIntegerField(default=0, verbose_name=_('Active modules'))
+    likes_received_count = models.PositiveIntegerField(default=0, verbose_name=_('Likes received'))
+    publications_count = models.PositiveIntegerField(default=0, verbose_name=_('Publications'))
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     def is_admin(self):
         return self.is_superuser or self.role == self.Role.ADMIN
 
+    def save(self, *args, **kwargs):
+        # Счетчики вклада меняются только атомарными UPDATE (apps/accounts/stats.py):
+        # обычное сохранение не должно перезаписывать их значениями, загруженными раньше
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            update_fields = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in deferred
+            ]
+        if update_fields is not None:
+            kwargs['update_fields'] = [
+                name for name in update_fields if name not in COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = _('User')
         verbose_name_plural = _('Users')
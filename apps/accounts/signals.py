@@ -0,0 +1,75 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.ai_modules.models import AIModule, AIModuleLike
+from apps.publications.models import Publication
+
+from .stats import adjust_module_owner_stats, adjust_user_stats
+
+
+@receiver(post_save, sender=AIModule)
+def track_module_stats(sender, instance, created, **kwargs):
+    """Активные модули: переход статуса в active и обратно, смена автора"""
+    is_active = instance.status == AIModule.Status.ACTIVE
+    if created:
+        if is_active:
+            adjust_user_stats(instance.created_by_id, active_modules_count=1)
+        return
+
+    changes = getattr(instance, 'saved_changes', {})
+    old_status = changes['status'][0] if 'status' in changes else instance.status
+    old_owner = changes['created_by'][0] if 'created_by' in changes else instance.created_by_id
+    was_active = old_status == AIModule.Status.ACTIVE
+
+    if old_owner != instance.created_by_id:
+        # Лайки и публикации переходят вместе с модулем
+        likes = instance.likes.count()
+        publications = instance.publications.count()
+        adjust_user_stats(
+            old_owner,
+            active_modules_count=-int(was_active),
+            likes_received_count=-likes,
+            publications_count=-publications,
+        )
+        adjust_user_stats(
+            instance.created_by_id,
+            active_modules_count=int(is_active),
+            likes_received_count=likes,
+            publications_count=publications,
+        )
+    elif was_active != is_active:
+        adjust_user_stats(instance.created_by_id, active_modules_count=1 if is_active else -1)
+
+
+@receiver(post_delete, sender=AIModule)
+def untrack_module_stats(sender, instance, **kwargs):
+    # Лайки и публикации удаляются каскадно и вычитаются своими сигналами
+    if instance.status == AIModule.Status.ACTIVE:
+        adjust_user_stats(instance.created_by_id, active_modules_count=-1)
+
+
+@receiver(post_save, sender=AIModuleLike)
+def track_like_stats(sender, instance, created, **kwargs):
+    if created:
+        adjust_module_owner_stats(instance.ai_module_id, likes_received_count=1)
+
+
+@receiver(post_delete, sender=AIModuleLike)
+def untrack_like_stats(sender, instance, **kwargs):
+    adjust_module_owner_stats(instance.ai_module_id, likes_received_count=-1)
+
+
+@receiver(post_save, sender=Publication)
+def track_publication_stats(sender, instance, created, **kwargs):
+    changes = getattr(instance, 'saved_changes', {})
+    if created:
+        adjust_module_owner_stats(instance.ai_module_id, publications_count=1)
+    elif 'ai_module' in changes:
+        old_module, new_module = changes['ai_module']
+        adjust_module_owner_stats(old_module, publications_count=-1)
+        adjust_module_owner_stats(new_module, publications_count=1)
+
+
+@receiver(post_delete, sender=Publication)
+def untrack_publication_stats(sender, instance, **kwargs):
+    adjust_module_owner_stats(instance.ai_module_id, publications_count=-1)
@@ -0,0 +1,128 @@
+"""
+Денормализованные счетчики вклада пользователя.
+
+User.active_modules_count, likes_received_count и publications_count
+обновляются сигналами (apps/accounts/signals.py) атомарными UPDATE ... + N
+в транзакции изменения. Массовые .update() сигналов не вызывают —
+после них счетчики пересчитываются командой repair_user_stats.
+"""
+from django.apps import apps as global_apps
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from apps.common import leaderboards
+from apps.common.versions import bump_versions
+
+ACTIVE_STATUS = 'active'
+
+COUNTER_FIELDS = ('active_modules_count', 'likes_received_count', 'publications_count')
+
+
+def _adjust(users, deltas):
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    users.update(**{
+        field: Greatest(F(field) + delta, 0) for field, delta in deltas.items()
+    })
+    bump_versions(['users'])
+
+
+def adjust_user_stats(user_id, **deltas):
+    """
+    Изменить счетчики пользователя на delta.
+
+    Пример: adjust_user_stats(user_id, likes_received_count=-1)
+    """
+    from apps.accounts.models import User
+
+    if user_id is not None:
+        users = User.objects.filter(pk=user_id)
+        _adjust(users, deltas)
+        # Неактивных пользователей в рейтинге нет (leaderboards._contributor_scores)
+        if deltas.get('active_modules_count') and users.filter(is_active=True).exists():
+            leaderboards.contributors.incr(user_id, deltas['active_modules_count'])
+
+
+def adjust_module_owner_stats(module_id, **deltas):
+    """То же для автора модуля, без отдельного запроса за created_by"""
+    from apps.accounts.models import User
+
+    if module_id is not None:
+        _adjust(User.objects.filter(ai_modules__pk=module_id), deltas)
+
+
+def _count_subquery(queryset, key_field):
+    counts = queryset.filter(
+        **{key_field: OuterRef('pk')}
+    ).order_by().values(key_field).annotate(count=Count('pk')).values('count')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def expected_user_stats(apps=global_apps):
+    """
+    Выражения для пересчета счетчиков по исходным таблицам.
+
+    Args:
+        apps: реестр моделей (в миграциях — исторический)
+
+    Returns:
+        dict: поле счетчика -> выражение для annotate / update
+    """
+    AIModule = apps.get_model('ai_modules', 'AIModule')
+    AIModuleLike = apps.get_model('ai_modules', 'AIModuleLike')
+    Publication = apps.get_model('publications', 'Publication')
+    return {
+        'active_modules_count': _count_subquery(
+            AIModule.objects.filter(status=ACTIVE_STATUS), 'created_by'
+        ),
+        'likes_received_count': _count_subquery(
+            AIModuleLike.objects.all(), 'ai_module__created_by'
+        ),
+        'publications_count': _count_subquery(
+            Publication.objects.all(), 'ai_module__created_by'
+        ),
+    }
+
+
+def recount_user_stats(user_ids=None):
+    """
+    Пересчитать счетчики одним UPDATE.
+
+    Args:
+        user_ids: ограничить пересчет пользователями (по умолчанию все)
+
+    Returns:
+        int: количество обновленных строк
+    """
+    from apps.accounts.models import User
+
+    queryset = User.objects.all()
+    if user_ids is not None:
+        queryset = queryset.filter(pk__in=user_ids)
+    updated = queryset.update(**expected_user_stats())
+    bump_versions(['users'])
+    return updated
+
+
+def find_drifted_users():
+    """
+    Пользователи, у которых счетчики расходятся с исходными таблицами.
+
+    Returns:
+        list: (id пользователя, {поле: (сохраненное, фактическое)})
+    """
+    from apps.accounts.models import User
+
+    expected = {f'expected_{field}': value for field, value in expected_user_stats().items()}
+    rows = User.objects.annotate(**expected).values('pk', *COUNTER_FIELDS, *expected)
+    drifted = []
+    for row in rows.iterator():
+        diff = {
+            field: (row[field], row[f'expected_{field}'])
+            for field in COUNTER_FIELDS
+            if row[field] != row[f'expected_{field}']
+        }
+        if diff:
+            drifted.append((row['pk'], diff))
+    return drifted
@@ -1,21 +1,28 @@
+from django import forms
 from django.contrib import admin
+from django.contrib.admin.widgets import FilteredSelectMultiple
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 from import_export.admin import ImportExportModelAdmin
-from django.shortcuts import render, redirect
+from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.urls import path
-from django.http import HttpResponseRedirect
-from .models import AIModule, AIModuleDetail, AIModuleLike, AIModuleFile
+from django.urls import path, reverse
+from django.http import HttpResponseRedirect, JsonResponse
+from django.utils.html import format_html
+from .import_jobs import start_import_job
+from .models import AIModule, AIModuleDetail, AIModuleLike, AIModuleFile, Availability, UsageStatus, ImportJob
 from apps.publications.models import Publication
 from import_export.admin import ImportExportModelAdmin
 from apps.publications.models import Publication
-from apps.tags.models import AIModuleTag
-import os
+from apps.tags.models import AIModuleTag, Tag
+from apps.tags.sync import sync_module_tags
 
 
 class AIModuleDetailInline(admin.StackedInline):
     model = AIModuleDetail
     extra = 0
+    # Заполняются автоматически из текстовых полей ability / status
+    readonly_fields = ('availability', 'usage_status')
 
 class AIModuleFileInline(admin.TabularInline):
     model = AIModuleFile
@@ -30,13 +37,46 @@ class PublicationInline(admin.TabularInline):
     show_change_link = True
 
 class AIModuleTagInline(admin.TabularInline):
+    """Назначенные теги (только просмотр; набор меняется полем Tags модуля)"""
     model = AIModuleTag
     extra = 0
-    autocomplete_fields = ('tag',)
+    max_num = 0
+    can_delete = False
+    fields = ('tag', 'assigned_by', 'assigned_at')
+    readonly_fields = fields
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('tag__category', 'assigned_by')
+
+
+class AIModuleAdminForm(forms.ModelForm):
+    """Форма модуля с набором тегов, который сохраняется через sync_module_tags"""
+
+    tags = forms.ModelMultipleChoiceField(
+        queryset=Tag.objects.filter(is_active=True).select_related('category'),
+        required=False,
+        widget=FilteredSelectMultiple(_('Tags'), is_stacked=False),
+        label=_('Tags'),
+    )
+
+    class Meta:
+        model = AIModule
+        fields = '__all__'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            assigned = list(self.instance.aimoduletag_set.values_list('tag_id', flat=True))
+            self.fields['tags'].initial = assigned
+            # Назначенные ранее неактивные теги не пропадают при сохранении
+            self.fields['tags'].queryset = Tag.objects.filter(
+                Q(is_active=True) | Q(pk__in=assigned)
+            ).select_related('category')
 
 
 @admin.register(AIModule)
 class AIModuleAdmin(admin.ModelAdmin):  # Убрали ImportExportModelAdmin
+    form = AIModuleAdminForm
     list_display = ('name', 'name_ru', 'company', 'country', 'status', 'created_by', 'created_at')
     list_filter = ('status', 'country', 'created_at')
     search_fields = ('name', 'company', 'task_short_description', 'slug')
@@ -52,6 +92,9 @@ class AIModuleAdmin(admin.ModelAdmin):  # Убрали ImportExportModelAdmin
         (_('Description'), {
             'fields': ('task_short_description',)
         }),
+        (_('Tags'), {
+            'fields': ('tags',)
+        }),
         (_('Status'), {
             'fields': ('status', 'created_by')
         }),
@@ -63,6 +106,16 @@ class AIModuleAdmin(admin.ModelAdmin):  # Убрали ImportExportModelAdmin
 
     inlines = [AIModuleDetailInline, AIModuleFileInline, PublicationInline, AIModuleTagInline]
 
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # Только разница с текущими тегами: assigned_at / assigned_by сохраняются
+        sync_module_tags(
+            form.instance,
+            [tag.pk for tag in form.cleaned_data['tags']],
+            assigned_by=request.user,
+            only_active=False,
+        )
+
     def get_readonly_fields(self, request, obj=None):
         ro = list(super().get_readonly_fields(request, obj))
         if obj:  # change view
@@ -88,26 +141,15 @@ class AIModuleAdmin(admin.ModelAdmin):  # Убрали ImportExportModelAdmin
         if request.method == 'POST':
             csv_file = request.FILES.get('csv_file')
             if csv_file:
-                # Сохраняем файл временно
-                import tempfile
-                with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.csv') as tmp_file:
-                    for chunk in csv_file.chunks():
-                        tmp_file.write(chunk)
-                    tmp_file_path = tmp_file.name
-                
-                try:
-                    # Запускаем импорт через нашу команду
-                    from django.core.management import call_command
-                    call_command('import_ai_modules', tmp_file_path)
-                    messages.success(request, 'Импорт успешно завершен!')
-                except Exception as e:
-                    messages.error(request, f'Ошибка импорта: {str(e)}')
-                finally:
-                    # Удаляем временный файл
-                    os.unlink(tmp_file_path)
-                
-                return redirect('..')
-        
+                # Файл сохраняется в задаче, импорт идет в фоне
+                job = ImportJob.objects.create(
+                    file=csv_file,
+                    original_name=csv_file.name[:255],
+                    created_by=request.user,
+                )
+                start_import_job(job)
+                return redirect('admin:ai_modules_importjob_progress', job.pk)
+
         context = {
             'title': 'Импорт ИИ модулей из CSV',
             'has_permission': True,
@@ -133,4 +175,91 @@ class AIModuleFileAdmin(admin.ModelAdmin):
     list_filter = ('file_type', 'uploaded_at')
     search_fields = ('name', 'ai_module__name', 'uploaded_by__username')
     autocomplete_fields = ('ai_module', 'uploaded_by')
-    readonly_fields = ('size', 'uploaded_at')
\ No newline at end of file
+    readonly_fields = ('size', 'uploaded_at')
+
+@admin.register(Availability, UsageStatus)
+class DetailLookupAdmin(admin.ModelAdmin):
+    list_display = ('name_ru', 'name', 'created_at', 'updated_at')
+    search_fields = ('name', 'name_ru')
+    readonly_fields = ('created_at', 'updated_at')
+
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ('original_name', 'status', 'get_progress', 'created_count', 'error_count', 'created_by', 'created_at', 'finished_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('original_name', 'created_by__username')
+    ordering = ('-created_at',)
+    fields = (
+        'original_name', 'file', 'status', 'get_progress', 'total_rows', 'processed_rows', 'created_count',
+        'error_count', 'last_error', 'errors', 'created_by', 'created_at', 'started_at', 'heartbeat_at', 'finished_at',
+    )
+    readonly_fields = fields
+    actions = ['resume_jobs']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('created_by')
+
+    def get_progress(self, obj):
+        progress = obj.progress
+        return format_html(
+            '<a href="{}">{}</a>',
+            reverse('admin:ai_modules_importjob_progress', args=(obj.pk,)),
+            '-' if progress is None else f'{progress}%',
+        )
+    get_progress.short_description = _('Progress')
+
+    @admin.action(description=_('Resume selected failed jobs'))
+    def resume_jobs(self, request, queryset):
+        # Продолжение с первой незафиксированной строки
+        job_ids = list(queryset.filter(status=ImportJob.Status.FAILED).values_list('pk', flat=True))
+        ImportJob.objects.filter(pk__in=job_ids, status=ImportJob.Status.FAILED).update(
+            status=ImportJob.Status.PENDING, worker='', heartbeat_at=None
+        )
+        for job in ImportJob.objects.filter(pk__in=job_ids):
+            start_import_job(job)
+        messages.success(request, f'Resumed jobs: {len(job_ids)}')
+
+    def get_urls(self):
+        urls = super().get_urls()
+        custom_urls = [
+            path('<int:job_id>/progress/', self.admin_site.admin_view(self.progress_view), name='ai_modules_importjob_progress'),
+            path('<int:job_id>/status/', self.admin_site.admin_view(self.status_view), name='ai_modules_importjob_status'),
+        ]
+        return custom_urls + urls
+
+    def progress_view(self, request, job_id):
+        job = get_object_or_404(ImportJob, pk=job_id)
+        context = {
+            **self.admin_site.each_context(request),
+            'title': f'Импорт {job.original_name}',
+            'job': job,
+            'opts': self.model._meta,
+            'status_url': reverse('admin:ai_modules_importjob_status', args=(job.pk,)),
+        }
+        return render(request, 'admin/ai_modules/import_progress.html', context)
+
+    def status_view(self, request, job_id):
+        """Состояние задачи для страницы прогресса (опрос раз в пару секунд)"""
+        job = get_object_or_404(ImportJob, pk=job_id)
+        return JsonResponse({
+            'id': job.pk,
+            'status': job.status,
+            'status_display': job.get_status_display(),
+            'total_rows': job.total_rows,
+            'processed_rows': job.processed_rows,
+            'created_count': job.created_count,
+            'error_count': job.error_count,
+            'progress': job.progress,
+            'last_error': job.last_error,
+            # Последние ошибки строк; полный список — в карточке задачи
+            'errors': job.errors[-50:],
+            'finished': job.status in (ImportJob.Status.COMPLETED, ImportJob.Status.FAILED),
+        })
@@ -0,0 +1,188 @@
+"""
+Фоновый импорт CSV из админки.
+
+Загруженный файл сохраняется в ImportJob, импорт выполняется вне запроса:
+потоком процесса сразу после загрузки или командой run_import_jobs.
+Строки обрабатываются порциями по IMPORT_JOB_CHUNK_SIZE — каждая порция
+в своей транзакции вместе со счетчиками прогресса, каждая строка в своей
+точке сохранения. Переводы порции запрашиваются до ее транзакции, поэтому
+транзакция не ждет сервис перевода. После падения обработчика задача
+продолжается с первой незафиксированной строки: ее подхватывает
+run_import_jobs, когда heartbeat старше IMPORT_JOB_STALE_AFTER.
+"""
+import csv
+import io
+import logging
+import threading
+import uuid
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .importer import REQUIRED_COLUMNS, ModuleImporter
+from .models import ImportJob
+
+logger = logging.getLogger(__name__)
+
+Status = ImportJob.Status
+
+
+class LostClaim(Exception):
+    """Задачу захватил другой обработчик (эта посчиталась зависшей)"""
+
+
+def claimable_jobs():
+    """Задачи, которые можно начать или продолжить"""
+    stale = timezone.now() - timedelta(seconds=settings.IMPORT_JOB_STALE_AFTER)
+    return ImportJob.objects.filter(
+        Q(status=Status.PENDING)
+        | Q(status=Status.RUNNING, heartbeat_at__lt=stale)
+        | Q(status=Status.RUNNING, heartbeat_at__isnull=True)
+    )
+
+
+def claim_job(job_id):
+    """
+    Захватить задачу условным UPDATE (из нескольких обработчиков выигрывает один).
+
+    Returns:
+        str | None: токен обработчика или None, если задача уже занята / завершена
+    """
+    token = uuid.uuid4().hex
+    now = timezone.now()
+    claimed = claimable_jobs().filter(pk=job_id).update(
+        status=Status.RUNNING,
+        worker=token,
+        heartbeat_at=now,
+        started_at=Coalesce('started_at', now),
+        finished_at=None,
+        last_error='',
+    )
+    return token if claimed else None
+
+
+def _read_rows(job):
+    """Строки CSV с номерами (нумерация с 1, как в import_ai_modules)"""
+    with job.file.open('rb') as raw:
+        reader = csv.DictReader(io.TextIOWrapper(raw, encoding='utf-8', newline=''))
+        missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or ())]
+        if missing:
+            raise ValueError(f'Missing columns: {", ".join(repr(column) for column in missing)}')
+        yield from enumerate(reader, 1)
+
+
+def _update(job, token, **values):
+    """Обновить задачу, если она все еще захвачена этим обработчиком"""
+    values.setdefault('heartbeat_at', timezone.now())
+    if not ImportJob.objects.filter(pk=job.pk, worker=token, status=Status.RUNNING).update(**values):
+        raise LostClaim(job.pk)
+
+
+def _import_user(job):
+    if job.created_by_id and job.created_by.is_active:
+        return job.created_by
+    return get_user_model().objects.filter(is_superuser=True).first()
+
+
+def run_job(job_id, token):
+    """
+    Выполнить (или продолжить) захваченную задачу.
+
+    Returns:
+        str: итоговый статус задачи
+    """
+    job = ImportJob.objects.select_related('created_by').get(pk=job_id)
+    try:
+        admin_user = _import_user(job)
+        if admin_user is None:
+            raise ValueError('No admin user found')
+
+        if job.total_rows is None:
+            job.total_rows = sum(1 for _ in _read_rows(job))
+            _update(job, token, total_rows=job.total_rows)
+
+        importer = ModuleImporter(admin_user)
+        chunk_size = max(1, settings.IMPORT_JOB_CHUNK_SIZE)
+        # Зафиксированные строки пропускаем
+        rows = islice(_read_rows(job), job.processed_rows, None)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            # Переводы — до транзакции порции, heartbeat после каждой строки
+            importer.prepare([row for _row_num, row in chunk], progress=lambda: _update(job, token))
+            _import_chunk(job, token, importer, chunk)
+
+        _update(job, token, status=Status.COMPLETED, finished_at=timezone.now())
+        return Status.COMPLETED
+    except LostClaim:
+        logger.warning(f"Import job {job_id} was taken over by another worker")
+        return Status.RUNNING
+    except Exception as e:
+        logger.exception(f"Import job {job_id} failed")
+        ImportJob.objects.filter(pk=job_id, worker=token).update(
+            status=Status.FAILED, last_error=str(e), finished_at=timezone.now(), heartbeat_at=timezone.now()
+        )
+        return Status.FAILED
+
+
+@transaction.atomic
+def _import_chunk(job, token, importer, chunk):
+    """Порция строк и ее счетчики — одна транзакция"""
+    created = 0
+    errors = []
+    for row_num, row in chunk:
+        try:
+            importer.import_row(row)  # точка сохранения: ошибка откатывает только строку
+            created += 1
+        except Exception as e:
+            errors.append({
+                'row': row_num,
+                'name': (row.get('Название сервиса') or '').strip()[:255],
+                'error': str(e),
+            })
+
+    values = {
+        'processed_rows': F('processed_rows') + len(chunk),
+        'created_count': F('created_count') + created,
+    }
+    if errors:
+        values['error_count'] = F('error_count') + len(errors)
+        values['errors'] = (job.errors + errors)[:settings.IMPORT_JOB_MAX_ERRORS]
+    # Потеря захвата откатывает порцию: ее повторит новый обработчик
+    _update(job, token, **values)
+
+    job.processed_rows += len(chunk)
+    job.created_count += created
+    job.error_count += len(errors)
+    if errors:
+        job.errors = values['errors']
+
+
+def process_job(job_id):
+    """Захватить и выполнить задачу; None — задача уже занята или завершена"""
+    token = claim_job(job_id)
+    if token is None:
+        return None
+    return run_job(job_id, token)
+
+
+def _run_in_thread(job_id):
+    try:
+        process_job(job_id)
+    finally:
+        # Соединения с БД рабочего потока
+        connections.close_all()
+
+
+def start_import_job(job):
+    """Запустить задачу в потоке процесса после фиксации транзакции"""
+    transaction.on_commit(lambda: threading.Thread(
+        target=_run_in_thread, args=(job.pk,), name=f'import-job-{job.pk}', daemon=True
+    ).start())
@@ -0,0 +1,218 @@
+"""
+Импорт ИИ-модулей из CSV реестра.
+
+ModuleImporter создает по строке CSV модуль, детали, теги трех категорий
+и публикацию. Используется командой import_ai_modules и фоновыми
+задачами импорта из админки (apps.ai_modules.import_jobs).
+"""
+import random
+
+from django.db import transaction
+from django.utils.text import slugify
+from deep_translator import GoogleTranslator
+
+from apps.common.models import Country
+from apps.publications.models import Publication
+from apps.tags.models import Tag, TagCategory
+from apps.tags.sync import sync_module_tags
+
+from .models import AIModule, AIModuleDetail
+
+# Без этих колонок строку не импортировать
+REQUIRED_COLUMNS = ('Название сервиса', 'Страна ', 'Страна Разработчика')
+
+# Колонка CSV -> slug категории тегов
+TAG_COLUMNS = (
+    ('Тип сервиса (услуги)', 'service-type'),
+    ('Область применения', 'application-area'),
+    ('Тип технологии', 'technology-type'),
+)
+
+
+def ru_to_en(text: str) -> str:
+    if not text:
+        return text
+    return GoogleTranslator(source='auto', target='en').translate(text)
+
+
+def generate_version():
+    return f"{random.randint(1, 9)}.{random.randint(0, 9)}.{random.randint(0, 9)}"
+
+
+class ModuleImporter:
+    """
+    Импорт строк CSV от имени admin_user.
+
+    Переводы запоминаются на время импорта: одинаковые страны и теги
+    переводятся (запросом к сервису перевода) один раз. prepare() переводит
+    строки заранее, чтобы запросы к сервису не шли внутри транзакции.
+    """
+
+    def __init__(self, admin_user):
+        self.admin_user = admin_user
+        self._translations = {}
+        self._failed_translations = {}
+        self._tags = {}
+        self.categories = self.get_categories()
+
+    def get_categories(self):
+        """Категории тегов импорта (создаются при отсутствии)"""
+        service_type_category, _ = TagCategory.objects.get_or_create(
+            name_ru='Тип сервиса (Услуги)',
+            name='Type of service',
+            defaults={'slug': 'service-type', 'description': 'Типы ИИ сервисов'}
+        )
+        application_area_category, _ = TagCategory.objects.get_or_create(
+            name_ru='Область применения',
+            name='Scope of application',
+            defaults={'slug': 'application-area', 'description': 'Области применения ИИ'}
+        )
+        technology_type_category, _ = TagCategory.objects.get_or_create(
+            name_ru='Тип технологии',
+            name='Type of technologes',
+            defaults={'slug': 'technology-type', 'description': 'Типы технологий'}
+        )
+        return {
+            'service-type': service_type_category,
+            'application-area': application_area_category,
+            'technology-type': technology_type_category,
+        }
+
+    def translate(self, text):
+        if text in self._failed_translations:
+            # Не повторяем запрос, упавший в prepare()
+            raise self._failed_translations[text]
+        if text not in self._translations:
+            self._translations[text] = ru_to_en(text)
+        return self._translations[text]
+
+    def prepare(self, rows, progress=None):
+        """
+        Перевести все, что понадобится import_row для этих строк.
+
+        Существующие теги находятся одним запросом и не переводятся.
+        Ошибка перевода запоминается и возникнет в import_row этой строки.
+
+        Args:
+            rows: строки CSV
+            progress: вызывается после каждой строки (heartbeat задачи)
+        """
+        tag_keys = {}
+        for row in rows:
+            for column, category_slug in TAG_COLUMNS:
+                tag_text = (row.get(column) or '').strip()
+                key = (self.categories[category_slug].pk, slugify(tag_text))
+                if tag_text and key not in self._tags:
+                    tag_keys[key] = tag_text
+        if tag_keys:
+            existing = Tag.objects.filter(
+                category_id__in={category_id for category_id, _slug in tag_keys},
+                slug__in={slug for _category_id, slug in tag_keys},
+            )
+            for tag in existing:
+                if (tag.category_id, tag.slug) in tag_keys:
+                    self._tags[(tag.category_id, tag.slug)] = tag
+
+        for row in rows:
+            texts = [(row.get('Страна ') or '').strip(), (row.get('Название сервиса') or '').strip()]
+            for column, category_slug in TAG_COLUMNS:
+                tag_text = (row.get(column) or '').strip()
+                if tag_text and (self.categories[category_slug].pk, slugify(tag_text)) not in self._tags:
+                    texts.append(tag_text)
+            for text in texts:
+                if text in self._translations or text in self._failed_translations:
+                    continue
+                try:
+                    self.translate(text)
+                except Exception as e:
+                    self._failed_translations[text] = e
+            if progress is not None:
+                progress()
+
+    def import_row(self, row):
+        """
+        Создать модуль по строке CSV (все или ничего).
+
+        Returns:
+            AIModule: созданный модуль
+        """
+        tags = dict(self._tags)
+        try:
+            return self._import_row(row)
+        except Exception:
+            # Теги, созданные в откаченной строке, больше не существуют
+            self._tags = tags
+            raise
+
+    @transaction.atomic
+    def _import_row(self, row):
+        country_name = self.translate(row['Страна '].strip())
+        # Существующая страна находится по name, даже если name_ru у нее другое
+        country, _ = Country.objects.get_or_create(name=country_name, defaults={'name_ru': country_name})
+
+        ai_module = AIModule.objects.create(
+            name=self.translate(row['Название сервиса'].strip()),
+            name_ru=row['Название сервиса'].strip(),
+            company=row['Страна Разработчика'].strip(),
+            country=country,
+            status=AIModule.Status.ACTIVE,
+            params_count=10000000000,
+            license_type="MIT",
+            created_by=self.admin_user,
+            version=generate_version(),
+            task_short_description=(row.get('Ключев. характеристики') or '').strip()[:500]
+        )
+
+        AIModuleDetail.objects.create(
+            ai_module=ai_module,
+            description=(row.get('ПРИМЕЧАНИЕ') or '').strip(),
+            technical_info=(row.get('Ключев. характеристики') or '').strip(),
+            status=(row.get('Статус использования') or 'used').strip(),
+            ability=(row.get('Доступность') or '').strip(),
+            registration_number=(row.get('Регистрационный номер') or '').strip()
+        )
+
+        # Теги строки — одним bulk_create (apps.tags.sync)
+        tags = [
+            self.get_or_create_tag((row.get(column) or '').strip(), self.categories[category_slug])
+            for column, category_slug in TAG_COLUMNS
+        ]
+        sync_module_tags(
+            ai_module,
+            [tag.pk for tag in tags if tag is not None],
+            assigned_by=self.admin_user,
+            only_active=False,
+        )
+
+        # Публикация из научной базы
+        scientific_basis = (row.get('Научная база') or '').strip()
+        if scientific_basis:
+            Publication.objects.create(
+                ai_module=ai_module,
+                title=scientific_basis[:500],
+                authors='',
+                journal_conference='',
+                publication_date='2024-01-01',
+                added_by=self.admin_user
+            )
+        return ai_module
+
+    def get_or_create_tag(self, tag_text, category):
+        """Находит или создает тег категории (None для пустого текста)"""
+        if not tag_text:
+            return None
+
+        tag_slug = slugify(tag_text)
+        key = (category.pk, tag_slug)
+        if key not in self._tags:
+            self._tags[key], _ = Tag.objects.get_or_create(
+                category=category,
+                slug=tag_slug,
+                defaults={
+                    'name_ru': tag_text,
+                    'name': self.translate(tag_text),
+                    'description': f'Тег для {category.name_ru}',
+                    'is_active': True
+                }
+            )
+        return self._tags[key]
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from apps.ai_modules.import_jobs import claimable_jobs, process_job
+from apps.ai_modules.models import ImportJob
+import time
+
+
+class Command(BaseCommand):
+    help = (
+        'Run pending CSV import jobs and resume jobs whose worker stopped '
+        '(no heartbeat for IMPORT_JOB_STALE_AFTER seconds)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Process available jobs and exit')
+        parser.add_argument('--interval', type=float, default=10, help='Polling interval, seconds')
+
+    def handle(self, *args, **options):
+        while True:
+            job_ids = list(claimable_jobs().order_by('created_at').values_list('pk', flat=True))
+            for job_id in job_ids:
+                status = process_job(job_id)
+                if status is None:
+                    continue  # задачу захватил другой обработчик
+                job = ImportJob.objects.get(pk=job_id)
+                line = (
+                    f'Job {job.pk} ({job.original_name}): {job.processed_rows}/{job.total_rows} rows, '
+                    f'{job.created_count} created, {job.error_count} errors'
+                )
+                if status == ImportJob.Status.COMPLETED:
+                    self.stdout.write(self.style.SUCCESS(f'✓ {line}'))
+                elif status == ImportJob.Status.FAILED:
+                    self.stdout.write(self.style.ERROR(f'✗ {line}: {job.last_error}'))
+                else:
+                    self.stdout.write(self.style.WARNING(f'{line}: taken over by another worker'))
+
+            if options['once']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0004_alter_country_code'),
+        ('ai_modules', '0012_rename_ai_modules__country_c2f19d_idx_ai_modules__country_c75277_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Availability',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=1024, verbose_name='Name')),
+                ('name_ru', models.CharField(max_length=1024, unique=True, verbose_name='Name ru')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Availability',
+                'verbose_name_plural': 'Availabilities',
+                'ordering': ['name_ru'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='UsageStatus',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=1024, verbose_name='Name')),
+                ('name_ru', models.CharField(max_length=1024, unique=True, verbose_name='Name ru')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Usage Status',
+                'verbose_name_plural': 'Usage Statuses',
+                'ordering': ['name_ru'],
+                'abstract': False,
+            },
+        ),
+        migrations.AlterField(
+            model_name='aimodule',
+            name='country',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='country', to='common.country', verbose_name='Country'),
+        ),
+        migrations.AddField(
+            model_name='aimoduledetail',
+            name='availability',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='details', to='ai_modules.availability', verbose_name='Availability'),
+        ),
+        migrations.AddField(
+            model_name='aimoduledetail',
+            name='usage_status',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='details', to='ai_modules.usagestatus', verbose_name='Usage Status'),
+        ),
+    ]
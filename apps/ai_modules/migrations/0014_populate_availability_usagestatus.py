@@ -0,0 +1,50 @@
+from django.db import migrations
+from transliterate import translit
+
+
+def _name_en(value):
+    try:
+        return translit(value, 'ru', reversed=True)
+    except Exception:
+        return value
+
+
+def _populate(model, details, text_field, fk_field):
+    """Создает записи справочника из текстовых значений и проставляет FK"""
+    cache = {}
+    for detail in details.exclude(**{f'{text_field}__isnull': True}).iterator():
+        value = (getattr(detail, text_field) or '').strip()
+        if not value:
+            continue
+        if value not in cache:
+            cache[value], _ = model.objects.get_or_create(
+                name_ru=value,
+                defaults={'name': _name_en(value)}
+            )
+        setattr(detail, fk_field, cache[value])
+        detail.save(update_fields=[fk_field])
+
+
+def forwards(apps, schema_editor):
+    Availability = apps.get_model('ai_modules', 'Availability')
+    UsageStatus = apps.get_model('ai_modules', 'UsageStatus')
+    AIModuleDetail = apps.get_model('ai_modules', 'AIModuleDetail')
+
+    _populate(Availability, AIModuleDetail.objects.all(), 'ability', 'availability')
+    _populate(UsageStatus, AIModuleDetail.objects.all(), 'status', 'usage_status')
+
+
+def backwards(apps, schema_editor):
+    AIModuleDetail = apps.get_model('ai_modules', 'AIModuleDetail')
+    AIModuleDetail.objects.update(availability=None, usage_status=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_modules', '0013_availability_usagestatus'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -3,10 +3,12 @@ from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinValueValidator
 from django.utils.text import slugify
+from transliterate import translit
 from apps.common.models import Country
+from apps.common.tracking import FieldTrackerMixin
 User = get_user_model()
 
-class AIModule(models.Model):
+class AIModule(FieldTrackerMixin, models.Model):
     """Основная модель для ИИ-сервиса"""
     
     def can_edit(self, user):
@@ -96,6 +98,19 @@ class AIModule(models.Model):
             models.Index(fields=['slug']),
         ]
     
+    def get_tags(self):
+        """Активные теги модуля (использует prefetch aimoduletag_set, если он есть)"""
+        if 'aimoduletag_set' in getattr(self, '_prefetched_objects_cache', {}):
+            module_tags = self.aimoduletag_set.all()
+        else:
+            module_tags = self.aimoduletag_set.select_related('tag__category')
+        return [amt.tag for amt in module_tags if amt.tag.is_active]
+
+    def get_like_count(self):
+        if hasattr(self, 'like_count'):
+            return self.like_count
+        return self.likes.count()
+
     def is_liked_by(self, user):
         if not getattr(user, 'is_authenticated', False):
             return False
@@ -120,8 +135,59 @@ class AIModule(models.Model):
             self.slug = self._generate_unique_slug()
         super().save(*args, **kwargs)
 
-class AIModuleDetail(models.Model):
-    
+class DetailLookup(models.Model):
+    """Базовый справочник для значений из AIModuleDetail"""
+
+    name = models.CharField(max_length=1024, blank=True, verbose_name=_('Name')) # eng name
+    name_ru = models.CharField(max_length=1024, unique=True, verbose_name=_('Name ru'))
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+        ordering = ['name_ru']
+
+    def __str__(self):
+        return self.name_ru
+
+    @classmethod
+    def from_text(cls, value):
+        """Получить или создать запись справочника по русскому названию"""
+        value = (value or '').strip()
+        if not value:
+            return None
+        obj, _created = cls.objects.get_or_create(name_ru=value)
+        return obj
+
+    def save(self, *args, **kwargs):
+        if not self.name:
+            try:
+                self.name = translit(self.name_ru, 'ru', reversed=True)
+            except Exception:
+                self.name = self.name_ru
+        super().save(*args, **kwargs)
+
+class Availability(DetailLookup):
+    """Справочник доступности ИИ-модулей"""
+
+    cache_key = 'detail_lookups:availability'
+
+    class Meta(DetailLookup.Meta):
+        verbose_name = _('Availability')
+        verbose_name_plural = _('Availabilities')
+
+class UsageStatus(DetailLookup):
+    """Справочник статусов использования ИИ-модулей"""
+
+    cache_key = 'detail_lookups:usage_status'
+
+    class Meta(DetailLookup.Meta):
+        verbose_name = _('Usage Status')
+        verbose_name_plural = _('Usage Statuses')
+
+class AIModuleDetail(FieldTrackerMixin, models.Model):
+
     """Детальная информация о модели"""
     ai_module = models.OneToOneField(
         AIModule,
@@ -137,10 +203,51 @@ class AIModuleDetail(models.Model):
     registration_number = models.CharField(max_length=1024, verbose_name=_('Registration number'), null=True)
     ability = models.TextField(verbose_name=_('Ability for users'), null=True)
 
+    # Нормализованные значения status / ability
+    availability = models.ForeignKey(
+        Availability,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='details',
+        verbose_name=_('Availability')
+    )
+    usage_status = models.ForeignKey(
+        UsageStatus,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='details',
+        verbose_name=_('Usage Status')
+    )
+
     class Meta:
         verbose_name = _('AI Module Details')
         verbose_name_plural = _('AI Module Details')
 
+    def _text_changed(self, field_name, update_fields):
+        """Нужно ли заново связать справочник с текстовым полем"""
+        if update_fields is not None and field_name not in update_fields:
+            return False
+        if self._state.adding or field_name not in getattr(self, '_loaded_values', {}):
+            return True
+        return self.has_changed(field_name)
+
+    def save(self, *args, **kwargs):
+        # Текстовые поля остаются источником значений, справочники синхронизируются
+        # с ними — только когда текст изменился (get_or_create на каждое сохранение не нужен)
+        update_fields = kwargs.get('update_fields')
+        resynced = []
+        if self._text_changed('ability', update_fields):
+            self.availability = Availability.from_text(self.ability)
+            resynced.append('availability')
+        if self._text_changed('status', update_fields):
+            self.usage_status = UsageStatus.from_text(self.status)
+            resynced.append('usage_status')
+        if update_fields is not None and resynced:
+            kwargs['update_fields'] = {*update_fields, *resynced}
+        super().save(*args, **kwargs)
+
 class AIModuleLike(models.Model):
     """Система лайков для моделей"""
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -234,4 +341,64 @@ class AIModuleFile(models.Model):
         # Удаляем файл с диска при удалении записи
         if self.file:
             self.file.delete(save=False)
-        super().delete(*args, **kwargs)
\ No newline at end of file
+        super().delete(*args, **kwargs)
+
+class ImportJob(models.Model):
+    """Фоновый импорт модулей из CSV (apps.ai_modules.import_jobs)"""
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('Pending')
+        RUNNING = 'running', _('Running')
+        COMPLETED = 'completed', _('Completed')
+        FAILED = 'failed', _('Failed')
+
+    file = models.FileField(upload_to='imports/%Y/%m/', verbose_name=_('File'))
+    original_name = models.CharField(max_length=255, blank=True, verbose_name=_('File Name'))
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name=_('Status')
+    )
+
+    # Прогресс: строки до processed_rows зафиксированы, с нее задача продолжается
+    total_rows = models.PositiveIntegerField(null=True, blank=True, verbose_name=_('Total rows'))
+    processed_rows = models.PositiveIntegerField(default=0, verbose_name=_('Processed rows'))
+    created_count = models.PositiveIntegerField(default=0, verbose_name=_('Created'))
+    error_count = models.PositiveIntegerField(default=0, verbose_name=_('Errors'))
+    errors = models.JSONField(default=list, blank=True)  # [{'row': N, 'name': ..., 'error': ...}]
+    last_error = models.TextField(blank=True)  # ошибка всей задачи
+
+    # Захват задачи обработчиком
+    worker = models.CharField(max_length=64, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        verbose_name=_('Created by')
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = _('Import Job')
+        verbose_name_plural = _('Import Jobs')
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'heartbeat_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.original_name or self.file.name} ({self.get_status_display()})"
+
+    @property
+    def progress(self):
+        """Процент обработанных строк (None, пока строки не посчитаны)"""
+        if self.total_rows is None:
+            return None
+        if not self.total_rows:
+            return 100
+        return min(100, round(self.processed_rows * 100 / self.total_rows))
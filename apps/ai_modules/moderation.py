@@ -0,0 +1,154 @@
+"""
+Массовая модерация модулей (POST /ai-modules/moderate/).
+
+Статусы меняются одним UPDATE ... WHERE status IN (...) по заблокированным
+строкам, записи аудита вставляются одним bulk_create, письма авторам
+уходят в фоне после фиксации транзакции. UPDATE и bulk_create не вызывают
+сигналы, поэтому счетчики авторов, рейтинги и версии данных обновляются
+здесь же — так же, как это сделали бы post_save модулей и AuditLog.
+"""
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.accounts.stats import adjust_user_stats
+from apps.common import leaderboards
+from apps.common.activity import track_activity
+from apps.common.models import AuditLog
+from apps.common.utils import enqueue_notification_emails
+from apps.common.versions import bump_versions
+
+from .models import AIModule, AIModuleLike
+
+Status = AIModule.Status
+
+# Действие -> (допустимые исходные статусы, новый статус, запись аудита, итог, письмо автору)
+MODERATION_ACTIONS = {
+    'approve': (
+        (Status.ON_REVIEW,), Status.ACTIVE, AuditLog.Action.APPROVE, 'approved',
+        ('Your AI module has been approved', 'module_approved'),
+    ),
+    'reject': (
+        (Status.ON_REVIEW,), Status.REJECTED, AuditLog.Action.REJECT, 'rejected',
+        ('Your AI module has been rejected', 'module_rejected'),
+    ),
+    'block': (
+        (Status.ON_REVIEW, Status.ACTIVE), Status.BLOCKED, AuditLog.Action.BLOCK, 'blocked',
+        ('Your AI module has been blocked', 'module_blocked'),
+    ),
+}
+
+
+def _status_changed(modules, new_status):
+    """Что делают post_save модулей (apps.accounts.signals, apps.common.leaderboards) при смене статуса"""
+    became_active = modules if new_status == Status.ACTIVE else []
+    left_active = [module for module in modules if module.old_status == Status.ACTIVE]
+    if not became_active and not left_active:
+        return
+
+    owners = Counter()
+    country_deltas = Counter()
+    for module in became_active:
+        owners[module.created_by_id] += 1
+        country_deltas[module.country_id] += 1
+    for module in left_active:
+        owners[module.created_by_id] -= 1
+        country_deltas[module.country_id] -= 1
+    for owner_id, delta in owners.items():
+        adjust_user_stats(owner_id, active_modules_count=delta)
+    for country_id, delta in country_deltas.items():
+        leaderboards.countries.incr(country_id, delta)
+
+    if became_active:
+        likes = dict(
+            AIModuleLike.objects.filter(ai_module__in=[module.pk for module in became_active])
+            .values('ai_module').annotate(count=Count('pk')).values_list('ai_module', 'count')
+        )
+        leaderboards.most_liked_modules.set_many(
+            {module.pk: likes.get(module.pk, 0) for module in became_active}
+        )
+    leaderboards.most_liked_modules.remove_many([module.pk for module in left_active])
+
+
+@transaction.atomic
+def moderate_modules(module_ids, action, moderator, comment='', ip_address=None):
+    """
+    Применить действие модерации к модулям.
+
+    Args:
+        module_ids: ID модулей
+        action: 'approve' / 'reject' / 'block'
+        moderator: администратор, выполняющий действие
+        comment: комментарий (попадает в аудит и письмо)
+        ip_address: IP модератора для аудита
+
+    Returns:
+        dict: ID модуля -> {'outcome': approved / rejected / blocked / not_found / invalid_status,
+              'status': текущий статус}
+    """
+    from_statuses, new_status, audit_action, outcome, (subject, template_name) = MODERATION_ACTIONS[action]
+    module_ids = list(dict.fromkeys(module_ids))
+
+    # Блокируем строки: параллельная модерация того же модуля ждет фиксации
+    modules = list(
+        AIModule.objects.select_for_update()
+        .filter(pk__in=module_ids)
+        .only('id', 'name', 'status', 'created_by', 'country')
+    )
+    found = {module.pk: module for module in modules}
+    matched = [module for module in modules if module.status in from_statuses]
+
+    now = timezone.now()
+    if matched:
+        values = {'status': new_status, 'updated_at': now}
+        if new_status == Status.ACTIVE:
+            values['published_at'] = now
+        AIModule.objects.filter(
+            pk__in=[module.pk for module in matched], status__in=from_statuses
+        ).update(**values)
+
+        content_type = ContentType.objects.get_for_model(AIModule)
+        audit_logs = []
+        for module in matched:
+            module.old_status, module.status = module.status, new_status
+            new_values = {'status': new_status}
+            if 'published_at' in values:
+                new_values['published_at'] = now.isoformat()
+            audit_logs.append(AuditLog(
+                content_type=content_type,
+                object_id=module.pk,
+                action=audit_action,
+                performed_by=moderator,
+                ip_address=ip_address,
+                comment=comment,
+                old_values={'status': module.old_status},
+                new_values=new_values,
+            ))
+        AuditLog.objects.bulk_create(audit_logs)
+
+        _status_changed(matched, new_status)
+        track_activity(moderator.pk, now)
+        bump_versions(['modules', 'audit'])
+
+        owners = get_user_model().objects.in_bulk({module.created_by_id for module in matched})
+        enqueue_notification_emails(
+            (owners[module.created_by_id], subject, template_name, {'module': module, 'comment': comment})
+            for module in matched if module.created_by_id in owners
+        )
+
+    changed = {module.pk for module in matched}
+    results = {}
+    for module_id in module_ids:
+        module = found.get(module_id)
+        if module is None:
+            results[module_id] = {'outcome': 'not_found', 'status': None}
+        else:
+            results[module_id] = {
+                'outcome': outcome if module_id in changed else 'invalid_status',
+                'status': module.status,
+            }
+    return results
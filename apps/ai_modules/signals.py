@@ -0,0 +1,13 @@
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Availability, UsageStatus, AIModuleDetail
+
+
+@receiver([post_save, post_delete], sender=Availability)
+@receiver([post_save, post_delete], sender=UsageStatus)
+@receiver([post_save, post_delete], sender=AIModuleDetail)
+def invalidate_detail_lookups(sender, **kwargs):
+    """Сбрасываем кеш справочников доступности и статусов использования"""
+    cache.delete_many([Availability.cache_key, UsageStatus.cache_key])
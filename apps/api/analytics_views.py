@@ -2,8 +2,8 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions, status
 from rest_framework.decorators import api_view, permission_classes
-from django.db.models import Count, Q, Avg
-from django.utils.decorators import method_decorator
+from django.db.models import Count, Avg
+from django.db.models.functions import TruncDate
 from django.views.decorators.cache import cache_page
 from django.utils import timezone
 from datetime import timedelta, datetime
@@ -12,12 +12,17 @@ from apps.tags.models import Tag, TagCategory
 from apps.publications.models import Publication
 from apps.accounts.models import User
 from apps.common.models import Country, AuditLog
+from apps.common import activity, leaderboards
+from .conditional import ConditionalGetMixin
+from .response_cache import cache_response
 
-class OverviewAnalyticsView(APIView):
+class OverviewAnalyticsView(ConditionalGetMixin, APIView):
     """Общая аналитика системы"""
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    etag_dependencies = ('modules', 'users', 'publications', 'likes', 'tags')
+    etag_daily = True
     
-    @method_decorator(cache_page(60 * 15))  # Кэш на 15 минут
+    @cache_response(daily=True)  # Инвалидируется по изменению данных
     def get(self, request):
         now = timezone.now()
         last_month = now - timedelta(days=30)
@@ -72,9 +77,10 @@ class OverviewAnalyticsView(APIView):
         
         return Response(data)
 
-class ModulesAnalyticsView(APIView):
+class ModulesAnalyticsView(ConditionalGetMixin, APIView):
     """Аналитика по модулям"""
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    etag_dependencies = ('modules', 'likes')
     
     def get(self, request):
         # Фильтры из параметров запроса
@@ -122,10 +128,30 @@ class ModulesAnalyticsView(APIView):
             like_count=Count('likes')
         ).aggregate(avg=Avg('like_count'))['avg'] or 0
         
-        # Топ лайкнутых модулей
-        most_liked = queryset.annotate(
-            like_count=Count('likes')
-        ).order_by('-like_count')[:5]
+        # Топ лайкнутых модулей: без фильтров — из рейтинга в Redis
+        if country or date_from or date_to:
+            most_liked = [
+                {
+                    'id': module.id,
+                    'name': module.name,
+                    'company': module.company,
+                    'like_count': module.like_count
+                }
+                for module in queryset.annotate(
+                    like_count=Count('likes')
+                ).order_by('-like_count')[:5]
+            ]
+        else:
+            board = leaderboards.most_liked_modules
+            most_liked = [
+                {
+                    'id': item['id'],
+                    'name': item['name'],
+                    'company': item['company'],
+                    'like_count': item['score']
+                }
+                for item in board.with_labels(board.top(5))
+            ]
         
         data = {
             'total_count': queryset.count(),
@@ -135,24 +161,17 @@ class ModulesAnalyticsView(APIView):
                 'parameters': round(avg_params),
                 'likes': round(avg_likes, 2)
             },
-            'most_liked': [
-                {
-                    'id': module.id,
-                    'name': module.name,
-                    'company': module.company,
-                    'like_count': module.like_count
-                }
-                for module in most_liked
-            ]
+            'most_liked': most_liked
         }
         
         return Response(data)
 
-class TagsAnalyticsView(APIView):
+class TagsAnalyticsView(ConditionalGetMixin, APIView):
     """Аналитика по тегам"""
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    etag_dependencies = ('tags',)
     
-    @method_decorator(cache_page(60 * 30))  # Кэш на 30 минут
+    @cache_response()  # Инвалидируется по изменению данных
     def get(self, request):
         # Статистика по категориям
         category_stats = []
@@ -199,9 +218,11 @@ class TagsAnalyticsView(APIView):
         
         return Response(data)
 
-class UsersAnalyticsView(APIView):
+class UsersAnalyticsView(ConditionalGetMixin, APIView):
     """Аналитика по пользователям"""
     permission_classes = [permissions.IsAdminUser]  # Только админы
+    etag_dependencies = ('users', 'modules')
+    etag_daily = True
     
     def get(self, request):
         # Общая статистика пользователей
@@ -223,11 +244,8 @@ class UsersAnalyticsView(APIView):
         ).order_by('-count')[:10]
         
         # Пользователи с наибольшим количеством модулей
-        top_contributors = User.objects.filter(
-            is_active=True
-        ).annotate(
-            modules_count=Count('ai_modules', filter=Q(ai_modules__status=AIModule.Status.ACTIVE))
-        ).order_by('-modules_count')[:10]
+        board = leaderboards.contributors
+        top_contributors = board.with_labels(board.top(10))
         
         # Новые пользователи за последние дни
         last_week = timezone.now() - timedelta(days=7)
@@ -249,22 +267,24 @@ class UsersAnalyticsView(APIView):
             ],
             'top_contributors': [
                 {
-                    'id': user.id,
-                    'username': user.username,
-                    'organization': user.organization,
-                    'modules_count': user.modules_count
+                    'id': item['id'],
+                    'username': item['username'],
+                    'organization': item['organization'],
+                    'modules_count': item['score']
                 }
-                for user in top_contributors if user.modules_count > 0
+                for item in top_contributors if item['score'] > 0
             ]
         }
         
         return Response(data)
 
-class ModulesTrendsView(APIView):
+class ModulesTrendsView(ConditionalGetMixin, APIView):
     """Тренды создания модулей по времени"""
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    etag_dependencies = ('modules',)
+    etag_daily = True
     
-    @method_decorator(cache_page(60 * 30))  # Кэш на 30 минут
+    @cache_response(daily=True)  # Инвалидируется по изменению данных
     def get(self, request):
         # Параметры периода
         days = int(request.query_params.get('days', 30))
@@ -319,9 +339,10 @@ class ModulesTrendsView(APIView):
             'stats': period_stats
         })
 
-class TagUsageView(APIView):
+class TagUsageView(ConditionalGetMixin, APIView):
     """Детальная статистика использования тегов"""
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    etag_dependencies = ('tags',)
     
     def get(self, request):
         # Фильтр по категории (опционально)
@@ -349,41 +370,42 @@ class TagUsageView(APIView):
         
         return Response(data)
 
-class UserActivityView(APIView):
+class UserActivityView(ConditionalGetMixin, APIView):
     """Активность пользователей по времени"""
     permission_classes = [permissions.IsAdminUser]
+    etag_dependencies = ('users', 'audit')
+    etag_daily = True
     
     def get(self, request):
         days = int(request.query_params.get('days', 30))
         end_date = timezone.now().date()
         start_date = end_date - timedelta(days=days)
         
-        # Генерируем даты
-        date_range = []
-        current_date = start_date
-        while current_date <= end_date:
-            date_range.append(current_date)
-            current_date += timedelta(days=1)
+        # Новые пользователи по дням одним запросом
+        new_users = dict(
+            User.objects.filter(
+                created_at__date__gte=start_date,
+                created_at__date__lte=end_date
+            ).annotate(date=TruncDate('created_at')).values('date').annotate(
+                count=Count('id')
+            ).order_by().values_list('date', 'count')
+        )
         
-        # Собираем активность
-        activity_data = []
-        for date in date_range:
-            new_users = User.objects.filter(
-                created_at__date=date
-            ).count()
-            
-            active_users = AuditLog.objects.filter(
-                timestamp__date=date
-            ).values('performed_by').distinct().count()
-            
-            activity_data.append({
+        # Активные пользователи — HyperLogLog в Redis (apps/common/activity.py)
+        daily_active = activity.daily_active_users(start_date, end_date)
+        
+        activity_data = [
+            {
                 'date': date.isoformat(),
-                'new_users': new_users,
+                'new_users': new_users.get(date, 0),
                 'active_users': active_users
-            })
+            }
+            for date, active_users in daily_active.items()
+        ]
         
         return Response({
             'activity': activity_data,
+            'summary': activity.activity_summary(end_date),
             'period': {
                 'start_date': start_date.isoformat(),
                 'end_date': end_date.isoformat(),
@@ -391,11 +413,12 @@ class UserActivityView(APIView):
             }
         })
 
-class CountriesAnalyticsView(APIView):
+class CountriesAnalyticsView(ConditionalGetMixin, APIView):
     """Аналитика по странам"""
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    etag_dependencies = ('modules', 'likes', 'users')
     
-    @method_decorator(cache_page(60 * 60))  # Кэш на 1 час
+    @cache_response()  # Инвалидируется по изменению данных
     def get(self, request):
         # Модули по странам
         modules_by_country = AIModule.objects.filter(
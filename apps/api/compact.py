@@ -0,0 +1,105 @@
+"""
+Компактное представление списка EstimatorItem.
+
+Строки ссылаются на владельцев, страны, теги и публикации по id,
+а сами объекты передаются один раз на страницу в словарях
+countries / owners / tags / publications.
+Выбирается через ?format=compact или Accept: application/vnd.estimators.compact+json.
+"""
+from .compiled import tags_by_category
+from .serializers import (
+    EstimatorSerializer, PublicationForEstimatorSerializer, SimpleTagSerializer,
+)
+
+# Поля-списки тегов в строке
+TAG_LIST_FIELDS = ('tasks', 'anatomical_areas', 'technologies', 'languages')
+
+
+def _lookup_data(obj):
+    return {'id': obj.id, 'name': obj.name or '', 'name_ru': obj.name_ru or ''}
+
+
+def build_compact_estimators(modules, context=None):
+    """
+    Args:
+        modules: модули с select_related created_by, country, details__* и
+            prefetch publications, aimoduletag_set__tag__category
+        context: контекст сериализатора
+
+    Returns:
+        dict: results + словари countries, owners, tags, publications
+    """
+    estimator = EstimatorSerializer(context=context or {})
+    countries, owners, tags, publications = {}, {}, {}, {}
+    results = []
+
+    for module in modules:
+        by_category = tags_by_category(module)
+        details = getattr(module, 'details', None)
+
+        availability = by_category['availability'][:1]
+        if availability:
+            availability = _lookup_data(availability[0])
+        elif details is not None and details.availability:
+            availability = _lookup_data(details.availability)
+        else:
+            availability = None
+
+        usage_status = by_category['usage_status'][:1]
+        if usage_status:
+            usage_status = _lookup_data(usage_status[0])
+        elif details is not None and details.usage_status:
+            usage_status = _lookup_data(details.usage_status)
+        else:
+            usage_status = None
+
+        if module.created_by_id not in owners:
+            owners[module.created_by_id] = estimator.get_owner(module)
+        if module.country_id not in countries:
+            country = module.country
+            countries[country.id] = {
+                'id': country.id,
+                'name': country.name,
+                'name_ru': country.name_ru,
+                'code': country.code,
+            }
+
+        row = {
+            'id': module.id,
+            'owner': module.created_by_id,
+            'developer_country': module.country_id,
+            'application_country': module.country_id,
+            'availability': availability,
+            'usage_status': usage_status,
+        }
+        for field_name in TAG_LIST_FIELDS:
+            row[field_name] = []
+            for tag in by_category[field_name]:
+                tags.setdefault(tag.id, tag)
+                row[field_name].append(tag.id)
+
+        row['scientific_papers'] = []
+        for publication in module.publications.all():
+            publications.setdefault(publication.id, publication)
+            row['scientific_papers'].append(publication.id)
+
+        row.update({
+            'created_at': module.created_at,
+            'updated_at': module.updated_at,
+            'title': module.name,
+            'developer_company': module.company,
+            'parameter_count': module.params_count,
+            'task_short_description': module.task_short_description,
+            'key_characteristics': estimator.get_key_characteristics(module),
+        })
+        results.append(row)
+
+    tag_data = SimpleTagSerializer(list(tags.values()), many=True).data
+    publication_data = PublicationForEstimatorSerializer(list(publications.values()), many=True).data
+    return {
+        'results': results,
+        'countries': countries,
+        'owners': owners,
+        'tags': {item['id']: item for item in tag_data},
+        'publications': {item['id']: item for item in publication_data},
+    }
@@ -0,0 +1,314 @@
+"""
+Скомпилированные сериализаторы только для чтения.
+
+Для горячих списков (list, as_estimators, similar) механизм полей DRF
+занимает большую часть времени. CompiledSerializer по декларативной
+спецификации генерирует обычную функцию, собирающую dict одним литералом.
+Формат вывода совпадает с EstimatorSerializer / AIModuleListSerializer
+(проверка: apps/api/tests.py и manage.py benchmark_serializers).
+
+Спецификация: последовательность (поле, источник), где источник —
+    'attr' или 'attr.sub'   атрибут объекта (связи не должны быть null);
+    ('attr', converter)     атрибут, преобразованный функцией converter(value);
+    callable(obj, context)  произвольное вычисление.
+"""
+from rest_framework import serializers
+from transliterate import translit
+
+from apps.common.instrumentation import track_time
+
+from .serializers import ESTIMATOR_TAG_CATEGORIES
+
+_datetime_field = serializers.DateTimeField()
+
+
+def drf_datetime(value):
+    """Дата/время в формате DateTimeField DRF (ISO 8601, 'Z' для UTC)"""
+    return _datetime_field.to_representation(value)
+
+
+def isoformat(value):
+    """Дата/время как в SerializerMethodField EstimatorSerializer"""
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+class CompiledSerializer:
+    """
+    Сериализатор, скомпилированный из спецификации.
+
+    Поддерживает fields / exclude как DynamicFieldsMixin; функция для
+    каждого набора полей компилируется один раз.
+    """
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.spec = dict(spec)
+        self._builders = {}
+
+    def get_field_names(self, fields=None, exclude=None):
+        names = [name for name in self.spec if fields is None or name in fields]
+        if exclude:
+            names = [name for name in names if name not in exclude]
+        return tuple(names)
+
+    def get_builder(self, fields=None, exclude=None):
+        names = self.get_field_names(fields, exclude)
+        builder = self._builders.get(names)
+        if builder is None:
+            builder = self._builders[names] = self._compile(names)
+        return builder
+
+    def _compile(self, names):
+        namespace = {}
+        lines = ['def build(obj, context):', '    return {']
+        for index, name in enumerate(names):
+            source = self.spec[name]
+            converter = None
+            if isinstance(source, tuple):
+                source, converter = source
+
+            if callable(source):
+                namespace[f'_source{index}'] = source
+                expr = f'_source{index}(obj, context)'
+            else:
+                if not all(part.isidentifier() for part in source.split('.')):
+                    raise ValueError(f'{self.name}.{name}: invalid source {source!r}')
+                expr = f'obj.{source}'
+
+            if converter is not None:
+                namespace[f'_convert{index}'] = converter
+                expr = f'_convert{index}({expr})'
+            lines.append(f'        {name!r}: {expr},')
+        lines.append('    }')
+
+        code = compile('\n'.join(lines), f'<compiled serializer {self.name}>', 'exec')
+        exec(code, namespace)
+        return namespace['build']
+
+    def to_representation(self, instance, context=None, fields=None, exclude=None):
+        return self.get_builder(fields, exclude)(instance, context or {})
+
+    def serialize_many(self, instances, context=None, fields=None, exclude=None):
+        build = self.get_builder(fields, exclude)
+        context = context or {}
+        with track_time('serialize'):
+            return [build(instance, context) for instance in instances]
+
+
+# EstimatorSerializer
+
+def tags_by_category(module):
+    """
+    Активные теги модуля по полям EstimatorItem.
+
+    Использует prefetch aimoduletag_set__tag__category, порядок как в
+    EstimatorSerializer._tags_by_cat (по названию тега). Результат
+    запоминается на объекте, чтобы поля одной строки не пересчитывали его.
+    """
+    cached = getattr(module, '_estimator_tags', None)
+    if cached is not None:
+        return cached
+
+    tags = sorted(
+        (amt.tag for amt in module.aimoduletag_set.all() if amt.tag.is_active),
+        key=lambda tag: tag.name,
+    )
+    result = {}
+    for field_name, names in ESTIMATOR_TAG_CATEGORIES.items():
+        result[field_name] = [
+            tag for tag in tags
+            if tag.category.name in names or tag.category.name_ru in names
+        ]
+    module._estimator_tags = result
+    return result
+
+
+def _simple_object(obj):
+    """SimpleTagSerializer / EstimatorAvailabilitySerializer / EstimatorGenericStatusSerializer"""
+    return {
+        'id': obj.id,
+        'name': obj.name,
+        'name_ru': obj.name_ru,
+        'created_at': drf_datetime(obj.created_at),
+        'updated_at': drf_datetime(obj.updated_at),
+    }
+
+
+def _empty_object(obj, name='', name_ru=''):
+    return {
+        'id': 0,
+        'name': name,
+        'name_ru': name_ru,
+        'created_at': isoformat(obj.created_at),
+        'updated_at': isoformat(obj.updated_at),
+    }
+
+
+def _owner(obj, context):
+    user = obj.created_by
+    date_joined = getattr(user, 'date_joined', obj.created_at)
+    return {
+        'id': user.id,
+        'username': user.username or '',
+        'email': user.email or '',
+        'first_name': user.first_name or '',
+        'last_name': user.last_name or '',
+        'is_staff': user.is_staff,
+        'is_active': user.is_active,
+        'date_joined': isoformat(date_joined),
+    }
+
+
+def _country(obj, context):
+    country = obj.country
+    return {
+        'id': country.id,
+        'name': country.name,
+        'name_ru': country.name_ru,
+        'created_at': isoformat(obj.created_at),
+        'updated_at': isoformat(obj.updated_at),
+        'code': country.code,
+    }
+
+
+def _availability(obj, context):
+    tags = tags_by_category(obj)['availability']
+    if tags:
+        return _simple_object(tags[0])
+    details = getattr(obj, 'details', None)
+    if details is not None and details.availability:
+        return _simple_object(details.availability)
+    return _empty_object(obj)
+
+
+def _usage_status(obj, context):
+    tags = tags_by_category(obj)['usage_status']
+    if tags:
+        return _simple_object(tags[0])
+    details = getattr(obj, 'details', None)
+    if details is not None and details.usage_status:
+        return _simple_object(details.usage_status)
+    if not obj.status:
+        return _empty_object(obj)
+    try:
+        status_en = translit(str(obj.status), 'ru', reversed=True)
+    except Exception:
+        status_en = str(obj.status)
+    return _empty_object(obj, status_en, str(obj.status))
+
+
+def _tag_list(field_name):
+    def source(obj, context):
+        return [_simple_object(tag) for tag in tags_by_category(obj)[field_name]]
+    return source
+
+
+def _publications(obj, context):
+    return [
+        {
+            'id': publication.id,
+            'title': publication.title,
+            'authors': publication.authors,
+            'abstract': '',
+            'journal_or_conference': publication.journal_conference,
+            'publication_year': (
+                str(publication.publication_date.year) if publication.publication_date else None
+            ),
+            'doi': publication.doi,
+            'url': publication.url,
+            'created_at': drf_datetime(publication.created_at),
+            'updated_at': drf_datetime(publication.updated_at),
+        }
+        for publication in obj.publications.all()
+    ]
+
+
+def _key_characteristics(obj, context):
+    details = getattr(obj, 'details', None)
+    if details is not None:
+        return details.technical_info or details.description or ''
+    return ''
+
+
+estimator_serializer = CompiledSerializer('EstimatorSerializer', [
+    ('id', 'id'),
+    ('owner', _owner),
+    ('developer_country', _country),
+    ('application_country', _country),
+    ('availability', _availability),
+    ('usage_status', _usage_status),
+    ('tasks', _tag_list('tasks')),
+    ('anatomical_areas', _tag_list('anatomical_areas')),
+    ('technologies', _tag_list('technologies')),
+    ('scientific_papers', _publications),
+    ('languages', _tag_list('languages')),
+    ('created_at', ('created_at', drf_datetime)),
+    ('updated_at', ('updated_at', drf_datetime)),
+    ('title', 'name'),
+    ('developer_company', 'company'),
+    ('parameter_count', ('params_count', int)),
+    ('task_short_description', 'task_short_description'),
+    ('key_characteristics', _key_characteristics),
+])
+
+
+# AIModuleListSerializer
+
+def _list_created_by(obj, context):
+    user = obj.created_by
+    return {
+        'username': user.username,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'organization': user.organization,
+    }
+
+
+def _list_tags(obj, context):
+    return [
+        {
+            'id': tag.id,
+            'name': tag.name,
+            'color_display': tag.get_color_or_default(),
+            'category_name': tag.category.name,
+        }
+        for tag in obj.get_tags()
+    ]
+
+
+def _is_liked(obj, context):
+    """
+    Лайкнул ли модуль текущий пользователь.
+
+    Если в контексте передан liked_module_ids (множество id модулей,
+    отмеченных пользователем), запросы по каждому модулю не выполняются.
+    """
+    liked_ids = context.get('liked_module_ids')
+    if liked_ids is not None:
+        return obj.id in liked_ids
+    request = context.get('request')
+    if request and request.user.is_authenticated:
+        return obj.is_liked_by(request.user)
+    return False
+
+
+module_list_serializer = CompiledSerializer('AIModuleListSerializer', [
+    ('id', 'id'),
+    ('name', 'name'),
+    ('slug', 'slug'),
+    ('company', 'company'),
+    ('country', 'country_id'),
+    ('params_count', ('params_count', int)),
+    ('task_short_description', 'task_short_description'),
+    ('status', 'status'),
+    ('status_display', lambda obj, context: obj.get_status_display()),
+    ('version', 'version'),
+    ('license_type', 'license_type'),
+    ('created_by', _list_created_by),
+    ('created_at', ('created_at', drf_datetime)),
+    ('updated_at', ('updated_at', drf_datetime)),
+    ('published_at', ('published_at', drf_datetime)),
+    ('tags', _list_tags),
+    ('like_count', lambda obj, context: obj.get_like_count()),
+    ('is_liked', _is_liked),
+])
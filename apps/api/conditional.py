@@ -0,0 +1,98 @@
+import hashlib
+import json
+
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag
+
+from apps.common.versions import get_versions
+
+
+def normalized_query(request):
+    """Параметры запроса в каноническом виде (порядок параметров не важен)"""
+    return sorted(
+        (key, sorted(request.query_params.getlist(key)))
+        for key in request.query_params
+    )
+
+
+class ConditionalGetMixin:
+    """
+    Миксин для условных GET-запросов (ETag).
+
+    ETag вычисляется до выполнения запроса к данным и сериализатора
+    из версий групп таблиц (apps.common.versions), параметров запроса,
+    пользователя и даты. При совпадении If-None-Match возвращается 304
+    без обращения к сериализатору.
+
+    Last-Modified не отдается: дата с точностью до секунды не учитывает
+    пользователя, дату периодов и изменения в ту же секунду, и клиент
+    с одним If-Modified-Since получал бы 304 на устаревшие данные.
+
+    Атрибуты:
+        etag_dependencies: группы данных, от которых зависит ответ
+        etag_daily: ответ зависит от текущей даты (периоды "за N дней")
+    """
+
+    etag_dependencies = ()
+    etag_daily = False
+
+    def get_etag_vary(self, request):
+        """Часть ключа, зависящая от пользователя (права, is_liked и т.п.)"""
+        if request.user and request.user.is_authenticated:
+            # Роль в ключе: смена прав не ждет изменения версии группы 'users'
+            role = 'admin' if request.user.is_admin() else 'user'
+            return f'user:{request.user.pk}:{role}'
+        return 'anon'
+
+    def get_conditional_etag(self, request):
+        """
+        Returns:
+            str | None: ETag или None, если зависимости не заданы
+        """
+        if not self.etag_dependencies:
+            return None
+
+        versions = get_versions(self.etag_dependencies)
+        parts = {
+            'view': self.__class__.__name__,
+            'action': getattr(self, 'action', None) or '',
+            'kwargs': {key: str(value) for key, value in self.kwargs.items()},
+            'query': normalized_query(request),
+            'vary': self.get_etag_vary(request),
+            'media_type': getattr(request, 'accepted_media_type', None),
+            'versions': versions,
+        }
+        if self.etag_daily:
+            parts['date'] = timezone.now().date().isoformat()
+
+        digest = hashlib.md5(
+            json.dumps(parts, sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()
+        return quote_etag(digest)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        self.conditional_etag = None
+        if request.method not in ('GET', 'HEAD'):
+            return
+
+        etag = self.conditional_etag = self.get_conditional_etag(request)
+        if etag is None:
+            return
+
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            # Подменяем обработчик, чтобы не выполнять запросы и сериализацию
+            setattr(self, request.method.lower(), lambda *args, **kwargs: not_modified)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        etag = getattr(self, 'conditional_etag', None)
+        if etag and response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Cache-Control'] = 'private, no-cache'
+            patch_vary_headers(response, ['Accept'])
+        return response
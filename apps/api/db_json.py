@@ -0,0 +1,336 @@
+"""
+Сборка JSON документов модулей на стороне PostgreSQL.
+
+Документ каждого модуля собирается одним SQL-запросом (подзапросы для
+владельца, страны, тегов по категориям и публикаций) и возвращается
+готовым JSON-текстом, который передается в ответ без разбора в Python.
+
+Текст строится конкатенацией, а не json_build_object: PostgreSQL
+форматирует json_build_object с пробелами (" : ", ", "), а документ
+должен побайтно совпадать с EstimatorSerializer + ORJSONRenderer.
+Значения экранируются через to_json(), даты форматируются как в DRF
+(ISO 8601, 'Z' для UTC) или как datetime.isoformat() ('+00:00').
+
+Включается настройкой API_DB_JSON_RENDERING, работает только на PostgreSQL.
+Проверка совпадения: apps/api/tests.py (на PostgreSQL) и manage.py benchmark_serializers.
+"""
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from django.db import connection
+
+from apps.ai_modules.models import AIModule, AIModuleDetail, AIModuleLike, Availability, UsageStatus
+from apps.accounts.models import User
+from apps.common.models import Country
+from apps.publications.models import Publication
+from apps.tags.models import Tag, TagCategory, AIModuleTag
+
+from .serializers import ESTIMATOR_TAG_CATEGORIES
+
+# Количество строк, читаемых за раз при потоковой выгрузке
+STREAM_CHUNK_SIZE = 500
+
+TABLES = {
+    'module': AIModule._meta.db_table,
+    'detail': AIModuleDetail._meta.db_table,
+    'availability': Availability._meta.db_table,
+    'usage_status': UsageStatus._meta.db_table,
+    'user': User._meta.db_table,
+    'country': Country._meta.db_table,
+    'publication': Publication._meta.db_table,
+    'tag': Tag._meta.db_table,
+    'category': TagCategory._meta.db_table,
+    'module_tag': AIModuleTag._meta.db_table,
+    'like': AIModuleLike._meta.db_table,
+}
+
+
+def is_available():
+    """Включен ли режим и поддерживает ли его база данных"""
+    return getattr(settings, 'API_DB_JSON_RENDERING', False) and connection.vendor == 'postgresql'
+
+
+# SQL-выражения, возвращающие JSON-текст значения
+
+def _literal(value):
+    return "'" + value.replace("'", "''") + "'"
+
+
+def json_string(expr):
+    return f"COALESCE(to_json(({expr})::text)::text, 'null')"
+
+
+def json_number(expr):
+    return f"COALESCE(({expr})::text, 'null')"
+
+
+def json_bool(expr):
+    return f"CASE WHEN {expr} THEN 'true' WHEN NOT {expr} THEN 'false' ELSE 'null' END"
+
+
+def json_datetime(expr, utc_suffix='Z'):
+    """
+    Дата/время в UTC: 'Z' — как DateTimeField DRF, '+00:00' — как isoformat().
+    Микросекунды опускаются, если равны нулю (как в isoformat()).
+    """
+    return (
+        f"COALESCE('\"' || to_char(({expr}) AT TIME ZONE 'UTC', 'YYYY-MM-DD\"T\"HH24:MI:SS')"
+        f" || CASE WHEN to_char({expr}, 'US') = '000000' THEN '' ELSE to_char({expr}, '.US') END"
+        f" || {_literal(utc_suffix)} || '\"', 'null')"
+    )
+
+
+def json_object(pairs):
+    """Объект из пар (ключ, SQL-выражение JSON-текста) в заданном порядке"""
+    parts = []
+    for index, (key, expr) in enumerate(pairs):
+        prefix = '{' if index == 0 else ','
+        parts.append(_literal(f'{prefix}"{key}":'))
+        parts.append(f'({expr})')
+    parts.append("'}'")
+    return '(' + ' || '.join(parts) + ')'
+
+
+def _order_by(model, alias):
+    """ORDER BY по Meta.ordering модели (только собственные поля)"""
+    clauses = []
+    for name in model._meta.ordering:
+        descending = name.startswith('-')
+        column = model._meta.get_field(name.lstrip('-')).column
+        clauses.append(f'{alias}.{column} {"DESC" if descending else "ASC"}')
+    clauses.append(f'{alias}.id ASC')
+    return ', '.join(clauses)
+
+
+# EstimatorSerializer
+
+def _simple_object(alias):
+    """SimpleTagSerializer / EstimatorAvailabilitySerializer / EstimatorGenericStatusSerializer"""
+    return json_object([
+        ('id', json_number(f'{alias}.id')),
+        ('name', json_string(f'{alias}.name')),
+        ('name_ru', json_string(f'{alias}.name_ru')),
+        ('created_at', json_datetime(f'{alias}.created_at')),
+        ('updated_at', json_datetime(f'{alias}.updated_at')),
+    ])
+
+
+def _empty_object(name="''", name_ru="''"):
+    return json_object([
+        ('id', '0'),
+        ('name', json_string(name)),
+        ('name_ru', json_string(name_ru)),
+        ('created_at', json_datetime('m.created_at', '+00:00')),
+        ('updated_at', json_datetime('m.updated_at', '+00:00')),
+    ])
+
+
+def _category_tags(field_name):
+    """FROM/WHERE активных тегов модуля из категорий поля EstimatorItem"""
+    names = ', '.join(_literal(name) for name in ESTIMATOR_TAG_CATEGORIES[field_name])
+    return (
+        f"FROM {TABLES['tag']} t"
+        f" JOIN {TABLES['module_tag']} amt ON amt.tag_id = t.id"
+        f" JOIN {TABLES['category']} tc ON tc.id = t.category_id"
+        f" WHERE amt.ai_module_id = m.id AND t.is_active"
+        f" AND (tc.name IN ({names}) OR tc.name_ru IN ({names}))"
+    )
+
+
+def _first_tag(field_name):
+    return f"(SELECT {_simple_object('t')} {_category_tags(field_name)} ORDER BY t.name LIMIT 1)"
+
+
+def _tag_list(field_name):
+    return (
+        f"COALESCE((SELECT '[' || string_agg({_simple_object('t')}, ',' ORDER BY t.name) || ']'"
+        f" {_category_tags(field_name)}), '[]')"
+    )
+
+
+def _owner():
+    return json_object([
+        ('id', json_number('u.id')),
+        ('username', json_string("COALESCE(u.username, '')")),
+        ('email', json_string("COALESCE(u.email, '')")),
+        ('first_name', json_string("COALESCE(u.first_name, '')")),
+        ('last_name', json_string("COALESCE(u.last_name, '')")),
+        ('is_staff', json_bool('u.is_staff')),
+        ('is_active', json_bool('u.is_active')),
+        ('date_joined', json_datetime('u.date_joined', '+00:00')),
+    ])
+
+
+def _country():
+    return json_object([
+        ('id', json_number('c.id')),
+        ('name', json_string('c.name')),
+        ('name_ru', json_string('c.name_ru')),
+        ('created_at', json_datetime('m.created_at', '+00:00')),
+        ('updated_at', json_datetime('m.updated_at', '+00:00')),
+        ('code', json_string('c.code')),
+    ])
+
+
+def _publications():
+    publication = json_object([
+        ('id', json_number('p.id')),
+        ('title', json_string('p.title')),
+        ('authors', json_string('p.authors')),
+        ('abstract', '\'""\''),
+        ('journal_or_conference', json_string('p.journal_conference')),
+        ('publication_year', json_string('extract(year from p.publication_date)::int')),
+        ('doi', json_string('p.doi')),
+        ('url', json_string('p.url')),
+        ('created_at', json_datetime('p.created_at')),
+        ('updated_at', json_datetime('p.updated_at')),
+    ])
+    return (
+        f"COALESCE((SELECT '[' || string_agg({publication}, ','"
+        f" ORDER BY {_order_by(Publication, 'p')}) || ']'"
+        f" FROM {TABLES['publication']} p WHERE p.ai_module_id = m.id), '[]')"
+    )
+
+
+def estimator_document():
+    """SQL-выражение документа EstimatorItem для модуля m"""
+    return json_object([
+        ('id', json_number('m.id')),
+        ('owner', _owner()),
+        ('developer_country', _country()),
+        ('application_country', _country()),
+        ('availability', (
+            f"COALESCE({_first_tag('availability')},"
+            f" CASE WHEN av.id IS NOT NULL THEN {_simple_object('av')} END,"
+            f" {_empty_object()})"
+        )),
+        ('usage_status', (
+            f"COALESCE({_first_tag('usage_status')},"
+            f" CASE WHEN us.id IS NOT NULL THEN {_simple_object('us')} END,"
+            # Коды статусов латинские, translit(..., reversed=True) их не меняет
+            f" CASE WHEN COALESCE(m.status, '') <> '' THEN {_empty_object('m.status', 'm.status')} END,"
+            f" {_empty_object()})"
+        )),
+        ('tasks', _tag_list('tasks')),
+        ('anatomical_areas', _tag_list('anatomical_areas')),
+        ('technologies', _tag_list('technologies')),
+        ('scientific_papers', _publications()),
+        ('languages', _tag_list('languages')),
+        ('created_at', json_datetime('m.created_at')),
+        ('updated_at', json_datetime('m.updated_at')),
+        ('title', json_string('m.name')),
+        ('developer_company', json_string('m.company')),
+        ('parameter_count', json_number('m.params_count')),
+        ('task_short_description', json_string('m.task_short_description')),
+        ('key_characteristics', json_string(
+            "COALESCE(NULLIF(d.technical_info, ''), NULLIF(d.description, ''), '')"
+        )),
+    ])
+
+
+ESTIMATOR_FROM = (
+    f"FROM {TABLES['module']} m"
+    f" JOIN {TABLES['user']} u ON u.id = m.created_by_id"
+    f" JOIN {TABLES['country']} c ON c.id = m.country_id"
+    f" LEFT JOIN {TABLES['detail']} d ON d.ai_module_id = m.id"
+    f" LEFT JOIN {TABLES['availability']} av ON av.id = d.availability_id"
+    f" LEFT JOIN {TABLES['usage_status']} us ON us.id = d.usage_status_id"
+)
+
+
+def _escape(text):
+    # Как ORJSONRenderer / JSONRenderer
+    return text.encode('utf-8').replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+def estimator_documents(module_ids):
+    """
+    Документы EstimatorItem в порядке module_ids.
+
+    Returns:
+        list: JSON каждого модуля (bytes)
+    """
+    if not module_ids:
+        return []
+    sql = f"SELECT m.id, {estimator_document()} {ESTIMATOR_FROM} WHERE m.id = ANY(%s)"
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [list(module_ids)])
+        documents = {pk: _escape(document) for pk, document in cursor.fetchall()}
+    return [documents[pk] for pk in module_ids if pk in documents]
+
+
+def render_page(envelope, documents, renderer, renderer_context=None):
+    """
+    Ответ пагинации с готовыми документами в 'results'.
+
+    Args:
+        envelope: данные пагинации без 'results' (results — последний ключ)
+        documents: JSON документов (bytes)
+        renderer: JSON-рендерер запроса
+    """
+    head = renderer.render(envelope, renderer.media_type, renderer_context)
+    return head[:-1] + b',"results":[' + b','.join(documents) + b']}'
+
+
+# Экспорт модулей (ModulesExportView)
+
+def export_document():
+    """SQL-выражение документа экспорта для модуля m"""
+    tags = (
+        f"COALESCE((SELECT '[' || string_agg(to_json(t.name)::text, ',' ORDER BY amt.id) || ']'"
+        f" FROM {TABLES['module_tag']} amt JOIN {TABLES['tag']} t ON t.id = amt.tag_id"
+        f" WHERE amt.ai_module_id = m.id AND t.is_active), '[]')"
+    )
+    return json_object([
+        ('id', json_string('m.id')),
+        ('name', json_string('m.name')),
+        ('company', json_string('m.company')),
+        ('country', json_string('c.name')),
+        ('params_count', json_number('m.params_count')),
+        ('description', json_string('m.task_short_description')),
+        ('version', json_string('m.version')),
+        ('license', json_string('m.license_type')),
+        ('created_at', json_datetime('m.created_at', '+00:00')),
+        ('tags', tags),
+        ('like_count', json_number(
+            f"(SELECT count(*) FROM {TABLES['like']} l"
+            f" WHERE l.ai_module_id = m.id)"
+        )),
+        ('publications_count', json_number(
+            f"(SELECT count(*) FROM {TABLES['publication']} p WHERE p.ai_module_id = m.id)"
+        )),
+    ])
+
+
+def stream_export(queryset):
+    """
+    Потоковая выгрузка JSON-массива документов экспорта.
+
+    Args:
+        queryset: отфильтрованный queryset модулей (определяет состав выгрузки)
+
+    Yields:
+        bytes: части JSON-массива
+    """
+    try:
+        ids_sql, params = queryset.order_by('id').values('id').query.sql_with_params()
+    except EmptyResultSet:
+        # Заведомо пустой queryset (none(), pk__in=[])
+        yield b'[]'
+        return
+    sql = (
+        f"SELECT {export_document()} FROM {TABLES['module']} m"
+        f" JOIN {TABLES['country']} c ON c.id = m.country_id"
+        f" WHERE m.id IN ({ids_sql}) ORDER BY m.id"
+    )
+    yield b'['
+    first = True
+    with connection.chunked_cursor() as cursor:
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(STREAM_CHUNK_SIZE)
+            if not rows:
+                break
+            chunk = b','.join(_escape(row[0]) for row in rows)
+            yield chunk if first else b',' + chunk
+            first = False
+    yield b']'
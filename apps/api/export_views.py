@@ -1,8 +1,9 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions, status
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.core.serializers import serialize
+from django.db.models import Count
 import json
 import csv
 import io
@@ -10,6 +11,8 @@ from apps.ai_modules.models import AIModule
 from apps.tags.models import Tag
 from apps.publications.models import Publication
 from apps.common.utils import export_to_csv, export_to_xlsx
+from apps.common.metrics import timed_export
+from . import db_json
 
 class ModulesExportView(APIView):
     """Экспорт модулей"""
@@ -29,7 +32,9 @@ class ModulesExportView(APIView):
         if tags:
             queryset = queryset.filter(aimoduletag__tag__id__in=tags).distinct()
         
-        if format_type == 'json':
+        if request.accepted_renderer.format == 'msgpack':
+            return self._export_msgpack(queryset)
+        elif format_type == 'json':
             return self._export_json(queryset)
         elif format_type == 'csv':
             return self._export_csv(queryset)
@@ -41,15 +46,21 @@ class ModulesExportView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
     
-    def _export_json(self, queryset):
-        """Экспорт в JSON"""
+    def _get_export_data(self, queryset):
+        """Данные модулей для JSON / MessagePack экспорта"""
+        queryset = queryset.select_related('country').prefetch_related(
+            'aimoduletag_set__tag'
+        ).annotate(
+            like_count=Count('likes', distinct=True),
+            publications_count=Count('publications', distinct=True)
+        )
         data = []
         for module in queryset:
             module_data = {
                 'id': str(module.id),
                 'name': module.name,
                 'company': module.company,
-                'country': module.country,
+                'country': module.country.name,
                 'params_count': module.params_count,
                 'description': module.task_short_description,
                 'version': module.version,
@@ -57,10 +68,25 @@ class ModulesExportView(APIView):
                 'created_at': module.created_at.isoformat(),
                 'tags': [tag.name for tag in module.get_tags()],
                 'like_count': module.get_like_count(),
-                'publications_count': module.publications.count()
+                'publications_count': module.publications_count
             }
             data.append(module_data)
-        
+        return data
+
+    @timed_export('json')
+    def _export_json(self, queryset):
+        """Экспорт в JSON"""
+        if db_json.is_available():
+            # Документы собираются в PostgreSQL и передаются потоком (без отступов)
+            response = StreamingHttpResponse(
+                db_json.stream_export(queryset),
+                content_type='application/json'
+            )
+            response['Content-Disposition'] = 'attachment; filename="ai_modules.json"'
+            return response
+
+        data = self._get_export_data(queryset)
+
         response = HttpResponse(
             json.dumps(data, indent=2, ensure_ascii=False),
             content_type='application/json'
@@ -68,6 +94,14 @@ class ModulesExportView(APIView):
         response['Content-Disposition'] = 'attachment; filename="ai_modules.json"'
         return response
     
+    @timed_export('msgpack')
+    def _export_msgpack(self, queryset):
+        """Экспорт в MessagePack (Accept: application/msgpack)"""
+        response = Response(self._get_export_data(queryset))
+        response['Content-Disposition'] = 'attachment; filename="ai_modules.msgpack"'
+        return response
+
+    @timed_export('csv')
     def _export_csv(self, queryset):
         """Экспорт в CSV"""
         response = HttpResponse(content_type='text/csv')
@@ -99,6 +133,7 @@ class ModulesExportView(APIView):
         
         return response
     
+    @timed_export('xlsx')
     def _export_xlsx(self, queryset):
         """Экспорт в XLSX"""
         try:
@@ -251,6 +286,7 @@ class ModulesCSVExport(APIView):
     """Экспорт модулей в CSV"""
     permission_classes = [permissions.IsAuthenticated]
     
+    @timed_export('csv')
     def get(self, request):
         """Экспорт в CSV"""
         # Фильтрация
@@ -285,6 +321,7 @@ class ModulesXLSXExport(APIView):
     """Экспорт модулей в XLSX"""
     permission_classes = [permissions.IsAuthenticated]
     
+    @timed_export('xlsx')
     def get(self, request):
         """Экспорт в XLSX"""
         # Фильтрация
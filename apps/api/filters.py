@@ -49,6 +49,17 @@ class AIModuleFilter(django_filters.FilterSet):
         field_name='details__status',
         lookup_expr='in'
     )
+
+    # Фильтры по справочникам (id)
+    availability = django_filters.BaseInFilter(
+        field_name='details__availability',
+        lookup_expr='in'
+    )
+
+    usage_status = django_filters.BaseInFilter(
+        field_name='details__usage_status',
+        lookup_expr='in'
+    )
     
     # Комплексный поиск
     search = django_filters.CharFilter(
@@ -0,0 +1,8 @@
+from django.urls import path
+from . import leaderboard_views
+
+urlpatterns = [
+    path('', leaderboard_views.LeaderboardListView.as_view(), name='leaderboards'),
+    path('<slug:name>/', leaderboard_views.LeaderboardView.as_view(), name='leaderboard'),
+    path('<slug:name>/<int:member_id>/', leaderboard_views.LeaderboardRankView.as_view(), name='leaderboard_rank'),
+]
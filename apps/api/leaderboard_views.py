@@ -0,0 +1,65 @@
+from django.http import Http404
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.common.leaderboards import LEADERBOARDS
+
+MAX_LIMIT = 100
+
+
+def get_leaderboard(name):
+    board = LEADERBOARDS.get(name)
+    if board is None:
+        raise Http404
+    return board
+
+
+class LeaderboardListView(APIView):
+    """Доступные рейтинги"""
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+
+    def get(self, request):
+        return Response([
+            {'name': name, 'size': board.size()}
+            for name, board in LEADERBOARDS.items()
+        ])
+
+
+class LeaderboardView(APIView):
+    """Участники рейтинга по убыванию счета (?offset=0&limit=10)"""
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+
+    def get(self, request, name):
+        board = get_leaderboard(name)
+        try:
+            offset = max(int(request.query_params.get('offset', 0)), 0)
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), MAX_LIMIT)
+        except ValueError:
+            return Response(
+                {'error': 'offset and limit must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response({
+            'name': board.name,
+            'total': board.size(),
+            'offset': offset,
+            'limit': limit,
+            'results': board.with_labels(board.range(offset, limit))
+        })
+
+
+class LeaderboardRankView(APIView):
+    """Место участника в рейтинге"""
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+
+    def get(self, request, name, member_id):
+        board = get_leaderboard(name)
+        rank, score = board.rank_of(member_id)
+        if rank is None:
+            return Response(
+                {'error': 'Not ranked'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(board.with_labels([(rank, member_id, score)])[0])
@@ -0,0 +1,142 @@
+"""
+Пакетная загрузка связанных данных для сериализаторов (DataLoader).
+
+Сериализатор списка сначала регистрирует ключи всех объектов страницы,
+а при первом обращении к значению загрузчик получает их одним IN-запросом.
+Загрузчики живут в пределах запроса: результаты запоминаются и
+переиспользуются всеми сериализаторами этого запроса.
+"""
+from django.contrib.auth import get_user_model
+from django.db import models
+from django.db.models import Count
+from rest_framework import serializers
+
+from apps.tags.models import Tag, AIModuleTag
+
+User = get_user_model()
+
+
+class DataLoader:
+    """
+    Базовый загрузчик: batch_load(keys) -> {key: value}.
+
+    Ключи, для которых batch_load ничего не вернул, получают default.
+    """
+
+    default = None
+
+    def __init__(self):
+        self._cache = {}
+        self._pending = set()
+
+    def batch_load(self, keys):
+        raise NotImplementedError
+
+    def register(self, key):
+        """Отложить ключ до следующей пакетной загрузки"""
+        if key not in self._cache:
+            self._pending.add(key)
+
+    def load(self, key):
+        if key not in self._cache:
+            self._pending.add(key)
+            keys, self._pending = self._pending, set()
+            values = self.batch_load(list(keys))
+            for pending_key in keys:
+                self._cache[pending_key] = values.get(pending_key, self.default)
+        return self._cache[key]
+
+
+class CountLoader(DataLoader):
+    """Количество строк queryset, сгруппированных по key_field"""
+
+    default = 0
+    key_field = None
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def batch_load(self, keys):
+        rows = self.get_queryset().filter(
+            **{f'{self.key_field}__in': keys}
+        ).values(self.key_field).annotate(count=Count('pk')).order_by()
+        return {row[self.key_field]: row['count'] for row in rows}
+
+
+class UserLoader(DataLoader):
+    """Пользователи по id"""
+
+    def batch_load(self, keys):
+        return User.objects.in_bulk(keys)
+
+
+class TagUsageCountLoader(CountLoader):
+    """Количество модулей с тегом"""
+
+    key_field = 'tag'
+
+    def get_queryset(self):
+        return AIModuleTag.objects.all()
+
+
+class ActiveTagsCountLoader(CountLoader):
+    """Количество активных тегов категории"""
+
+    key_field = 'category'
+
+    def get_queryset(self):
+        return Tag.objects.filter(is_active=True)
+
+
+def get_loader(context, loader_class):
+    """
+    Загрузчик из области запроса (или контекста сериализатора, если запроса нет).
+    """
+    request = context.get('request')
+    if request is not None:
+        loaders = getattr(request, '_data_loaders', None)
+        if loaders is None:
+            loaders = request._data_loaders = {}
+    else:
+        loaders = context.setdefault('_data_loaders', {})
+
+    loader = loaders.get(loader_class)
+    if loader is None:
+        loader = loaders[loader_class] = loader_class()
+    return loader
+
+
+class BatchListSerializer(serializers.ListSerializer):
+    """ListSerializer, регистрирующий ключи загрузчиков до сериализации строк"""
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        iterable = list(iterable)
+        self.child.register_batch_keys(iterable)
+        return super().to_representation(iterable)
+
+
+class BatchLoaderMixin:
+    """
+    Миксин сериализатора для загрузки связей через DataLoader.
+
+    batch_keys: (поле сериализатора, класс загрузчика, функция obj -> ключ).
+    Ключи регистрируются только для полей, оставшихся в сериализаторе;
+    функция может вернуть None, если загрузка для объекта не нужна.
+    В Meta сериализатора указывается list_serializer_class = BatchListSerializer.
+    """
+
+    batch_keys = ()
+
+    def load(self, loader_class, key):
+        return get_loader(self.context, loader_class).load(key)
+
+    def register_batch_keys(self, instances):
+        for field_name, loader_class, get_key in self.batch_keys:
+            if field_name not in self.fields:
+                continue
+            loader = get_loader(self.context, loader_class)
+            for instance in instances:
+                key = get_key(instance)
+                if key is not None:
+                    loader.register(key)
@@ -0,0 +1,229 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.ai_modules.models import AIModule
+from apps.common.synthetic import generate_dataset
+from apps.tags.models import Tag
+import json
+import logging
+import statistics
+import time
+import tracemalloc
+
+SIZES = {'1k': 1000, '10k': 10000, '100k': 100000}
+
+# (имя, URL, нужна ли авторизация); {module} и {tag} подставляются из набора данных
+ENDPOINTS = [
+    ('modules_list', '/api/v1/ai-modules/', False),
+    ('modules_filtered', '/api/v1/ai-modules/?tags={tag}&ordering=-created_at', False),
+    ('modules_search', '/api/v1/ai-modules/?search=vision', False),
+    ('module_detail', '/api/v1/ai-modules/{module}/', False),
+    ('estimator', '/api/v1/ai-modules/{module}/estimator/', False),
+    ('as_estimators', '/api/v1/ai-modules/as-estimators/', False),
+    ('similar', '/api/v1/ai-modules/{module}/similar/', False),
+    ('facets_stats', '/api/v1/ai-modules/stats/', False),
+    ('facets_tags', '/api/v1/tags/by_category/', False),
+    ('analytics_overview', '/api/v1/analytics/overview/', False),
+    ('analytics_modules', '/api/v1/analytics/modules/', False),
+    ('analytics_tags', '/api/v1/analytics/tags/', False),
+    ('analytics_countries', '/api/v1/analytics/countries/', False),
+    ('export_json', '/api/v1/export/modules/', True),
+    ('export_csv', '/api/v1/export/modules/csv/', True),
+]
+
+BENCHMARK_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'benchmark_api',
+    }
+}
+
+
+class QueryCounter:
+    """execute_wrapper: количество SQL-запросов"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark API endpoints on a seeded test database: p50/p95 latency, '
+        'queries per request and peak memory, compared against a baseline'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', choices=SIZES, default='1k', help='Dataset size (modules)')
+        parser.add_argument('--modules', type=int, help='Exact number of modules (overrides --size)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed of the dataset')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per endpoint')
+        parser.add_argument('--endpoints', nargs='*', help=f'Subset of: {", ".join(name for name, _, _ in ENDPOINTS)}')
+        parser.add_argument('--warm-cache', action='store_true', help='Keep the cache between requests')
+        parser.add_argument('--output', help='Write results to this JSON file')
+        parser.add_argument('--baseline', help='JSON results to compare against')
+        parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed regression (0.25 = +25%%)')
+        parser.add_argument('--keepdb', action='store_true', help='Keep the test database and dataset between runs')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 2:
+            raise CommandError('--repeat must be at least 2')
+        endpoints = ENDPOINTS
+        if options['endpoints']:
+            unknown = set(options['endpoints']) - {name for name, _, _ in ENDPOINTS}
+            if unknown:
+                raise CommandError(f'Unknown endpoints: {", ".join(sorted(unknown))}')
+            endpoints = [endpoint for endpoint in ENDPOINTS if endpoint[0] in options['endpoints']]
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+
+        modules = options['modules'] or SIZES[options['size']]
+        # Отдельная тестовая БД и локальный кеш: рабочие данные и Redis не затрагиваются
+        old_name = connection.settings_dict['NAME']
+        setup_test_environment()
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'], serialize=False)
+        instrumentation_logger = logging.getLogger('apps.common.instrumentation')
+        log_level = instrumentation_logger.level
+        instrumentation_logger.setLevel(logging.ERROR)  # итоги и N+1 каждого запроса
+        try:
+            with override_settings(CACHES=BENCHMARK_CACHES):
+                dataset = self._seed(modules, options['seed'])
+                results = self._run(endpoints, dataset, options)
+        finally:
+            instrumentation_logger.setLevel(log_level)
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
+            self.stdout.write(f'Results written to {options["output"]}')
+
+        failed = [name for name, row in results['endpoints'].items() if row['status'] >= 400]
+        if baseline is not None:
+            failed += self._compare(results, baseline, options['tolerance'])
+        if failed:
+            raise CommandError(f'Benchmark failed: {", ".join(failed)}')
+        self.stdout.write(self.style.SUCCESS('✓ Benchmark passed'))
+
+    def _seed(self, modules, seed):
+        if AIModule.objects.count() != modules:
+            call_command('flush', interactive=False, verbosity=0)
+            self.stdout.write(f'Seeding {modules} modules (seed {seed})...')
+            start_time = time.perf_counter()
+            counts = generate_dataset(modules=modules, seed=seed)
+            self.stdout.write(
+                f'Seeded in {time.perf_counter() - start_time:.1f}s: '
+                + ', '.join(f'{name} {count}' for name, count in counts.items())
+            )
+        active = AIModule.objects.filter(status=AIModule.Status.ACTIVE).order_by('pk').values_list('pk', flat=True)
+        return {
+            'modules': modules,
+            'seed': seed,
+            'module': active[active.count() // 2],
+            'tag': Tag.objects.order_by('pk').values_list('pk', flat=True).first(),
+        }
+
+    def _run(self, endpoints, dataset, options):
+        admin = AIModule.objects.order_by('pk').first().created_by
+        admin.role = admin.Role.ADMIN
+        admin.is_staff = True
+        admin.save(update_fields=['role', 'is_staff'])
+        token = str(RefreshToken.for_user(admin).access_token)
+
+        client = Client()
+        results = {
+            'dataset': {'modules': dataset['modules'], 'seed': dataset['seed']},
+            'database': connection.vendor,
+            'cache': 'warm' if options['warm_cache'] else 'cold',
+            'repeat': options['repeat'],
+            'endpoints': {},
+        }
+        self.stdout.write(f'{"endpoint":<22}{"p50 ms":>10}{"p95 ms":>10}{"queries":>9}{"peak KB":>10}  status')
+        for name, url_template, auth in endpoints:
+            url = url_template.format(module=dataset['module'], tag=dataset['tag'])
+            headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if auth else {}
+            row = self._measure(client, url, headers, options)
+            results['endpoints'][name] = row
+            line = (
+                f'{name:<22}{row["p50_ms"]:>10.1f}{row["p95_ms"]:>10.1f}'
+                f'{row["queries"]:>9}{row["peak_kb"]:>10.0f}  {row["status"]}'
+            )
+            self.stdout.write(self.style.ERROR(line) if row['status'] >= 400 else line)
+        return results
+
+    def _request(self, client, url, headers, clear_cache):
+        if clear_cache:
+            cache.clear()
+        response = client.get(url, HTTP_HOST='localhost', **headers)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return response
+
+    def _measure(self, client, url, headers, options):
+        clear_cache = not options['warm_cache']
+        for _ in range(options['warmup']):
+            self._request(client, url, headers, clear_cache)
+
+        timings = []
+        for _ in range(options['repeat']):
+            start_time = time.perf_counter()
+            response = self._request(client, url, headers, clear_cache)
+            timings.append((time.perf_counter() - start_time) * 1000)
+
+        # Не CaptureQueriesContext: request_started очищает connection.queries_log
+        queries = QueryCounter()
+        with connection.execute_wrapper(queries):
+            self._request(client, url, headers, clear_cache)
+
+        tracemalloc.start()
+        try:
+            self._request(client, url, headers, clear_cache)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        quantiles = statistics.quantiles(timings, n=100, method='inclusive')
+        return {
+            'url': url,
+            'status': response.status_code,
+            'p50_ms': round(quantiles[49], 2),
+            'p95_ms': round(quantiles[94], 2),
+            'queries': queries.count,
+            'peak_kb': round(peak / 1024, 1),
+        }
+
+    def _compare(self, results, baseline, tolerance):
+        """Регрессии относительно базовых результатов: время и память с допуском, запросы — строго"""
+        if baseline.get('dataset') != results['dataset'] or baseline.get('database') != results['database']:
+            self.stdout.write(self.style.WARNING('Baseline was recorded on a different dataset or database'))
+
+        regressions = []
+        for name, row in results['endpoints'].items():
+            previous = baseline.get('endpoints', {}).get(name)
+            if previous is None:
+                continue
+            checks = [
+                ('p95_ms', row['p95_ms'] > previous['p95_ms'] * (1 + tolerance)),
+                ('peak_kb', row['peak_kb'] > previous['peak_kb'] * (1 + tolerance)),
+                ('queries', row['queries'] > previous['queries']),
+            ]
+            for metric, regressed in checks:
+                if regressed:
+                    regressions.append(f'{name}.{metric}')
+                    self.stdout.write(self.style.ERROR(
+                        f'✗ {name}: {metric} {previous[metric]} -> {row[metric]}'
+                    ))
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS(f'✓ No regressions against baseline (tolerance {tolerance:.0%})'))
+        return regressions
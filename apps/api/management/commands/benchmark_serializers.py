@@ -0,0 +1,100 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count
+from apps.ai_modules.models import AIModule
+from apps.api import db_json
+from apps.api.compiled import estimator_serializer, module_list_serializer
+from apps.api.renderers import ORJSONRenderer
+from apps.api.serializers import AIModuleListSerializer, EstimatorSerializer
+from apps.api.viewsets import MODULE_TAGS_PREFETCH
+import time
+
+
+class Command(BaseCommand):
+    help = 'Compare DRF and compiled read serializers: output parity and objects/second'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=100, help='Number of modules')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per serializer')
+
+    def handle(self, *args, **options):
+        modules = list(
+            AIModule.objects.filter(status=AIModule.Status.ACTIVE).select_related(
+                'created_by', 'country', 'details__availability', 'details__usage_status'
+            ).prefetch_related(
+                'publications', MODULE_TAGS_PREFETCH
+            ).annotate(
+                like_count=Count('likes', distinct=True)
+            )[:options['limit']]
+        )
+        if not modules:
+            self.stdout.write(self.style.WARNING('No active modules to benchmark'))
+            return
+
+        context = {'request': None}
+
+        cases = [
+            (
+                'EstimatorSerializer',
+                lambda: EstimatorSerializer(modules, many=True, context=context).data,
+                lambda: estimator_serializer.serialize_many(modules, context),
+            ),
+            (
+                'AIModuleListSerializer',
+                lambda: AIModuleListSerializer(modules, many=True, context=context).data,
+                lambda: module_list_serializer.serialize_many(modules, context),
+            ),
+        ]
+
+        self.stdout.write(f'Modules: {len(modules)}, runs: {options["repeat"]}')
+        for name, drf, compiled in cases:
+            drf_data, drf_rate = self._measure(drf, modules, options['repeat'])
+            compiled_data, compiled_rate = self._measure(compiled, modules, options['repeat'])
+
+            self.stdout.write(
+                f'{name}: DRF {drf_rate:.0f} obj/s, compiled {compiled_rate:.0f} obj/s '
+                f'(x{compiled_rate / drf_rate:.1f})'
+            )
+            mismatches = [
+                drf_row['id'] for drf_row, compiled_row in zip(drf_data, compiled_data)
+                if drf_row != compiled_row or list(drf_row) != list(compiled_row)
+            ]
+            if mismatches:
+                self.stdout.write(self.style.ERROR(f'✗ Output differs for modules: {mismatches}'))
+            else:
+                self.stdout.write(self.style.SUCCESS('✓ Output is identical'))
+
+        if connection.vendor == 'postgresql':
+            self._check_db_json(modules, context, options['repeat'])
+
+    def _check_db_json(self, modules, context, repeat):
+        """Побайтное сравнение документов PostgreSQL с EstimatorSerializer + ORJSONRenderer"""
+        renderer = ORJSONRenderer()
+        module_ids = [module.id for module in modules]
+        expected = [
+            renderer.render(row) for row in EstimatorSerializer(modules, many=True, context=context).data
+        ]
+        documents, rate = self._measure(lambda: db_json.estimator_documents(module_ids), modules, repeat)
+
+        self.stdout.write(f'EstimatorSerializer (PostgreSQL JSON): {rate:.0f} obj/s')
+        mismatches = [
+            module_id for module_id, document, reference in zip(module_ids, documents, expected)
+            if document != reference
+        ]
+        if mismatches or len(documents) != len(expected):
+            self.stdout.write(self.style.ERROR(f'✗ Documents differ for modules: {mismatches}'))
+        else:
+            self.stdout.write(self.style.SUCCESS('✓ Documents are byte-identical'))
+
+    def _measure(self, func, modules, repeat):
+        best = None
+        data = None
+        for _ in range(repeat):
+            # Сбрасываем теги, запомненные tags_by_category в предыдущем прогоне
+            for module in modules:
+                module.__dict__.pop('_estimator_tags', None)
+            start_time = time.perf_counter()
+            data = func()
+            elapsed = time.perf_counter() - start_time
+            best = elapsed if best is None else min(best, elapsed)
+        return data, len(modules) / best
@@ -0,0 +1,45 @@
+"""
+Планы запросов к БД.
+
+План — словарь с ключами (все необязательные):
+    'select_related': [...]
+    'prefetch_related': [...]   строки или Prefetch
+    'annotate': {...}
+    'only': [...]
+    'defer': [...]
+"""
+
+
+def merge_query_plans(plans):
+    """Объединение нескольких планов в один"""
+    merged = {
+        'select_related': set(),
+        'prefetch_related': [],
+        'annotate': {},
+        'only': set(),
+        'defer': set(),
+    }
+    for plan in plans:
+        merged['select_related'].update(plan.get('select_related', ()))
+        for lookup in plan.get('prefetch_related', ()):
+            if lookup not in merged['prefetch_related']:
+                merged['prefetch_related'].append(lookup)
+        merged['annotate'].update(plan.get('annotate', {}))
+        merged['only'].update(plan.get('only', ()))
+        merged['defer'].update(plan.get('defer', ()))
+    return merged
+
+
+def apply_query_plan(queryset, plan):
+    """Применить план к queryset"""
+    if plan.get('select_related'):
+        queryset = queryset.select_related(*sorted(plan['select_related']))
+    if plan.get('prefetch_related'):
+        queryset = queryset.prefetch_related(*plan['prefetch_related'])
+    if plan.get('annotate'):
+        queryset = queryset.annotate(**plan['annotate'])
+    if plan.get('only'):
+        queryset = queryset.only(*plan['only'])
+    if plan.get('defer'):
+        queryset = queryset.defer(*plan['defer'])
+    return queryset
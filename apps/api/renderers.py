@@ -0,0 +1,89 @@
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Быстрый JSON-рендерер на orjson.
+
+    Формат ответа совпадает с rest_framework.renderers.JSONRenderer:
+    компактные разделители, UTF-8 без экранирования, datetime в ISO 8601
+    с 'Z' для UTC, Decimal как число, экранирование U+2028/U+2029.
+    Если orjson не установлен, запрошен отступ (indent, Browsable API)
+    или данные не поддерживаются orjson, используется стандартный рендерер.
+    """
+
+    options = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+    # Типы, которые orjson не умеет сериализовать (Decimal, lazy-строки, QuerySet...),
+    # обрабатываются тем же энкодером, что и в DRF
+    default = staticmethod(encoders.JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.default, option=self.options)
+        except (orjson.JSONEncodeError, TypeError):
+            # Например, целые числа больше 64 бит
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Как и JSONRenderer, экранируем \u2028 и \u2029
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Рендерер MessagePack для машинных клиентов.
+
+    Выбирается по заголовку Accept: application/msgpack (или ?format=msgpack).
+    Структура данных та же, что и в JSON; значения, не поддерживаемые
+    msgpack (datetime, Decimal, UUID...), преобразуются энкодером DRF.
+    """
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    default = staticmethod(encoders.JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if msgpack is None:
+            raise ImproperlyConfigured('MessagePackRenderer requires the msgpack package')
+        return msgpack.packb(data, default=self.default, use_bin_type=True)
+
+
+class CompactEstimatorRenderer(ORJSONRenderer):
+    """
+    JSON для компактного списка EstimatorItem (apps.api.compact).
+
+    Сам рендерер данные не меняет: по его формату представление
+    решает, отдавать ли строки со ссылками и словарями объектов.
+    """
+
+    media_type = 'application/vnd.estimators.compact+json'
+    format = 'compact'
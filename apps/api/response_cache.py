@@ -0,0 +1,83 @@
+"""
+Кеш ответов API с инвалидацией по группам данных.
+
+Ключ кеша строится из представления, действия, нормализованных параметров
+запроса, роли (или пользователя) и текущих версий групп данных
+(apps.common.versions). Любое изменение модели из группы меняет версию, и
+старые записи просто перестают использоваться, поэтому TTL может быть
+длинным без риска отдать устаревшие данные.
+"""
+import hashlib
+import json
+from functools import wraps
+
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.response import Response
+
+from apps.common.versions import get_versions
+from .conditional import normalized_query
+
+RESPONSE_CACHE_PREFIX = 'api_response'
+
+
+def get_role(request):
+    """Роль пользователя для варьирования кеша"""
+    user = getattr(request, 'user', None)
+    if not (user and user.is_authenticated):
+        return 'anon'
+    if getattr(user, 'is_admin', None) and user.is_admin():
+        return 'admin'
+    return 'user'
+
+
+def build_response_cache_key(view, request, dependencies, vary_on=None, daily=False):
+    parts = {
+        'view': view.__class__.__name__,
+        'action': getattr(view, 'action', None) or request.method,
+        # StatsExportView вызывает get() напрямую, без as_view(), поэтому kwargs может не быть
+        'kwargs': {key: str(value) for key, value in getattr(view, 'kwargs', {}).items()},
+        'query': normalized_query(request),
+        'versions': get_versions(dependencies),
+    }
+    if vary_on == 'role':
+        parts['role'] = get_role(request)
+    elif vary_on == 'user':
+        parts['user'] = request.user.pk if request.user.is_authenticated else None
+        parts['role'] = get_role(request)
+    if daily:
+        parts['date'] = timezone.now().date().isoformat()
+
+    digest = hashlib.md5(
+        json.dumps(parts, sort_keys=True, default=str).encode('utf-8')
+    ).hexdigest()
+    return f'{RESPONSE_CACHE_PREFIX}:{digest}'
+
+
+def cache_response(timeout=60 * 60 * 24, dependencies=None, vary_on=None, daily=False):
+    """
+    Декоратор для методов APIView / действий ViewSet.
+
+    Args:
+        timeout: время жизни записи
+        dependencies: группы данных; по умолчанию view.etag_dependencies
+        vary_on: None, 'role' (anon/user/admin) или 'user'
+        daily: ответ зависит от текущей даты
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(view, request, *args, **kwargs):
+            deps = dependencies if dependencies is not None else getattr(view, 'etag_dependencies', ())
+            key = build_response_cache_key(view, request, deps, vary_on=vary_on, daily=daily)
+
+            cached = cache.get(key)
+            if cached is not None:
+                data, status_code = cached
+                return Response(data, status=status_code)
+
+            response = func(view, request, *args, **kwargs)
+            if isinstance(response, Response) and response.status_code == 200:
+                cache.set(key, (response.data, response.status_code), timeout)
+            return response
+        return wrapper
+    return decorator
@@ -1,13 +1,25 @@
 from rest_framework import serializers
+from django.conf import settings
 from rest_framework.validators import UniqueValidator
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError as DjangoValidationError
-from apps.ai_modules.models import AIModule, AIModuleDetail, AIModuleLike, AIModuleFile
+from django.db import transaction
+from apps.ai_modules.models import (
+    AIModule, AIModuleDetail, AIModuleLike, AIModuleFile, Availability, UsageStatus
+)
 from apps.tags.models import Tag, TagCategory, AIModuleTag
+from apps.tags.sync import sync_module_tags, tags_assigned
 from apps.publications.models import Publication
 from apps.accounts.models import UserProfile
+from apps.accounts.stats import adjust_user_stats
 from apps.common.models import Country
+from apps.common.versions import bump_versions
 from transliterate import translit
+from collections import Counter
+from .loaders import (
+    BatchLoaderMixin, BatchListSerializer, UserLoader, TagUsageCountLoader,
+    ActiveTagsCountLoader,
+)
 
 User = get_user_model()
 
@@ -42,15 +54,18 @@ class UserProfileSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     
     avatar_url = serializers.SerializerMethodField()
     expertise_list = serializers.SerializerMethodField()
-    modules_count = serializers.SerializerMethodField()
-    total_likes = serializers.SerializerMethodField()
+    # Денормализованные счетчики (apps/accounts/stats.py)
+    modules_count = serializers.IntegerField(source='active_modules_count', read_only=True)
+    total_likes = serializers.IntegerField(source='likes_received_count', read_only=True)
+    publications_count = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = User
         fields = [
             'id', 'username', 'first_name', 'last_name', 'email',
             'organization', 'country', 'role', 'created_at',
-            'avatar_url', 'expertise_list', 'modules_count', 'total_likes'
+            'avatar_url', 'expertise_list', 'modules_count', 'total_likes',
+            'publications_count'
         ]
         read_only_fields = ['id', 'created_at', 'role']
     
@@ -65,14 +80,8 @@ class UserProfileSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
         if hasattr(obj, 'profile'):
             return obj.profile.get_expertise_list()
         return []
-    
-    def get_modules_count(self, obj):
-        return obj.ai_modules.filter(status=AIModule.Status.ACTIVE).count()
-    
-    def get_total_likes(self, obj):
-        return AIModuleLike.objects.filter(ai_module__created_by=obj).count()
 
-class TagSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+class TagSerializer(DynamicFieldsMixin, BatchLoaderMixin, serializers.ModelSerializer):
     """Сериализатор для тегов"""
     
     category_name = serializers.CharField(source='category.name', read_only=True)
@@ -85,16 +94,22 @@ class TagSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
             'id', 'name', 'name_ru', 'slug', 'description', 'color', 'color_display',
             'category_name', 'usage_count', 'is_active'
         ]
+        list_serializer_class = BatchListSerializer
+
+    batch_keys = (
+        ('usage_count', TagUsageCountLoader,
+         lambda obj: None if hasattr(obj, 'usage_count') else obj.pk),
+    )
     
     def get_usage_count(self, obj):
         if hasattr(obj, 'usage_count'):
             return obj.usage_count
-        return obj.aimoduletag_set.count()
+        return self.load(TagUsageCountLoader, obj.pk)
     
     def get_color_display(self, obj):
         return obj.get_color_or_default()
 
-class TagCategorySerializer(serializers.ModelSerializer):
+class TagCategorySerializer(BatchLoaderMixin, serializers.ModelSerializer):
     """Сериализатор для категорий тегов"""
     
     tags = TagSerializer(many=True, read_only=True, fields=['id', 'name', 'color_display'])
@@ -103,9 +118,14 @@ class TagCategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = TagCategory
         fields = ['id', 'name','name_ru', 'slug', 'description', 'order', 'tags', 'tags_count']
+        list_serializer_class = BatchListSerializer
+
+    batch_keys = (
+        ('tags_count', ActiveTagsCountLoader, lambda obj: obj.pk),
+    )
     
     def get_tags_count(self, obj):
-        return obj.tags.filter(is_active=True).count()
+        return self.load(ActiveTagsCountLoader, obj.pk)
 
 class PublicationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Сериализатор для публикаций"""
@@ -154,8 +174,10 @@ class AIModuleDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
         model = AIModuleDetail
         fields = [
             'description', 'technical_info', 'status',
-            'registration_system', 'registration_number', 'ability'
+            'registration_system', 'registration_number', 'ability',
+            'availability', 'usage_status'
         ]
+        read_only_fields = ['availability', 'usage_status']
 
 class AIModuleTagSerializer(serializers.ModelSerializer):
     """Сериализатор для связей модуль-тег"""
@@ -221,20 +243,88 @@ class AIModuleDetailFullSerializer(AIModuleListSerializer):
     def get_tags_by_category(self, obj):
         """Группировка тегов по категориям"""
         tags_dict = {}
-        for amt in obj.aimoduletag_set.select_related('tag__category'):
-            category_name = amt.tag.category.name
+        for tag in obj.get_tags():
+            category_name = tag.category.name
             if category_name not in tags_dict:
                 tags_dict[category_name] = []
             tags_dict[category_name].append({
-                'id': amt.tag.id,
-                'name': amt.tag.name,
-                'color': amt.tag.get_color_or_default(),
-                'confidence': amt.confidence
+                'id': tag.id,
+                'name': tag.name,
+                'color': tag.get_color_or_default(),
             })
         return tags_dict
 
+def _tag_ids(item):
+    """ID тегов из сырых данных элемента (до валидации)"""
+    tag_ids = item.get('tag_ids') if isinstance(item, dict) else None
+    if not isinstance(tag_ids, list):
+        return []
+    ids = []
+    for tag_id in tag_ids:
+        try:
+            ids.append(int(tag_id))
+        except (TypeError, ValueError):
+            pass
+    return ids
+
+
+def _country_id(item):
+    """ID страны из сырых данных элемента (None, если это не число)"""
+    country = item.get('country') if isinstance(item, dict) else None
+    if isinstance(country, bool):
+        return None
+    try:
+        return int(country)
+    except (TypeError, ValueError):
+        return None
+
+
+class CountryMapField(serializers.PrimaryKeyRelatedField):
+    """
+    Страна по ID из context['country_map'], загруженного для всего пакета;
+    ID, которых там нет, проверяются обычным запросом.
+    """
+
+    def to_internal_value(self, data):
+        country_map = self.context.get('country_map', {})
+        country_id = None if isinstance(data, bool) else _country_id({'country': data})
+        if country_id in country_map:
+            if country_map[country_id] is None:
+                self.fail('does_not_exist', pk_value=data)
+            return country_map[country_id]
+        return super().to_internal_value(data)
+
+
+class AIModuleCreateListSerializer(serializers.ListSerializer):
+    """
+    Пакетное создание модулей (POST /ai-modules/bulk/).
+
+    Теги и страны всех элементов загружаются одним запросом на каждую
+    модель до валидации, вложенные теги и публикации всего пакета пишутся
+    одним bulk_create.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self.child.resolve_tags([tag_id for item in data for tag_id in _tag_ids(item)])
+            self.child.resolve_countries([_country_id(item) for item in data])
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        return self.child.create_many(validated_data)
+
+
 class AIModuleCreateSerializer(serializers.ModelSerializer):
-    """Сериализатор для создания модуля"""
+    """
+    Сериализатор для создания модуля.
+
+    Теги запрашиваются один раз и хранятся в context['tag_map']
+    (общем для всех элементов пакета): validate_tag_ids, validate
+    и create берут их оттуда. Страны пакета так же лежат
+    в context['country_map'] (CountryMapField).
+    """
+
+    country = CountryMapField(queryset=Country.objects.all())
     
     # Детальная информация встроенная
     details = AIModuleDetailSerializer(required=False, allow_null=True)
@@ -257,15 +347,36 @@ class AIModuleCreateSerializer(serializers.ModelSerializer):
             'task_short_description', 'version', 'license_type',
              'details', 'tag_ids', 'publications'
         ]
+        list_serializer_class = AIModuleCreateListSerializer
+
+    @property
+    def tag_map(self):
+        """ID -> активный тег (с категорией); None — тег не найден или неактивен"""
+        return self.context.setdefault('tag_map', {})
+
+    def resolve_tags(self, tag_ids):
+        """Догрузить в tag_map теги, которых там еще нет (один запрос)"""
+        missing = set(tag_ids) - set(self.tag_map)
+        if missing:
+            found = Tag.objects.filter(id__in=missing, is_active=True).select_related('category')
+            self.tag_map.update({tag.id: tag for tag in found})
+            self.tag_map.update({tag_id: None for tag_id in missing - set(self.tag_map)})
+        return [self.tag_map[tag_id] for tag_id in tag_ids]
+
+    def resolve_countries(self, country_ids):
+        """Догрузить в context['country_map'] страны, которых там еще нет (один запрос)"""
+        country_map = self.context.setdefault('country_map', {})
+        missing = {country_id for country_id in country_ids if country_id is not None} - set(country_map)
+        if missing:
+            found = Country.objects.in_bulk(missing)
+            country_map.update({country_id: found.get(country_id) for country_id in missing})
     
     def validate_tag_ids(self, value):
         """Валидация тегов"""
         if value:
-            existing_tags = Tag.objects.filter(
-                id__in=value, 
-                is_active=True
-            ).count()
-            if existing_tags != len(value):
+            # Повторы не ошибка: связь с тегом одна
+            value = list(dict.fromkeys(value))
+            if None in self.resolve_tags(value):
                 raise serializers.ValidationError(
                     "Some tags do not exist or are inactive"
                 )
@@ -284,7 +395,7 @@ class AIModuleCreateSerializer(serializers.ModelSerializer):
         # Проверяем соответствие тегов требованиям категорий
         tag_ids = attrs.get('tag_ids', [])
         if tag_ids:
-            tags = Tag.objects.filter(id__in=tag_ids).select_related('category')
+            tags = self.resolve_tags(tag_ids)
             
             # Группируем по категориям
             category_tags = {}
@@ -305,41 +416,53 @@ class AIModuleCreateSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         """Создание модуля с вложенными объектами"""
-        details_data = validated_data.pop('details', None)
-        tag_ids = validated_data.pop('tag_ids', [])
-        publications_data = validated_data.pop('publications', [])
-        
-        # Создаем модуль
-        ai_module = AIModule.objects.create(**validated_data)
-        
-        # Создаем детальную информацию
-        if details_data:
-            AIModuleDetail.objects.create(
-                ai_module=ai_module,
-                **details_data
+        return self.create_many([validated_data])[0]
+
+    @transaction.atomic
+    def create_many(self, items):
+        """
+        Создание модулей одной транзакцией.
+
+        Модули и детали сохраняются по одному (slug, сигналы счетчиков
+        и рейтингов), теги и публикации всех модулей — одним bulk_create.
+        """
+        user = self.context['request'].user
+        modules, links, publications = [], [], []
+        for validated_data in items:
+            validated_data = dict(validated_data)
+            details_data = validated_data.pop('details', None)
+            tag_ids = validated_data.pop('tag_ids', [])
+            publications_data = validated_data.pop('publications', [])
+
+            ai_module = AIModule.objects.create(**validated_data)
+            if details_data:
+                AIModuleDetail.objects.create(ai_module=ai_module, **details_data)
+            modules.append(ai_module)
+
+            links.extend(
+                AIModuleTag(ai_module=ai_module, tag=tag, assigned_by=user)
+                for tag in self.resolve_tags(tag_ids)
             )
-        
-        # Назначаем теги
-        for tag_id in tag_ids:
-            try:
-                tag = Tag.objects.get(id=tag_id, is_active=True)
-                AIModuleTag.objects.create(
-                    ai_module=ai_module,
-                    tag=tag,
-                    assigned_by=self.context['request'].user
-                )
-            except Tag.DoesNotExist:
-                pass  # Тег уже проверен в валидации
-        
-        # Создаем публикации
-        for pub_data in publications_data:
-            Publication.objects.create(
-                ai_module=ai_module,
-                added_by=self.context['request'].user,
-                **pub_data
+            publications.extend(
+                Publication(ai_module=ai_module, added_by=user, **pub_data)
+                for pub_data in publications_data
             )
-        
-        return ai_module
+
+        AIModuleTag.objects.bulk_create(links)
+        Publication.objects.bulk_create(publications)
+        _nested_created(links, publications)
+        return modules
+
+
+def _nested_created(links, publications):
+    """То, что делают сигналы post_save AIModuleTag / Publication, для bulk_create"""
+    tags_assigned(links)
+    owners = Counter(publication.ai_module.created_by_id for publication in publications)
+    for owner_id, count in owners.items():
+        adjust_user_stats(owner_id, publications_count=count)
+    if publications:
+        bump_versions(['publications'])
+
 
 class AIModuleUpdateSerializer(serializers.ModelSerializer):
     """Сериализатор для обновления модуля"""
@@ -381,25 +504,63 @@ class AIModuleUpdateSerializer(serializers.ModelSerializer):
                     **details_data
                 )
         
-        # Обновляем теги
+        # Обновляем теги: только разница с текущими (apps.tags.sync)
         if tag_ids is not None:
-            # Удаляем старые связи
-            instance.aimoduletag_set.all().delete()
-            
-            # Создаем новые
-            for tag_id in tag_ids:
-                try:
-                    tag = Tag.objects.get(id=tag_id, is_active=True)
-                    AIModuleTag.objects.create(
-                        ai_module=instance,
-                        tag=tag,
-                        assigned_by=self.context['request'].user
-                    )
-                except Tag.DoesNotExist:
-                    pass
+            sync_module_tags(instance, tag_ids, assigned_by=self.context['request'].user)
         
         return instance
 
+
+class ModuleTagsSerializer(serializers.Serializer):
+    """
+    Теги модуля (PUT/PATCH /ai-modules/{id}/tags/).
+
+    PUT: tag_ids — полный набор. PATCH: add / remove — изменения к текущему.
+    """
+
+    tag_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+    add = serializers.ListField(child=serializers.IntegerField(), required=False)
+    remove = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+    def validate(self, attrs):
+        if self.partial:
+            if 'tag_ids' in attrs:
+                raise serializers.ValidationError({'tag_ids': 'Use add / remove with PATCH'})
+            if not attrs.get('add') and not attrs.get('remove'):
+                raise serializers.ValidationError('Nothing to change: pass add and/or remove')
+        elif 'tag_ids' not in attrs:
+            raise serializers.ValidationError({'tag_ids': 'This field is required.'})
+
+        new_ids = set(attrs.get('tag_ids', [])) | set(attrs.get('add', []))
+        if new_ids:
+            active = set(Tag.objects.filter(id__in=new_ids, is_active=True).values_list('id', flat=True))
+            missing = sorted(new_ids - active)
+            if missing:
+                raise serializers.ValidationError(
+                    {'add' if self.partial else 'tag_ids': f'Tags do not exist or are inactive: {missing}'}
+                )
+        return attrs
+
+
+class ModerationSerializer(serializers.Serializer):
+    """Массовая модерация (POST /ai-modules/moderate/)"""
+
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
+    action = serializers.ChoiceField(choices=['approve', 'reject', 'block'])
+    comment = serializers.CharField(required=False, allow_blank=True, default='')
+
+    def validate_ids(self, value):
+        max_items = getattr(settings, 'API_BULK_MODERATE_MAX_ITEMS', 1000)
+        if len(value) > max_items:
+            raise serializers.ValidationError(f'Ensure this field has no more than {max_items} elements.')
+        return value
+
+    def validate(self, attrs):
+        if attrs['action'] == 'reject' and not attrs['comment']:
+            raise serializers.ValidationError({'comment': 'Comment is required for rejection'})
+        return attrs
+
+
 # Специальные сериализаторы для статистики
 class ModuleStatsSerializer(serializers.Serializer):
     """Сериализатор для статистики модулей"""
@@ -448,20 +609,16 @@ class AIModuleExportSerializer(serializers.ModelSerializer):
 
 
 
-class EstimatorAvailabilitySerializer(serializers.Serializer):
-    id = serializers.IntegerField()
-    name = serializers.CharField()
-    name_ru = serializers.CharField()
-    created_at = serializers.DateTimeField()
-    updated_at = serializers.DateTimeField()
+class EstimatorAvailabilitySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Availability
+        fields = ('id', 'name', 'name_ru', 'created_at', 'updated_at')
 
 
-class EstimatorGenericStatusSerializer(serializers.Serializer):
-    id = serializers.IntegerField()
-    name = serializers.CharField()
-    name_ru = serializers.CharField()
-    created_at = serializers.DateTimeField()
-    updated_at = serializers.DateTimeField()
+class EstimatorGenericStatusSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UsageStatus
+        fields = ('id', 'name', 'name_ru', 'created_at', 'updated_at')
 
 
 class PublicationForEstimatorSerializer(serializers.ModelSerializer):
@@ -489,7 +646,18 @@ class SimpleTagSerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'name_ru', 'created_at', 'updated_at')
 
 
-class EstimatorSerializer(serializers.ModelSerializer):
+# Поле EstimatorItem -> названия категорий тегов (name или name_ru)
+ESTIMATOR_TAG_CATEGORIES = {
+    'availability': ('Availability Status', 'Доступность', 'Статусы доступности'),
+    'usage_status': ('Statuses', 'Статусы', 'Generic Status'),
+    'tasks': ('Tasks', 'Задачи'),
+    'anatomical_areas': ('Anatomical Areas', 'Анатомические области'),
+    'technologies': ('Technologies', 'Технологии', 'Тип технологии'),
+    'languages': ('Languages', 'Языки'),
+}
+
+
+class EstimatorSerializer(DynamicFieldsMixin, BatchLoaderMixin, serializers.ModelSerializer):
     # owner
     owner = serializers.SerializerMethodField()
 
@@ -538,9 +706,17 @@ class EstimatorSerializer(serializers.ModelSerializer):
             'task_short_description',
             'key_characteristics',
         )
+        list_serializer_class = BatchListSerializer
+
+    batch_keys = (
+        ('owner', UserLoader, lambda obj: None if AIModule.created_by.is_cached(obj) else obj.created_by_id),
+    )
 
     def get_owner(self, obj):
-        u = getattr(obj, 'created_by', None)
+        if AIModule.created_by.is_cached(obj):
+            u = obj.created_by
+        else:
+            u = self.load(UserLoader, obj.created_by_id)
         if not u:
             return {
                 'id': 0,
@@ -608,40 +784,33 @@ class EstimatorSerializer(serializers.ModelSerializer):
 
     def get_availability(self, obj):
         # Берём первый тег из категории Доступности, отдаём как одиночный объект
-        tag = self._first_or_none(self._tags_by_cat(obj, ['Availability Status', 'Доступность', 'Статусы доступности']))
+        tag = self._first_or_none(self._tags_by_cat(obj, ESTIMATOR_TAG_CATEGORIES['availability']))
         if tag:
             return tag
-        # Фоллбек: из details.ability
+        # Фоллбек: из справочника details.availability
         details = getattr(obj, 'details', None)
-        name_ru = getattr(details, 'ability', None) if details else None
-        if not name_ru:
-            return {
-                'id': 0,
-                'name': '',
-                'name_ru': '',
-                'created_at': obj.created_at.isoformat() if hasattr(obj.created_at, 'isoformat') else str(obj.created_at),
-                'updated_at': obj.updated_at.isoformat() if hasattr(obj.updated_at, 'isoformat') else str(obj.updated_at),
-            }
-        try:
-            name_en = translit(name_ru, 'ru', reversed=True)
-        except Exception:
-            name_en = name_ru
+        availability = getattr(details, 'availability', None) if details else None
+        if availability:
+            return EstimatorAvailabilitySerializer(availability).data
         return {
             'id': 0,
-            'name': name_en,
-            'name_ru': name_ru,
+            'name': '',
+            'name_ru': '',
             'created_at': obj.created_at.isoformat() if hasattr(obj.created_at, 'isoformat') else str(obj.created_at),
             'updated_at': obj.updated_at.isoformat() if hasattr(obj.updated_at, 'isoformat') else str(obj.updated_at),
         }
 
     def get_usage_status(self, obj):
         # Если есть теговая категория статусов — берём 1-й тег
-        tag = self._first_or_none(self._tags_by_cat(obj, ['Statuses', 'Статусы', 'Generic Status']))
+        tag = self._first_or_none(self._tags_by_cat(obj, ESTIMATOR_TAG_CATEGORIES['usage_status']))
         if tag:
             return tag
-        # Фоллбек: из details.status или поля obj.status
+        # Фоллбек: из справочника details.usage_status или поля obj.status
         details = getattr(obj, 'details', None)
-        status_ru = (getattr(details, 'status', None) if details else None) or getattr(obj, 'status', None)
+        usage_status = getattr(details, 'usage_status', None) if details else None
+        if usage_status:
+            return EstimatorGenericStatusSerializer(usage_status).data
+        status_ru = getattr(obj, 'status', None)
         if not status_ru:
             return {
                 'id': 0,
@@ -663,16 +832,16 @@ class EstimatorSerializer(serializers.ModelSerializer):
         }
 
     def get_tasks(self, obj):
-        return SimpleTagSerializer(self._tags_by_cat(obj, ['Tasks', 'Задачи']), many=True).data or []
+        return SimpleTagSerializer(self._tags_by_cat(obj, ESTIMATOR_TAG_CATEGORIES['tasks']), many=True).data or []
 
     def get_anatomical_areas(self, obj):
-        return SimpleTagSerializer(self._tags_by_cat(obj, ['Anatomical Areas', 'Анатомические области']), many=True).data or []
+        return SimpleTagSerializer(self._tags_by_cat(obj, ESTIMATOR_TAG_CATEGORIES['anatomical_areas']), many=True).data or []
 
     def get_technologies(self, obj):
-        return SimpleTagSerializer(self._tags_by_cat(obj, ['Technologies', 'Технологии', 'Тип технологии']), many=True).data or []
+        return SimpleTagSerializer(self._tags_by_cat(obj, ESTIMATOR_TAG_CATEGORIES['technologies']), many=True).data or []
 
     def get_languages(self, obj):
-        return SimpleTagSerializer(self._tags_by_cat(obj, ['Languages', 'Языки']), many=True).data or []
+        return SimpleTagSerializer(self._tags_by_cat(obj, ESTIMATOR_TAG_CATEGORIES['languages']), many=True).data or []
 
     def get_key_characteristics(self, obj):
         details = getattr(obj, 'details', None)
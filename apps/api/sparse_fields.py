@@ -0,0 +1,67 @@
+"""
+Разреженные наборы полей (?fields= / ?exclude=).
+
+Параметры запроса сокращают не только вывод сериализатора
+(через DynamicFieldsMixin), но и план запроса к БД: для каждого поля
+сериализатора во ViewSet описывается, какие колонки (only), связи
+(select_related / prefetch_related) и аннотации ему нужны.
+"""
+from .query_plans import apply_query_plan, merge_query_plans
+
+
+def _split_param(value):
+    if not value:
+        return []
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class SparseFieldsMixin:
+    """
+    Миксин ViewSet для ?fields=id,title и ?exclude=scientific_papers.
+
+    Атрибуты:
+        sparse_fields_actions: действия, для которых учитываются параметры
+        sparse_field_plans: поле сериализатора -> {
+            'only': [...],
+            'select_related': [...],
+            'prefetch_related': [...],
+            'annotate': {...},
+        }
+    """
+
+    sparse_fields_actions = ('list', 'retrieve')
+    sparse_field_plans = {}
+
+    def get_sparse_params(self):
+        """Запрошенные и исключенные поля (пустые списки, если не заданы)"""
+        if getattr(self, 'action', None) not in self.sparse_fields_actions:
+            return [], []
+        params = self.request.query_params
+        return _split_param(params.get('fields')), _split_param(params.get('exclude'))
+
+    def get_selected_fields(self):
+        """
+        Returns:
+            set: поля сериализатора для вывода или None, если нужен полный набор
+        """
+        fields, exclude = self.get_sparse_params()
+        if not fields and not exclude:
+            return None
+        selected = set(fields) if fields else set(self.sparse_field_plans)
+        return (selected & set(self.sparse_field_plans)) - set(exclude)
+
+    def apply_field_plans(self, queryset, selected):
+        """Сузить queryset до колонок и связей, нужных выбранным полям"""
+        plan = merge_query_plans(
+            self.sparse_field_plans.get(field_name, {}) for field_name in sorted(selected)
+        )
+        plan['only'] = plan['only'] or {'pk'}
+        return apply_query_plan(queryset, plan)
+
+    def get_serializer(self, *args, **kwargs):
+        fields, exclude = self.get_sparse_params()
+        if fields:
+            kwargs.setdefault('fields', fields)
+        if exclude:
+            kwargs.setdefault('exclude', exclude)
+        return super().get_serializer(*args, **kwargs)
@@ -1,3 +1,317 @@
-from django.test import TestCase
+import datetime
+import decimal
+import io
+import uuid
+from unittest import skipUnless
+from zoneinfo import ZoneInfo
 
-# Create your tests here.
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+from django.test import SimpleTestCase, TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import User
+from apps.ai_modules.models import AIModule, AIModuleDetail, AIModuleLike
+from apps.common.models import Country
+from apps.publications.models import Publication
+from apps.tags.models import AIModuleTag, Tag, TagCategory
+
+from . import db_json
+from .compiled import estimator_serializer, module_list_serializer
+from .export_views import ModulesExportView
+from .parsers import ORJSONParser
+from .renderers import ORJSONRenderer
+from .serializers import AIModuleListSerializer, EstimatorSerializer
+from .viewsets import MODULE_TAGS_PREFETCH, AIModuleViewSet
+
+
+def create_registry():
+    """Небольшой реестр: модули с деталями и без, теги нескольких категорий, публикации"""
+    author = User.objects.create_user(
+        'author', 'author@example.com', 'password', first_name='Ivan', last_name='Petrov',
+        organization='Lab'
+    )
+    country = Country.objects.create(name='Russia', name_ru='Россия', code='RUS')
+    categories = {
+        slug: TagCategory.objects.create(name=name, name_ru=name_ru, slug=slug)
+        for slug, name, name_ru in (
+            ('tasks', 'Tasks', 'Задачи'),
+            ('languages', 'Languages', 'Языки'),
+            ('technologies', 'Technologies', 'Технологии'),
+            ('anatomical-areas', 'Anatomical Areas', 'Анатомические области'),
+        )
+    }
+    tags = [
+        Tag.objects.create(category=category, name=f'{category.name} {index}', slug=f'{slug}-{index}')
+        for slug, category in categories.items()
+        for index in range(2)
+    ]
+
+    modules = []
+    for index in range(4):
+        module = AIModule.objects.create(
+            name=f'Module {index}', name_ru=f'Модуль {index}', company='ACME', country=country,
+            status=AIModule.Status.ACTIVE, created_by=author, task_short_description='Описание',
+            version='1.0',
+        )
+        modules.append(module)
+        for tag in tags[index::2]:
+            AIModuleTag.objects.create(ai_module=module, tag=tag)
+        Publication.objects.create(
+            ai_module=module, title=f'Publication {index}', publication_date=datetime.date(2024, 1, index + 1)
+        )
+
+    # Модуль 0 без деталей, у модуля 1 статус не задан
+    AIModuleDetail.objects.create(ai_module=modules[1], description='d', ability='Коммерческий', status=None)
+    AIModuleDetail.objects.create(ai_module=modules[2], description='d', ability='Открытый', status='Используется')
+    AIModuleDetail.objects.create(ai_module=modules[3], description='d', ability='', status='Пилот')
+    return modules
+
+
+def load_modules():
+    """Модули с тем же планом запроса, что у списков (benchmark_serializers)"""
+    return list(
+        AIModule.objects.select_related(
+            'created_by', 'country', 'details__availability', 'details__usage_status'
+        ).prefetch_related(
+            'publications', MODULE_TAGS_PREFETCH
+        ).annotate(
+            like_count=Count('likes', distinct=True)
+        ).order_by('pk')
+    )
+
+
+class CompiledSerializerParityTests(TestCase):
+    """Скомпилированные сериализаторы выдают то же, что сериализаторы DRF"""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_registry()
+
+    def setUp(self):
+        self.modules = load_modules()
+        self.context = {'request': None}
+
+    def assert_parity(self, modules):
+        self.assertEqual(
+            estimator_serializer.serialize_many(modules, self.context),
+            EstimatorSerializer(modules, many=True, context=self.context).data,
+        )
+        self.assertEqual(
+            module_list_serializer.serialize_many(modules, self.context),
+            AIModuleListSerializer(modules, many=True, context=self.context).data,
+        )
+
+    def test_registry(self):
+        self.assert_parity(self.modules)
+
+    def test_field_order(self):
+        compiled = estimator_serializer.serialize_many(self.modules, self.context)
+        drf = EstimatorSerializer(self.modules, many=True, context=self.context).data
+        self.assertEqual([list(row) for row in compiled], [list(row) for row in drf])
+
+    def test_module_without_details(self):
+        module = self.modules[0]
+        self.assertFalse(hasattr(module, 'details'))
+        self.assert_parity([module])
+
+    def test_null_status(self):
+        module = self.modules[1]
+        self.assertIsNone(module.details.status)
+        self.assert_parity([module])
+
+    def test_tags_in_several_categories(self):
+        module = self.modules[2]
+        categories = {item.tag.category.slug for item in module.aimoduletag_set.all()}
+        self.assertGreater(len(categories), 1)
+        self.assert_parity([module])
+
+    def test_publication_without_date(self):
+        module = self.modules[3]
+        module.publications.all()[0].publication_date = None
+        self.assert_parity([module])
+
+
+@skipUnless(connection.vendor == 'postgresql', 'db_json работает только на PostgreSQL')
+class DBJSONTests(TestCase):
+    """Документы, собранные в PostgreSQL, побайтно совпадают с ответами из Python"""
+
+    @classmethod
+    def setUpTestData(cls):
+        modules = create_registry()
+        # Экранирование, неактивный тег и лайки
+        module = modules[2]
+        module.name = 'Кавычки " и \\ обратная черта\nперенос\u2028разделитель'
+        module.company = 'Tab\tи <html> & эмодзи \U0001F600'
+        module.save()
+        tag = module.aimoduletag_set.first().tag
+        tag.is_active = False
+        tag.save()
+        reader = User.objects.create_user('reader', 'reader@example.com', 'password')
+        AIModuleLike.objects.create(user=reader, ai_module=modules[1])
+        AIModuleLike.objects.create(user=reader, ai_module=modules[2])
+
+    def test_estimator_documents(self):
+        modules = load_modules()
+        renderer = ORJSONRenderer()
+        expected = [
+            renderer.render(row)
+            for row in EstimatorSerializer(modules, many=True, context={'request': None}).data
+        ]
+        self.assertEqual(db_json.estimator_documents([module.pk for module in modules]), expected)
+
+    def test_estimator_documents_order(self):
+        module_ids = list(AIModule.objects.order_by('-pk').values_list('pk', flat=True))
+        documents = db_json.estimator_documents(module_ids)
+        self.assertEqual(len(documents), len(module_ids))
+        self.assertEqual(documents, db_json.estimator_documents(module_ids[::-1])[::-1])
+
+    def test_stream_export(self):
+        queryset = AIModule.objects.filter(status=AIModule.Status.ACTIVE).order_by('id')
+        expected = ORJSONRenderer().render(ModulesExportView()._get_export_data(queryset))
+        self.assertEqual(b''.join(db_json.stream_export(queryset)), expected)
+
+    def test_stream_export_empty(self):
+        self.assertEqual(b''.join(db_json.stream_export(AIModule.objects.none())), b'[]')
+
+
+class AIModuleQueryCountTests(TestCase):
+    """
+    Число SQL-запросов действий AIModuleViewSet.
+
+    Не зависит от размера страницы: запросы на строку недопустимы.
+    В числа изменяющих действий входят SAVEPOINT / RELEASE их transaction.atomic.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        modules = create_registry()
+        cls.module = modules[2]
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        cls.on_review = [
+            AIModule.objects.create(
+                name=f'Review {index}', company='ACME', country=cls.module.country,
+                status=AIModule.Status.ON_REVIEW, created_by=cls.module.created_by,
+                task_short_description='Описание',
+            )
+            for index in range(2)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        # ContentType для AuditLog кешируется на процесс: холодный кеш не входит в число запросов
+        ContentType.objects.get_for_model(AIModule)
+        self.factory = APIRequestFactory()
+
+    def call(self, action, method='get', module=None, data=None):
+        path = '/api/v1/ai-modules/'
+        kwargs = {}
+        if module is not None:
+            path = f'{path}{module.pk}/'
+            kwargs = {'pk': module.pk}
+        request = getattr(self.factory, method)(path, data, format='json')
+        force_authenticate(request, user=self.admin)
+        response = AIModuleViewSet.as_view({method: action})(request, **kwargs)
+        response.render()
+        self.assertLess(response.status_code, 400, response.content)
+        return response
+
+    def assert_queries(self, count, action, method='get', module=None, data=None):
+        with self.assertNumQueries(count):
+            return self.call(action, method, module, data)
+
+    def test_list(self):
+        self.assert_queries(4, 'list')
+
+    def test_list_does_not_grow_with_page(self):
+        for index in range(5):
+            module = AIModule.objects.create(
+                name=f'Extra {index}', company='ACME', country=self.module.country,
+                status=AIModule.Status.ACTIVE, created_by=self.admin, task_short_description='Описание',
+            )
+            AIModuleDetail.objects.create(ai_module=module, description='d', ability='Открытый', status='Пилот')
+        self.assert_queries(4, 'list')
+
+    def test_as_estimators(self):
+        self.assert_queries(4, 'as_estimators')
+
+    def test_retrieve(self):
+        self.assert_queries(5, 'retrieve', module=self.module)
+
+    def test_estimator(self):
+        self.assert_queries(8, 'estimator', module=self.module)
+
+    def test_like_unlike(self):
+        self.assert_queries(10, 'like', 'post', self.module)
+        self.assert_queries(8, 'unlike', 'post', self.module)
+
+    def test_approve(self):
+        self.assert_queries(9, 'approve', 'post', self.on_review[0])
+
+    def test_reject(self):
+        self.assert_queries(6, 'reject', 'post', self.on_review[1], {'comment': 'check'})
+
+    def test_partial_update(self):
+        self.assert_queries(6, 'partial_update', 'patch', self.module, {'version': '2.0'})
+
+    def test_stats(self):
+        self.assert_queries(7, 'stats')
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    """ORJSONRenderer выдает те же байты, что JSONRenderer DRF"""
+
+    def assert_same_bytes(self, data):
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_aware_datetime(self):
+        self.assert_same_bytes({
+            'utc': datetime.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'moscow': datetime.datetime(2024, 5, 1, 12, 30, 15, tzinfo=ZoneInfo('Europe/Moscow')),
+        })
+
+    def test_naive_datetime(self):
+        self.assert_same_bytes({
+            'datetime': datetime.datetime(2024, 5, 1, 12, 30, 15, 123456),
+            'seconds': datetime.datetime(2024, 5, 1, 12, 30, 15),
+            'date': datetime.date(2024, 5, 1),
+            'time': datetime.time(12, 30, 15, 123456),
+        })
+
+    def test_decimal(self):
+        self.assert_same_bytes({'value': decimal.Decimal('12.50'), 'items': [decimal.Decimal('0.1')]})
+
+    def test_uuid(self):
+        self.assert_same_bytes({'id': uuid.UUID('12345678-1234-5678-1234-567812345678')})
+
+    def test_lazy_translation(self):
+        self.assert_same_bytes({'message': gettext_lazy('Not found.')})
+
+    def test_line_separators(self):
+        self.assert_same_bytes({'text': 'первая\u2028вторая\u2029третья'})
+
+    def test_int_keys(self):
+        self.assert_same_bytes({1: 'one', 2: {3: 'three'}})
+
+    def test_big_int_fallback(self):
+        self.assert_same_bytes({'value': 2 ** 70, 'negative': -2 ** 65})
+
+    def test_none(self):
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+
+class ORJSONParserTests(SimpleTestCase):
+
+    def test_round_trip(self):
+        data = {'name': 'Модуль', 'count': 3, 'ratio': 0.5, 'tags': [1, 2], 'details': None, 'active': True}
+        body = ORJSONRenderer().render(data)
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(body)), data)
+
+    def test_other_encoding(self):
+        body = '{"name": "Модуль"}'.encode('cp1251')
+        parsed = ORJSONParser().parse(io.BytesIO(body), parser_context={'encoding': 'cp1251'})
+        self.assertEqual(parsed, {'name': 'Модуль'})
@@ -27,4 +27,5 @@ urlpatterns = [
     # Дополнительные endpoints
     path('analytics/', include('apps.api.analytics_urls')),
     path('export/', include('apps.api.export_urls')),
+    path('leaderboards/', include('apps.api.leaderboard_urls')),
 ]
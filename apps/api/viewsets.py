@@ -3,34 +3,73 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.settings import api_settings
 from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db import transaction
 from django.db.models import Count, Q, Prefetch
 from django.shortcuts import get_object_or_404
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+from django.http import HttpResponse
 from django.core.cache import cache
 from django.utils import timezone
+from django.conf import settings
 
-from apps.ai_modules.models import AIModule, AIModuleDetail, AIModuleLike, AIModuleFile
+from apps.ai_modules.models import (
+    AIModule, AIModuleDetail, AIModuleLike, AIModuleFile, Availability, UsageStatus
+)
+from apps.ai_modules.moderation import moderate_modules
 from apps.tags.models import Tag, TagCategory, AIModuleTag
+from apps.tags.sync import sync_module_tags
 from apps.publications.models import Publication
 from apps.accounts.models import User
 from apps.common.models import Country, AuditLog
+from apps.common.activity import track_activity
+from apps.common.versions import bump_versions
 
 from .serializers import (
     AIModuleListSerializer, AIModuleDetailSerializer, AIModuleCreateSerializer,
+    AIModuleDetailFullSerializer, AIModuleUpdateSerializer,
     TagSerializer, TagCategorySerializer, PublicationSerializer,
-    UserProfileSerializer, CountrySerializer, AIModuleFileSerializer, EstimatorSerializer
+    UserProfileSerializer, CountrySerializer, AIModuleFileSerializer, EstimatorSerializer,
+    EstimatorAvailabilitySerializer, EstimatorGenericStatusSerializer, ModuleTagsSerializer,
+    ModerationSerializer
 )
 from .filters import AIModuleFilter, TagFilter, PublicationFilter
 from .permissions import IsOwnerOrReadOnly, IsAdminOrReadOnly, IsOwnerOrAdminOrReadOnly
 from .pagination import CustomPageNumberPagination
 from .throttling import BurstRateThrottle
+from .conditional import ConditionalGetMixin
+from .response_cache import cache_response
+from .sparse_fields import SparseFieldsMixin
+from .query_plans import apply_query_plan
+from .renderers import CompactEstimatorRenderer
+from .compact import build_compact_estimators
+from .compiled import estimator_serializer, module_list_serializer
+from . import db_json
 from transliterate import translit
+from collections import Counter
+
+
+# Колонки, которые EstimatorSerializer подставляет в пустые объекты
+ESTIMATOR_TIMESTAMPS = ('created_at', 'updated_at')
+
+# Теги модуля с категориями одним запросом (apps.api.compiled.tags_by_category)
+MODULE_TAGS_PREFETCH = Prefetch(
+    'aimoduletag_set',
+    queryset=AIModuleTag.objects.select_related('tag__category')
+)
+
+# Списки EstimatorItem (скомпилированный сериализатор и компактный формат)
+ESTIMATOR_LIST_PLAN = {
+    'select_related': ['created_by', 'country', 'details__availability', 'details__usage_status'],
+    'prefetch_related': ['publications', MODULE_TAGS_PREFETCH],
+}
 
+# Действия, которым нужна только строка модуля (права, статус, лайки)
+MODULE_ROW_PLAN = {'defer': ['task_short_description']}
 
-class AIModuleViewSet(viewsets.ModelViewSet):
+
+class AIModuleViewSet(SparseFieldsMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet для управления ИИ-модулями.
     
@@ -45,10 +84,14 @@ class AIModuleViewSet(viewsets.ModelViewSet):
         """Выбор сериализатора в зависимости от действия"""
         if self.action == 'list':
             return EstimatorSerializer  # ИЗМЕНИТЬ с AIModuleListSerializer на EstimatorSerializer
-        elif self.action == 'create':
+        elif self.action in ['create', 'bulk_create']:
             return AIModuleCreateSerializer
         elif self.action in ['estimator', 'as_estimators']:
             return EstimatorSerializer
+        elif self.action == 'retrieve':
+            return AIModuleDetailFullSerializer
+        elif self.action in ['update', 'partial_update']:
+            return AIModuleUpdateSerializer
         return AIModuleDetailSerializer
     
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
@@ -58,12 +101,86 @@ class AIModuleViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
     pagination_class = CustomPageNumberPagination
     throttle_classes = [AnonRateThrottle, UserRateThrottle, BurstRateThrottle]
+    etag_dependencies = ('modules', 'likes', 'tags', 'publications', 'countries', 'authors')
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, CompactEstimatorRenderer]
+    # План запроса для каждого действия (apps.api.query_plans)
+    query_plans = {
+        'list': ESTIMATOR_LIST_PLAN,
+        'as_estimators': ESTIMATOR_LIST_PLAN,
+        'estimator': {
+            'select_related': ['created_by', 'country', 'details__availability', 'details__usage_status'],
+            'prefetch_related': ['publications'],
+        },
+        'retrieve': {
+            'select_related': ['created_by', 'details__availability', 'details__usage_status'],
+            'prefetch_related': ['publications', 'files__uploaded_by', MODULE_TAGS_PREFETCH],
+            'annotate': {'like_count': Count('likes', distinct=True)},
+        },
+        'export': {
+            'select_related': ['created_by', 'country'],
+            'prefetch_related': [MODULE_TAGS_PREFETCH],
+            'annotate': {'like_count': Count('likes', distinct=True)},
+        },
+        'update': {'select_related': ['details']},
+        'partial_update': {'select_related': ['details']},
+        'destroy': MODULE_ROW_PLAN,
+        'like': MODULE_ROW_PLAN,
+        'unlike': MODULE_ROW_PLAN,
+        'approve': MODULE_ROW_PLAN,
+        'reject': MODULE_ROW_PLAN,
+        'similar': MODULE_ROW_PLAN,
+        'stats': {},
+    }
+    sparse_fields_actions = ('list', 'estimator', 'as_estimators')
+    sparse_field_plans = {
+        'id': {},
+        'owner': {
+            'select_related': ['created_by'],
+            'only': [
+                *ESTIMATOR_TIMESTAMPS, 'created_by', 'created_by__id', 'created_by__username',
+                'created_by__email', 'created_by__first_name', 'created_by__last_name',
+                'created_by__is_staff', 'created_by__is_active', 'created_by__date_joined',
+            ],
+        },
+        'developer_country': {
+            'select_related': ['country'],
+            'only': [*ESTIMATOR_TIMESTAMPS, 'country', 'country__id', 'country__name',
+                     'country__name_ru', 'country__code'],
+        },
+        'application_country': {
+            'select_related': ['country'],
+            'only': [*ESTIMATOR_TIMESTAMPS, 'country', 'country__id', 'country__name',
+                     'country__name_ru', 'country__code'],
+        },
+        'availability': {
+            'select_related': ['details__availability'],
+            'prefetch_related': [MODULE_TAGS_PREFETCH],
+            'only': ESTIMATOR_TIMESTAMPS,
+        },
+        'usage_status': {
+            'select_related': ['details__usage_status'],
+            'prefetch_related': [MODULE_TAGS_PREFETCH],
+            'only': [*ESTIMATOR_TIMESTAMPS, 'status'],
+        },
+        'tasks': {'prefetch_related': [MODULE_TAGS_PREFETCH]},
+        'anatomical_areas': {'prefetch_related': [MODULE_TAGS_PREFETCH]},
+        'technologies': {'prefetch_related': [MODULE_TAGS_PREFETCH]},
+        'languages': {'prefetch_related': [MODULE_TAGS_PREFETCH]},
+        'scientific_papers': {'prefetch_related': ['publications']},
+        'created_at': {'only': ['created_at']},
+        'updated_at': {'only': ['updated_at']},
+        'title': {'only': ['name']},
+        'developer_company': {'only': ['company']},
+        'parameter_count': {'only': ['params_count']},
+        'task_short_description': {'only': ['task_short_description']},
+        'key_characteristics': {'select_related': ['details']},
+    }
     
     def get_permissions(self):
         """Настройка разрешений в зависимости от действия"""
-        if self.action == 'create':
+        if self.action in ['create', 'bulk_create']:
             permission_classes = [permissions.IsAuthenticated]
-        elif self.action in ['update', 'partial_update', 'destroy']:
+        elif self.action in ['update', 'partial_update', 'destroy', 'tags']:
             permission_classes = [IsOwnerOrAdminOrReadOnly]
         elif self.action in ['like', 'unlike']:
             permission_classes = [permissions.IsAuthenticated]
@@ -76,28 +193,93 @@ class AIModuleViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Оптимизированный QuerySet с prefetch_related"""
-        queryset = AIModule.objects.select_related(
-            'created_by',
-            'details'  # ДОБАВИТЬ для доступа к details в сериализаторе
-        ).prefetch_related(
-            'likes',
-            'publications',  # ДОБАВИТЬ для scientific_papers
-            Prefetch(
-                'aimoduletag_set',
-                queryset=AIModuleTag.objects.select_related('tag__category')
-            )
-        )
-        
+        queryset = AIModule.objects.all()
         if not (self.request.user.is_authenticated and self.request.user.is_admin()):
             queryset = queryset.filter(status=AIModule.Status.ACTIVE)
-        
-        # Аннотация количества лайков
-        queryset = queryset.annotate(
-            like_count=Count('likes', distinct=True)
-        )
+
+        selected = None if self.is_compact_request() else self.get_selected_fields()
+        if selected is not None:
+            # ?fields= / ?exclude=: только колонки и связи запрошенных полей
+            queryset = self.apply_field_plans(queryset, selected)
+        else:
+            queryset = apply_query_plan(queryset, self.get_query_plan())
+
+        # Аннотация количества лайков нужна только для сортировки по ней
+        if (
+            'like_count' in self.request.query_params.get('ordering', '')
+            and 'like_count' not in queryset.query.annotations
+        ):
+            queryset = queryset.annotate(like_count=Count('likes', distinct=True))
         
         return queryset
+
+    def get_query_plan(self):
+        """План запроса для текущего действия (по умолчанию — только строка модуля)"""
+        return self.query_plans.get(self.action, MODULE_ROW_PLAN)
     
+    def is_compact_request(self):
+        """Запрошен компактный формат (?format=compact или его media type)"""
+        renderer = getattr(self.request, 'accepted_renderer', None)
+        return self.action in ('list', 'as_estimators') and isinstance(renderer, CompactEstimatorRenderer)
+
+    def list(self, request, *args, **kwargs):
+        if self.is_compact_request():
+            return self.compact_list(request)
+        return self.estimator_list(request)
+
+    def estimator_list(self, request):
+        """Список EstimatorItem через скомпилированный сериализатор (apps.api.compiled)"""
+        fields, exclude = self.get_sparse_params()
+        if not (fields or exclude) and self.use_db_json(request):
+            return self.db_json_list(request)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        data = estimator_serializer.serialize_many(
+            page if page is not None else queryset,
+            self.get_serializer_context(),
+            fields=fields or None,
+            exclude=exclude,
+        )
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+    def use_db_json(self, request):
+        """Собирать документы в PostgreSQL (настройка API_DB_JSON_RENDERING)"""
+        renderer = getattr(request, 'accepted_renderer', None)
+        return db_json.is_available() and getattr(renderer, 'format', None) == 'json'
+
+    def db_json_list(self, request):
+        """Список EstimatorItem, собранный в PostgreSQL (apps.api.db_json)"""
+        queryset = self.filter_queryset(self.get_queryset())
+        queryset = queryset.select_related(None).prefetch_related(None).only('id')
+        page = self.paginate_queryset(queryset)
+        module_ids = [module.id for module in (page if page is not None else queryset)]
+        documents = db_json.estimator_documents(module_ids)
+
+        renderer = request.accepted_renderer
+        if page is None:
+            content = b'[' + b','.join(documents) + b']'
+        else:
+            envelope = self.get_paginated_response([]).data
+            envelope.pop('results')
+            content = db_json.render_page(envelope, documents, renderer)
+        return HttpResponse(content, content_type=f'{renderer.media_type}; charset=utf-8')
+
+    def compact_list(self, request):
+        """Список EstimatorItem со ссылками на общие объекты (apps.api.compact)"""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        data = build_compact_estimators(
+            page if page is not None else queryset, self.get_serializer_context()
+        )
+        if page is None:
+            return Response(data)
+        response = self.get_paginated_response(data.pop('results'))
+        response.data.update(data)
+        return response
+
     def perform_create(self, serializer):
         """Создание модуля с автоматическим назначением создателя"""
         serializer.save(
@@ -114,22 +296,131 @@ class AIModuleViewSet(viewsets.ModelViewSet):
             comment=f"Created AI module '{serializer.instance.name}'"
         )
     
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        """
+        Создание массива модулей (черновики) одной транзакцией.
+
+        Ответ: created — [{index, id, slug}], errors — [{index, errors}].
+        По умолчанию при любой ошибке ничего не создается (400);
+        с ?partial=true создаются корректные элементы (207, если были ошибки).
+        """
+        max_items = getattr(settings, 'API_BULK_CREATE_MAX_ITEMS', 500)
+        serializer = self.get_serializer(data=request.data, many=True, allow_empty=False, max_length=max_items)
+        if serializer.is_valid():
+            indexes = list(range(len(request.data)))
+            item_errors = []
+        else:
+            if not isinstance(serializer.errors, list):
+                # Не массив, пустой массив или больше max_items
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            item_errors = [
+                {'index': index, 'errors': errors}
+                for index, errors in enumerate(serializer.errors) if errors
+            ]
+            indexes = [index for index, errors in enumerate(serializer.errors) if not errors]
+            if not self.is_partial_bulk(request) or not indexes:
+                return Response({'created': [], 'errors': item_errors}, status=status.HTTP_400_BAD_REQUEST)
+            # Повторная проверка только корректных элементов; теги уже в context['tag_map']
+            serializer = self.get_serializer(
+                data=[request.data[index] for index in indexes], many=True, context=serializer.context
+            )
+            serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            modules = serializer.save(created_by=request.user, status=AIModule.Status.DRAFT)
+            self.log_created(modules)
+
+        created = [
+            {'index': index, 'id': module.id, 'slug': module.slug}
+            for index, module in zip(indexes, modules)
+        ]
+        return Response(
+            {'created': created, 'errors': item_errors},
+            status=status.HTTP_207_MULTI_STATUS if item_errors else status.HTTP_201_CREATED
+        )
+
+    def is_partial_bulk(self, request):
+        return request.query_params.get('partial', '').lower() in ('1', 'true', 'yes')
+
+    def log_created(self, modules):
+        """Записи аудита о создании модулей одним INSERT"""
+        AuditLog.objects.bulk_create([
+            AuditLog(
+                content_object=module,
+                action=AuditLog.Action.CREATE,
+                performed_by=self.request.user,
+                ip_address=getattr(self.request, 'ip_address', None),
+                comment=f"Created AI module '{module.name}'"
+            )
+            for module in modules
+        ])
+        # bulk_create не вызывает post_save AuditLog
+        track_activity(self.request.user.id)
+        bump_versions(['audit'])
+
+    @transaction.atomic
     def perform_update(self, serializer):
         """Обновление с логированием изменений"""
-        old_status = self.get_object().status
+        old_status = serializer.instance.get_loaded_value('status')
         instance = serializer.save()
         
+        # Разница по полям без повторной загрузки модуля
+        old_values, new_values = instance.get_audit_values()
+        details = AIModule.details.related.get_cached_value(instance, default=None)
+        if details is not None:
+            details_old, details_new = details.get_audit_values(prefix='details.')
+            old_values.update(details_old)
+            new_values.update(details_new)
+        
         # Логируем изменения
-        if old_status != instance.status:
+        if old_values or new_values:
+            if old_status != instance.status:
+                comment = f"Status changed from {old_status} to {instance.status}"
+            else:
+                comment = f"Updated fields: {', '.join(sorted(new_values))}"
             AuditLog.objects.create(
                 content_object=instance,
                 action=AuditLog.Action.UPDATE,
                 performed_by=self.request.user,
                 ip_address=getattr(self.request, 'ip_address', None),
-                comment=f"Status changed from {old_status} to {instance.status}"
+                comment=comment,
+                old_values=old_values,
+                new_values=new_values
             )
     
+    @action(detail=True, methods=['put', 'patch'])
+    @transaction.atomic
+    def tags(self, request, pk=None):
+        """Заменить (PUT) или изменить (PATCH) набор тегов модуля"""
+        module = self.get_object()
+        serializer = ModuleTagsSerializer(data=request.data, partial=request.method == 'PATCH')
+        serializer.is_valid(raise_exception=True)
+
+        changes = sync_module_tags(
+            module,
+            serializer.validated_data.get('tag_ids'),
+            add=serializer.validated_data.get('add', ()),
+            remove=serializer.validated_data.get('remove', ()),
+            assigned_by=request.user,
+            only_active=False,
+        )
+
+        if changes['added'] or changes['removed']:
+            previous = (set(changes['tag_ids']) - set(changes['added'])) | set(changes['removed'])
+            AuditLog.objects.create(
+                content_object=module,
+                action=AuditLog.Action.UPDATE,
+                performed_by=request.user,
+                ip_address=getattr(request, 'ip_address', None),
+                comment='Updated tags',
+                old_values={'tag_ids': sorted(previous)},
+                new_values={'tag_ids': changes['tag_ids']}
+            )
+        return Response(changes)
+
     @action(detail=True, methods=['post'])
+    @transaction.atomic
     def like(self, request, pk=None):
         """Поставить лайк модулю"""
         module = self.get_object()
@@ -161,6 +452,7 @@ class AIModuleViewSet(viewsets.ModelViewSet):
             })
     
     @action(detail=True, methods=['delete'])
+    @transaction.atomic
     def unlike(self, request, pk=None):
         """Убрать лайк с модуля"""
         module = self.get_object()
@@ -195,32 +487,49 @@ class AIModuleViewSet(viewsets.ModelViewSet):
         module = self.get_object()
         
         # Кешируем результат на 1 час
-        cache_key = f"similar_modules_{module.id}"
+        cache_key = f"similar_modules:{module.id}"
         similar_modules = cache.get(cache_key)
         
         if similar_modules is None:
             module_tags = module.aimoduletag_set.values_list('tag_id', flat=True)
             
             similar_modules = AIModule.objects.filter(
-                aimoduletag_set__tag_id__in=module_tags,
+                aimoduletag__tag_id__in=module_tags,
                 status=AIModule.Status.ACTIVE
             ).exclude(
                 id=module.id
+            ).select_related(
+                'created_by'
+            ).prefetch_related(
+                MODULE_TAGS_PREFETCH
             ).annotate(
-                common_tags_count=Count('aimoduletag_set__tag_id', 
-                    filter=Q(aimoduletag_set__tag_id__in=module_tags))
+                common_tags_count=Count('aimoduletag__tag_id',
+                    filter=Q(aimoduletag__tag_id__in=module_tags), distinct=True),
+                like_count=Count('likes', distinct=True)
             ).order_by('-common_tags_count')[:5]
             
             cache.set(cache_key, similar_modules, 3600)  # 1 час
         
-        serializer = AIModuleListSerializer(similar_modules, many=True, context={'request': request})
-        return Response(serializer.data)
+        return Response(self.serialize_module_list(similar_modules))
+
+    def serialize_module_list(self, modules):
+        """AIModuleListSerializer через скомпилированный сериализатор, is_liked одним запросом"""
+        modules = list(modules)
+        context = self.get_serializer_context()
+        if self.request.user.is_authenticated:
+            context['liked_module_ids'] = set(AIModuleLike.objects.filter(
+                user=self.request.user, ai_module__in=[m.id for m in modules]
+            ).values_list('ai_module_id', flat=True))
+        return module_list_serializer.serialize_many(modules, context)
     
     @action(detail=False, methods=['get'])
-    @method_decorator(cache_page(60 * 15))  # Кеш на 15 минут
+    @cache_response(vary_on='user')  # Видимость модулей и is_liked зависят от пользователя
     def stats(self, request):
         """Статистика по модулям"""
         queryset = self.filter_queryset(self.get_queryset())
+        most_liked = queryset.select_related('created_by').prefetch_related(MODULE_TAGS_PREFETCH)
+        if 'like_count' not in queryset.query.annotations:
+            most_liked = most_liked.annotate(like_count=Count('likes', distinct=True))
         
         stats = {
             'total_modules': queryset.count(),
@@ -237,11 +546,7 @@ class AIModuleViewSet(viewsets.ModelViewSet):
             'total_likes': AIModuleLike.objects.filter(
                 ai_module__in=queryset
             ).count(),
-            'most_liked': AIModuleListSerializer(
-                queryset.order_by('-like_count')[:5],
-                many=True,
-                context={'request': request}
-            ).data
+            'most_liked': self.serialize_module_list(most_liked.order_by('-like_count')[:5])
         }
         
         return Response(stats)
@@ -260,12 +565,10 @@ class AIModuleViewSet(viewsets.ModelViewSet):
         queryset = self.filter_queryset(self.get_queryset())
         
         if format_type == 'json':
-            serializer = AIModuleListSerializer(
-                queryset, many=True, context={'request': request}
-            )
+            results = self.serialize_module_list(queryset)
             return Response({
-                'count': queryset.count(),
-                'results': serializer.data,
+                'count': len(results),
+                'results': results,
                 'exported_at': timezone.now().isoformat()
             })
         
@@ -289,6 +592,7 @@ class AIModuleViewSet(viewsets.ModelViewSet):
             return export_queryset_to_xlsx(queryset, fields, 'ai_modules.xlsx')
     
     @action(detail=True, methods=['post'], permission_classes=[IsOwnerOrAdminOrReadOnly])
+    @transaction.atomic
     def approve(self, request, pk=None):
         """Одобрить модуль (только администраторы)"""
         if not request.user.is_admin():
@@ -310,12 +614,15 @@ class AIModuleViewSet(viewsets.ModelViewSet):
         module.save()
         
         # Логируем одобрение
+        old_values, new_values = module.get_audit_values()
         AuditLog.objects.create(
             content_object=module,
             action=AuditLog.Action.APPROVE,
             performed_by=request.user,
             ip_address=getattr(request, 'ip_address', None),
-            comment=request.data.get('comment', '')
+            comment=request.data.get('comment', ''),
+            old_values=old_values,
+            new_values=new_values
         )
         
         # Уведомляем автора
@@ -333,6 +640,7 @@ class AIModuleViewSet(viewsets.ModelViewSet):
         })
     
     @action(detail=True, methods=['post'], permission_classes=[IsOwnerOrAdminOrReadOnly])
+    @transaction.atomic
     def reject(self, request, pk=None):
         """Отклонить модуль (только администраторы)"""
         if not request.user.is_admin():
@@ -354,12 +662,15 @@ class AIModuleViewSet(viewsets.ModelViewSet):
         module.save()
         
         # Логируем отклонение
+        old_values, new_values = module.get_audit_values()
         AuditLog.objects.create(
             content_object=module,
             action=AuditLog.Action.REJECT,
             performed_by=request.user,
             ip_address=getattr(request, 'ip_address', None),
-            comment=comment
+            comment=comment,
+            old_values=old_values,
+            new_values=new_values
         )
         
         # Уведомляем автора
@@ -377,6 +688,36 @@ class AIModuleViewSet(viewsets.ModelViewSet):
             'comment': comment
         })
 
+    @action(detail=False, methods=['post'])
+    def moderate(self, request):
+        """
+        Одобрить / отклонить / заблокировать много модулей (только администраторы).
+
+        Тело: {ids: [...], action: approve | reject | block, comment}.
+        Ответ: итог по каждому ID (apps.ai_modules.moderation).
+        """
+        if not request.user.is_authenticated or not request.user.is_admin():
+            return Response(
+                {'error': 'Only administrators can moderate modules'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        serializer = ModerationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        results = moderate_modules(
+            serializer.validated_data['ids'],
+            serializer.validated_data['action'],
+            moderator=request.user,
+            comment=serializer.validated_data['comment'],
+            ip_address=getattr(request, 'ip_address', None),
+        )
+        outcomes = Counter(result['outcome'] for result in results.values())
+        return Response({
+            'action': serializer.validated_data['action'],
+            'summary': dict(outcomes),
+            'results': [{'id': module_id, **result} for module_id, result in results.items()],
+        })
+
     @action(detail=True, methods=['get'], url_path='estimator')
     def estimator(self, request, pk=None):
         """
@@ -384,8 +725,7 @@ class AIModuleViewSet(viewsets.ModelViewSet):
         URL: /api/estimators/{id}/estimator/
         """
         instance = self.get_object()
-        # Желательно иметь prefetch: publications, aimoduletag__tag__category, details
-        serializer = EstimatorSerializer(instance, context={'request': request})
+        serializer = self.get_serializer(instance)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'], url_path='as-estimators')
@@ -394,15 +734,11 @@ class AIModuleViewSet(viewsets.ModelViewSet):
         Список модулей в формате EstimatorItem.
         URL: /api/estimators/as-estimators/
         """
-        qs = self.filter_queryset(self.get_queryset().select_related('details').prefetch_related('publications'))
-        page = self.paginate_queryset(qs)
-        if page is not None:
-            data = EstimatorSerializer(page, many=True, context={'request': request}).data
-            return self.get_paginated_response(data)
-        data = EstimatorSerializer(qs, many=True, context={'request': request}).data
-        return Response(data)
-
-class TagViewSet(viewsets.ReadOnlyModelViewSet):
+        if self.is_compact_request():
+            return self.compact_list(request)
+        return self.estimator_list(request)
+
+class TagViewSet(SparseFieldsMixin, ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet для тегов (только чтение).
     Создание и редактирование тегов доступно только через админку.
@@ -416,15 +752,34 @@ class TagViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ['name','name_ru', 'created_at', 'usage_count']
     ordering = ['category__order', 'name', 'name_ru']
     pagination_class = CustomPageNumberPagination
+    etag_dependencies = ('tags',)
+    sparse_field_plans = {
+        'id': {},
+        'name': {'only': ['name']},
+        'name_ru': {'only': ['name_ru']},
+        'slug': {'only': ['slug']},
+        'description': {'only': ['description']},
+        'color': {'only': ['color']},
+        'color_display': {'only': ['color']},
+        'category_name': {'select_related': ['category'], 'only': ['category', 'category__name']},
+        'usage_count': {'annotate': {'usage_count': Count('aimoduletag', distinct=True)}},
+        'is_active': {'only': ['is_active']},
+    }
     
     def get_queryset(self):
         """Добавляем аннотацию количества использований"""
+        selected = self.get_selected_fields()
+        if selected is not None:
+            queryset = self.apply_field_plans(Tag.objects.filter(is_active=True), selected)
+            if 'usage_count' not in selected and 'usage_count' in self.request.query_params.get('ordering', ''):
+                queryset = queryset.annotate(usage_count=Count('aimoduletag', distinct=True))
+            return queryset
         return super().get_queryset().annotate(
             usage_count=Count('aimoduletag', distinct=True)
         )
     
     @action(detail=False, methods=['get'])
-    @method_decorator(cache_page(60 * 30))  # Кеш на 30 минут
+    @cache_response()  # Инвалидируется по изменению тегов
     def popular(self, request):
         """Популярные теги"""
         popular_tags = self.get_queryset().order_by('-usage_count')[:20]
@@ -460,7 +815,7 @@ class TagCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     ordering = ['order', 'name', 'name_ru']
     pagination_class = None  # Отключаем пагинацию для категорий
 
-class PublicationViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicationViewSet(SparseFieldsMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet для публикаций (только чтение).
     Публикации создаются через интерфейс модулей.
@@ -474,8 +829,25 @@ class PublicationViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ['publication_date', 'created_at']
     ordering = ['-publication_date']
     pagination_class = CustomPageNumberPagination
+    sparse_field_plans = {
+        'id': {},
+        'title': {'only': ['title']},
+        'authors': {'only': ['authors']},
+        'journal_conference': {'only': ['journal_conference']},
+        'publication_date': {'only': ['publication_date']},
+        'doi': {'only': ['doi']},
+        'url': {'only': ['url']},
+        'ai_module_name': {'select_related': ['ai_module'], 'only': ['ai_module', 'ai_module__name']},
+        'created_at': {'only': ['created_at']},
+    }
+
+    def get_queryset(self):
+        selected = self.get_selected_fields()
+        if selected is not None:
+            return self.apply_field_plans(Publication.objects.all(), selected)
+        return super().get_queryset()
 
-class UserViewSet(viewsets.ReadOnlyModelViewSet):
+class UserViewSet(SparseFieldsMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet для пользователей (только чтение публичных данных).
     Регистрация и управление профилем через отдельные эндпоинты.
@@ -485,12 +857,32 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = UserProfileSerializer
     filter_backends = [SearchFilter, OrderingFilter]
     search_fields = ['username', 'first_name', 'last_name', 'organization']
-    ordering_fields = ['username', 'created_at']
+    ordering_fields = ['username', 'created_at', 'active_modules_count', 'likes_received_count', 'publications_count']
     ordering = ['username']
     pagination_class = CustomPageNumberPagination
+    sparse_field_plans = {
+        'id': {},
+        'username': {'only': ['username']},
+        'first_name': {'only': ['first_name']},
+        'last_name': {'only': ['last_name']},
+        'email': {'only': ['email']},
+        'organization': {'only': ['organization']},
+        'country': {'only': ['country']},
+        'role': {'only': ['role']},
+        'created_at': {'only': ['created_at']},
+        'avatar_url': {'select_related': ['profile']},
+        'expertise_list': {'select_related': ['profile']},
+        'modules_count': {'only': ['active_modules_count']},
+        'total_likes': {'only': ['likes_received_count']},
+        'publications_count': {'only': ['publications_count']},
+    }
     
     def get_queryset(self):
         """Скрываем заблокированных пользователей"""
+        selected = self.get_selected_fields()
+        if selected is not None:
+            queryset = User.objects.filter(is_active=True)
+            return self.apply_field_plans(queryset, selected).filter(is_blocked=False)
         return super().get_queryset().filter(is_blocked=False)
     
     @action(detail=True, methods=['get'])
@@ -513,24 +905,21 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
         user = self.get_object()
         
         stats = {
-            'total_modules': user.ai_modules.filter(status=AIModule.Status.ACTIVE).count(),
-            'total_likes_received': AIModuleLike.objects.filter(
-                ai_module__created_by=user
-            ).count(),
-            'total_publications': Publication.objects.filter(
-                ai_module__created_by=user
-            ).count(),
+            'total_modules': user.active_modules_count,
+            'total_likes_received': user.likes_received_count,
+            'total_publications': user.publications_count,
             'member_since': user.created_at.isoformat()
         }
         
         return Response(stats)
 
-class CountryViewSet(viewsets.ReadOnlyModelViewSet):
+class CountryViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet для стран"""
     
     queryset = Country.objects.all().order_by('name')
     serializer_class = CountrySerializer
     pagination_class = None
+    etag_dependencies = ('countries',)
     
     @action(detail=False, methods=['get'])
     def brics(self, request):
@@ -566,40 +955,35 @@ class AIModuleFileViewSet(viewsets.ModelViewSet):
 
 class AvailabilityAIModulesViewSet(viewsets.ViewSet):
     """
-    ViewSet для получения уникальных значений поля 'availability' из модели AIModuleDetail.
+    ViewSet для справочника доступности (Availability), используемого в AIModuleDetail.
     """
     permission_classes = []
 
 
     def list(self, request):
-        unique_availability_ids = AIModuleDetail.objects.values_list('ability', flat=True).distinct().exclude(ability__isnull=True)
-        
-        answer = [{
-            "id": i+1,
-            "name": translit(name, 'ru', reversed=True),
-            "name_ru": name,
-            "created_at": "2025-10-25T12:00:00Z",
-            "updated_at": "2025-10-25T12:00:00Z"
-        }  for i, name in enumerate(unique_availability_ids)]
+        answer = cache.get(Availability.cache_key)
+
+        if answer is None:
+            queryset = Availability.objects.filter(details__isnull=False).distinct()
+            answer = EstimatorAvailabilitySerializer(queryset, many=True).data
+            cache.set(Availability.cache_key, answer, 3600)  # 1 час, сбрасывается сигналами
 
         return Response(answer)
 
 class UsageStatusesAIModulesViewSet(viewsets.ViewSet):
     """
-    ViewSet для получения уникальных значений поля 'status' из модели AIModuleDetail.
+    ViewSet для справочника статусов использования (UsageStatus), используемого в AIModuleDetail.
     """
     permission_classes = []
 
 
     def list(self, request):
-        unique_availability_ids = AIModuleDetail.objects.values_list('status', flat=True).distinct().exclude(status__isnull=True)
-        answer = [{
-            "id": i+1,
-            "name": translit(name, 'ru', reversed=True),
-            "name_ru": name,
-            "created_at": "2025-10-25T12:00:00Z",
-            "updated_at": "2025-10-25T12:00:00Z"
-        }  for i, name in enumerate(unique_availability_ids)]
+        answer = cache.get(UsageStatus.cache_key)
+
+        if answer is None:
+            queryset = UsageStatus.objects.filter(details__isnull=False).distinct()
+            answer = EstimatorGenericStatusSerializer(queryset, many=True).data
+            cache.set(UsageStatus.cache_key, answer, 3600)  # 1 час, сбрасывается сигналами
 
         return Response(answer)
 
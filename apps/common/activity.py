@@ -0,0 +1,165 @@
+"""
+Оценка активных пользователей (DAU / WAU / MAU) на HyperLogLog Redis.
+
+Каждая запись AuditLog добавляет автора (PFADD) в ключи дня, ISO-недели
+и месяца. Уникальные пользователи за произвольный период считаются
+PFCOUNT по ключам дней (объединение без хранения), погрешность ~0.8%
+при 12 КБ на ключ вместо просмотра журнала аудита.
+
+Если Redis недоступен, значения считаются запросом к AuditLog.
+Заполнение по существующему журналу: python manage.py backfill_activity
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from .redis_utils import RedisError, get_connection
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'activity'
+
+# Сколько хранить ключи (дни); по умолчанию чуть больше года
+ACTIVITY_RETENTION_DAYS = getattr(settings, 'ACTIVITY_RETENTION_DAYS', 400)
+
+
+def day_key(date):
+    return f'{KEY_PREFIX}:day:{date.isoformat()}'
+
+
+def week_key(date):
+    year, week, _ = date.isocalendar()
+    return f'{KEY_PREFIX}:week:{year}-W{week:02d}'
+
+
+def month_key(date):
+    return f'{KEY_PREFIX}:month:{date:%Y-%m}'
+
+
+def period_keys(date):
+    return day_key(date), week_key(date), month_key(date)
+
+
+def date_range(start_date, end_date):
+    return [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+
+
+def add_activity(pipeline, user_id, date):
+    """Добавить пользователя в HLL дня, недели и месяца (в pipeline)"""
+    ttl = timedelta(days=ACTIVITY_RETENTION_DAYS)
+    for key in period_keys(date):
+        pipeline.pfadd(key, user_id)
+        pipeline.expire(key, ttl)
+
+
+def track_activity(user_id, when=None):
+    """Отметить активность пользователя после фиксации транзакции"""
+    if user_id is None:
+        return
+    date = timezone.localdate(when) if when else timezone.localdate()
+
+    def run():
+        client = get_connection()
+        if client is None:
+            return
+        try:
+            pipeline = client.pipeline(transaction=False)
+            add_activity(pipeline, user_id, date)
+            pipeline.execute()
+        except RedisError:
+            logger.warning('Activity tracking failed', exc_info=True)
+    transaction.on_commit(run)
+
+
+def _audit_queryset(start_date, end_date):
+    from .models import AuditLog
+
+    return AuditLog.objects.filter(
+        timestamp__date__gte=start_date,
+        timestamp__date__lte=end_date,
+        performed_by__isnull=False
+    )
+
+
+def daily_active_users(start_date, end_date):
+    """
+    Returns:
+        dict: дата -> количество уникальных пользователей за день
+    """
+    dates = date_range(start_date, end_date)
+    client = get_connection()
+    if client is not None:
+        try:
+            pipeline = client.pipeline(transaction=False)
+            for date in dates:
+                pipeline.pfcount(day_key(date))
+            return dict(zip(dates, pipeline.execute()))
+        except RedisError:
+            logger.warning('Activity counters are unavailable', exc_info=True)
+
+    rows = _audit_queryset(start_date, end_date).annotate(
+        date=TruncDate('timestamp')
+    ).values('date').annotate(users=Count('performed_by', distinct=True)).order_by()
+    counts = {row['date']: row['users'] for row in rows}
+    return {date: counts.get(date, 0) for date in dates}
+
+
+def active_users(start_date, end_date):
+    """Количество уникальных пользователей за период (включительно)"""
+    client = get_connection()
+    if client is not None:
+        try:
+            return client.pfcount(*[day_key(date) for date in date_range(start_date, end_date)])
+        except RedisError:
+            logger.warning('Activity counters are unavailable', exc_info=True)
+
+    return _audit_queryset(start_date, end_date).values('performed_by').distinct().count()
+
+
+def calendar_active_users(period, date):
+    """Уникальные пользователи за календарную неделю ('week') или месяц ('month') с датой"""
+    if period == 'week':
+        key, start_date = week_key(date), date - timedelta(days=date.weekday())
+        end_date = start_date + timedelta(days=6)
+    else:
+        key, start_date = month_key(date), date.replace(day=1)
+        end_date = (start_date + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+
+    client = get_connection()
+    if client is not None:
+        try:
+            return client.pfcount(key)
+        except RedisError:
+            logger.warning('Activity counters are unavailable', exc_info=True)
+    return _audit_queryset(start_date, end_date).values('performed_by').distinct().count()
+
+
+def activity_summary(date=None):
+    """
+    DAU / WAU / MAU: скользящие окна 1, 7 и 30 дней, заканчивающиеся датой,
+    и уникальные пользователи текущей календарной недели и месяца.
+    """
+    date = date or timezone.localdate()
+    return {
+        'dau': active_users(date, date),
+        'wau': active_users(date - timedelta(days=6), date),
+        'mau': active_users(date - timedelta(days=29), date),
+        'calendar_week': calendar_active_users('week', date),
+        'calendar_month': calendar_active_users('month', date),
+    }
+
+
+def audit_log_saved(sender, instance, created, **kwargs):
+    if created:
+        track_activity(instance.performed_by_id, instance.timestamp)
+
+
+def connect_activity_signals():
+    """Подключение AuditLog к счетчикам активности (вызывается из AppConfig.ready)"""
+    post_save.connect(audit_log_saved, sender='common.AuditLog', weak=False, dispatch_uid='activity:audit_log')
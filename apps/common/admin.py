@@ -1,6 +1,9 @@
+import json
+
 from django.contrib import admin
+from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
-from .models import Country, AuditLog
+from .models import Country, AuditLog, SlowQuery
 
 @admin.register(Country)
 class CountryAdmin(admin.ModelAdmin):
@@ -27,4 +30,29 @@ class AuditLogAdmin(admin.ModelAdmin):
             return str(obj.content_object)
         except Exception:
             return f"{obj.content_type} #{obj.object_id}"
-    get_object_repr.short_description = _('Object')
\ No newline at end of file
+    get_object_repr.short_description = _('Object')
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'duration_ms', 'view', 'get_short_sql', 'location')
+    list_filter = ('view', 'database', 'created_at')
+    search_fields = ('fingerprint', 'view', 'path', 'location')
+    ordering = ('-created_at',)
+    fields = ('created_at', 'duration_ms', 'database', 'view', 'path', 'location', 'sql', 'params', 'get_plan', 'stack')
+    readonly_fields = fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_short_sql(self, obj):
+        return obj.fingerprint[:120]
+    get_short_sql.short_description = _('Query')
+
+    def get_plan(self, obj):
+        if obj.plan is None:
+            return '-'
+        return format_html('<pre>{}</pre>', json.dumps(obj.plan, indent=2, ensure_ascii=False))
+    get_plan.short_description = _('Plan')
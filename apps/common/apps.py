@@ -4,3 +4,19 @@ from django.apps import AppConfig
 class CommonConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.common'
+
+    def ready(self):
+        from .versions import connect_version_signals
+        from .leaderboards import connect_leaderboard_signals
+        from .activity import connect_activity_signals
+        connect_version_signals()
+        connect_leaderboard_signals()
+        connect_activity_signals()
+
+        from .instrumentation import install_serializer_timing, is_enabled
+        if is_enabled():
+            install_serializer_timing()
+
+        from .slow_queries import connect_slow_query_log, is_enabled as slow_query_log_enabled
+        if slow_query_log_enabled():
+            connect_slow_query_log()
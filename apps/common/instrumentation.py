@@ -0,0 +1,281 @@
+"""
+Инструментирование запросов: SQL, кеш, сериализация, поиск N+1.
+
+RequestInstrumentationMiddleware собирает на время запроса:
+- количество SQL-запросов и суммарное время БД (execute_wrapper);
+- попадания / промахи кеша default;
+- время сериализаторов DRF и скомпилированных сериализаторов;
+- повторы одного и того же запроса (отпечаток SQL без параметров).
+
+Отпечаток, повторившийся N_PLUS_ONE_THRESHOLD раз, логируется как N+1
+вместе с полем сериализатора и строкой кода, которые его вызвали.
+Администраторы (и запросы с X-Metrics-Token: METRICS_TOKEN, например
+replay_traffic) получают заголовки Server-Timing и X-Query-Count,
+итог по каждому запросу пишется в лог apps.common.instrumentation (JSON)
+и в метрики Prometheus (apps.common.metrics).
+
+Настройки: REQUEST_INSTRUMENTATION (вкл/выкл), N_PLUS_ONE_THRESHOLD.
+"""
+import contextvars
+import json
+import logging
+import os
+import re
+import sys
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils.crypto import constant_time_compare
+
+from .metrics import observe_cache, observe_request
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = str(Path(settings.BASE_DIR) / 'apps')
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+# Собственные запросы журнала медленных запросов (apps.common.slow_queries):
+# запись в SlowQuery не входит в метрики запроса и X-Query-Count
+_capturing = contextvars.ContextVar('slow_query_capturing', default=False)
+
+# Модули execute_wrapper'ов: их кадры не считаются местом вызова запроса
+_WRAPPER_FILES = (__file__, str(Path(__file__).with_name('slow_queries.py')))
+
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+_MISSING = object()
+
+
+def fingerprint(sql):
+    """SQL без значений: списки IN (%s, %s, ...) схлопываются"""
+    return _IN_LIST.sub('IN (...)', sql)
+
+
+def _query_origin(depth=2):
+    """
+    Поле сериализатора и строка кода проекта, из которых выполняется запрос.
+    """
+    field = location = None
+    frame = sys._getframe(depth)
+    while frame is not None and (field is None or location is None):
+        code = frame.f_code
+        filename = code.co_filename
+        if field is None:
+            if filename.startswith('<compiled serializer'):
+                field = filename.strip('<>')
+            elif code.co_name == 'to_representation':
+                serializer = frame.f_locals.get('self')
+                serializer_field = frame.f_locals.get('field')
+                field_name = getattr(serializer_field, 'field_name', None)
+                if serializer is not None and field_name:
+                    field = f'{type(serializer).__name__}.{field_name}'
+        if location is None and filename.startswith(PROJECT_ROOT) and filename not in _WRAPPER_FILES:
+            location = f'{os.path.relpath(filename, settings.BASE_DIR)}:{frame.f_lineno} in {code.co_name}'
+        frame = frame.f_back
+    return field, location
+
+
+class RequestMetrics:
+    """Метрики одного запроса"""
+
+    def __init__(self, threshold, request=None):
+        self.threshold = threshold
+        self.request = request
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.timings = Counter()
+        self.fingerprints = Counter()
+        self.repeated = {}
+        self._depth = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        # execute_wrapper
+        if _capturing.get():
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+            key = fingerprint(sql)
+            self.fingerprints[key] += 1
+            if self.fingerprints[key] == self.threshold:
+                field, location = _query_origin()
+                self.repeated[key] = {'field': field, 'location': location}
+
+    @contextmanager
+    def track_time(self, name):
+        # Вложенные вызовы (сериализатор внутри сериализатора) не суммируются
+        self._depth[name] += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth[name] -= 1
+            if not self._depth[name]:
+                self.timings[name] += time.perf_counter() - start
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+    def n_plus_one(self):
+        return [
+            {'sql': sql, 'count': self.fingerprints[sql], **origin}
+            for sql, origin in self.repeated.items()
+        ]
+
+    def server_timing(self):
+        parts = [
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f'cache;desc="hits {self.cache_hits}, misses {self.cache_misses}"',
+        ]
+        for name, value in sorted(self.timings.items()):
+            parts.append(f'{name};dur={value * 1000:.1f}')
+        parts.append(f'total;dur={self.total_time * 1000:.1f}')
+        return ', '.join(parts)
+
+    def summary(self, request, response):
+        match = getattr(request, 'resolver_match', None)
+        return {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': round(self.total_time * 1000, 1),
+            'queries': self.queries,
+            'db_ms': round(self.db_time * 1000, 1),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            **{f'{name}_ms': round(value * 1000, 1) for name, value in self.timings.items()},
+            'n_plus_one': len(self.repeated),
+        }
+
+
+@contextmanager
+def track_time(name):
+    """Учесть время блока в метриках текущего запроса (если они собираются)"""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    with metrics.track_time(name):
+        yield
+
+
+def _instrument_cache(cache):
+    """Обертки get / get_many кеша для подсчета попаданий (один раз на экземпляр)"""
+    if getattr(cache, '_instrumented', False):
+        return
+    get, get_many = cache.get, cache.get_many
+
+    def instrumented_get(key, default=None, version=None):
+        value = get(key, _MISSING, version=version)
+        hit = value is not _MISSING
+        metrics = _current.get()
+        if metrics is not None:
+            if hit:
+                metrics.cache_hits += 1
+            else:
+                metrics.cache_misses += 1
+        observe_cache(key, int(hit), int(not hit))
+        return value if hit else default
+
+    def instrumented_get_many(keys, version=None):
+        keys = list(keys)
+        found = get_many(keys, version=version)
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.cache_hits += len(found)
+            metrics.cache_misses += len(keys) - len(found)
+        for key in keys:
+            hit = key in found
+            observe_cache(key, int(hit), int(not hit))
+        return found
+
+    cache.get = instrumented_get
+    cache.get_many = instrumented_get_many
+    cache._instrumented = True
+
+
+def install_serializer_timing():
+    """Учет времени Serializer.data / ListSerializer.data (вызывается из AppConfig.ready)"""
+    from rest_framework import serializers
+
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        prop = cls.__dict__['data']
+        if getattr(prop.fget, '_instrumented', False):
+            continue
+
+        def fget(self, _fget=prop.fget):
+            with track_time('serialize'):
+                return _fget(self)
+        fget._instrumented = True
+        cls.data = property(fget, doc=prop.__doc__)
+
+
+def is_enabled():
+    return getattr(settings, 'REQUEST_INSTRUMENTATION', False)
+
+
+def _metrics_allowed(request):
+    """Заголовки метрик: администратору или по X-Metrics-Token"""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated and user.is_admin():
+        return True
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    return bool(token) and constant_time_compare(request.META.get('HTTP_X_METRICS_TOKEN', ''), token)
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Метрики SQL / кеша / сериализации на запрос, заголовки для администраторов
+    и JSON-итог в лог.
+    """
+
+    def __init__(self, get_response):
+        if not is_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.threshold = getattr(settings, 'N_PLUS_ONE_THRESHOLD', 5)
+
+    def __call__(self, request):
+        metrics = RequestMetrics(self.threshold, request)
+        token = _current.set(metrics)
+        _instrument_cache(caches['default'])
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        if _metrics_allowed(request):
+            response['Server-Timing'] = metrics.server_timing()
+            response['X-Query-Count'] = str(metrics.queries)
+
+        summary = metrics.summary(request, response)
+        observe_request(
+            request.method, summary['view'] or 'unmatched', response.status_code,
+            metrics.total_time, metrics.queries, metrics.db_time
+        )
+        logger.info(json.dumps(summary, ensure_ascii=False))
+        for item in metrics.n_plus_one():
+            logger.warning(json.dumps({
+                'event': 'n_plus_one',
+                'path': request.path,
+                'view': summary['view'],
+                **item,
+            }, ensure_ascii=False))
+        return response
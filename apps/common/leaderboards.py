@@ -0,0 +1,350 @@
+"""
+Рейтинги на сортированных множествах Redis (ZSET).
+
+Каждый рейтинг хранится в ключе leaderboard:<имя> и обновляется
+инкрементально сигналами моделей после фиксации транзакции. Чтение
+top-N, диапазона и места участника — O(log n) без обращения к БД.
+
+Если Redis недоступен (например, кеш LocMem в разработке), чтение
+выполняется агрегирующим запросом к БД, а запись пропускается.
+Ключ leaderboard:<имя>:built отмечает собранный рейтинг: без него
+(после очистки Redis) рейтинг пересобирается при первом чтении.
+Полная пересборка: python manage.py rebuild_leaderboards
+"""
+import logging
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.signals import post_save, post_delete
+
+from .redis_utils import RedisError, get_connection
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'leaderboard'
+ACTIVE_STATUS = 'active'
+
+
+class Leaderboard:
+    """
+    Рейтинг: участник (id объекта model) -> счет.
+
+    Args:
+        name: имя рейтинга в URL и ключе Redis
+        model: 'app_label.Model' участников
+        scores: функция без аргументов -> queryset с аннотациями member и score
+        label_fields: поля участника, добавляемые к результатам
+    """
+
+    def __init__(self, name, model, scores, label_fields):
+        self.name = name
+        self.model_label = model
+        self.scores = scores
+        self.label_fields = label_fields
+        self.key = f'{KEY_PREFIX}:{name}'
+        self.built_key = f'{self.key}:built'
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    # Запись
+
+    def _write(self, operation):
+        """Выполнить operation(pipeline) после фиксации транзакции"""
+        def run():
+            client = get_connection()
+            if client is None:
+                return
+            try:
+                pipeline = client.pipeline(transaction=False)
+                operation(pipeline)
+                pipeline.execute()
+            except RedisError:
+                logger.warning('Leaderboard %s update failed', self.name, exc_info=True)
+        transaction.on_commit(run)
+
+    def incr(self, member, amount):
+        """Изменить счет участника (участник добавляется при отсутствии)"""
+        if member is None or not amount:
+            return
+        self._write(lambda pipe: pipe.zincrby(self.key, amount, member))
+
+    def incr_existing(self, member, amount):
+        """Изменить счет, только если участник уже в рейтинге (ZADD XX INCR)"""
+        if member is None or not amount:
+            return
+        self._write(lambda pipe: pipe.zadd(self.key, {member: amount}, xx=True, incr=True))
+
+    def set(self, member, score):
+        if member is not None:
+            self._write(lambda pipe: pipe.zadd(self.key, {member: score}))
+
+    def remove(self, member):
+        if member is not None:
+            self._write(lambda pipe: pipe.zrem(self.key, member))
+
+    def set_many(self, scores):
+        """Задать счета нескольких участников одной командой ({участник: счет})"""
+        if scores:
+            self._write(lambda pipe: pipe.zadd(self.key, scores))
+
+    def remove_many(self, members):
+        if members:
+            self._write(lambda pipe: pipe.zrem(self.key, *members))
+
+    def rebuild(self):
+        """
+        Пересобрать рейтинг из БД.
+
+        Returns:
+            int: количество участников
+        """
+        items = [(str(member), score) for member, score in self.scores().values_list('member', 'score')]
+        client = get_connection()
+        if client is None:
+            return len(items)
+        # Собираем во временном ключе и атомарно подменяем
+        tmp_key = f'{self.key}:rebuild'
+        pipeline = client.pipeline()
+        pipeline.delete(tmp_key)
+        for offset in range(0, len(items), 1000):
+            pipeline.zadd(tmp_key, dict(items[offset:offset + 1000]))
+        if items:
+            pipeline.rename(tmp_key, self.key)
+        else:
+            pipeline.delete(self.key)
+        pipeline.set(self.built_key, 1)
+        pipeline.execute()
+        return len(items)
+
+    # Чтение
+
+    def _client(self):
+        client = get_connection()
+        if client is None:
+            return None
+        try:
+            if not client.exists(self.built_key):
+                self.rebuild()
+        except RedisError:
+            logger.warning('Leaderboard %s is unavailable', self.name, exc_info=True)
+            return None
+        return client
+
+    def size(self):
+        client = self._client()
+        if client is None:
+            return self.scores().count()
+        return client.zcard(self.key)
+
+    def range(self, offset=0, limit=10):
+        """
+        Участники по убыванию счета.
+
+        Returns:
+            list: [(место, id участника, счет)]; равные счета делят место
+        """
+        client = self._client()
+        if client is None:
+            rows = self.scores().order_by('-score', 'member').values_list('member', 'score')
+            rows = list(rows[offset:offset + limit])
+        else:
+            rows = [
+                (int(member), int(score))
+                for member, score in client.zrevrange(self.key, offset, offset + limit - 1, withscores=True)
+            ]
+        if not rows:
+            return []
+
+        results = []
+        rank = self._rank_for_score(client, rows[0][1])
+        previous = rows[0][1]
+        for index, (member, score) in enumerate(rows):
+            if score != previous:
+                rank = offset + index + 1
+                previous = score
+            results.append((rank, member, score))
+        return results
+
+    def top(self, limit=10):
+        return self.range(0, limit)
+
+    def score_of(self, member):
+        client = self._client()
+        if client is None:
+            row = self.scores().filter(member=member).values_list('score', flat=True).first()
+            return row
+        score = client.zscore(self.key, member)
+        return None if score is None else int(score)
+
+    def rank_of(self, member):
+        """
+        Returns:
+            tuple: (место, счет) или (None, None), если участника нет в рейтинге
+        """
+        score = self.score_of(member)
+        if score is None:
+            return None, None
+        return self._rank_for_score(self._client(), score), score
+
+    def _rank_for_score(self, client, score):
+        if client is None:
+            return self.scores().filter(score__gt=score).count() + 1
+        return client.zcount(self.key, f'({score}', '+inf') + 1
+
+    def with_labels(self, rows):
+        """Результаты range() с полями участников (один IN-запрос)"""
+        objects = self.model.objects.only(*self.label_fields).in_bulk([member for _, member, _ in rows])
+        results = []
+        for rank, member, score in rows:
+            item = {'rank': rank, 'id': member, 'score': score}
+            obj = objects.get(member)
+            for field in self.label_fields:
+                item[field] = getattr(obj, field, None)
+            results.append(item)
+        return results
+
+
+def _contributor_scores():
+    User = apps.get_model('accounts', 'User')
+    return User.objects.filter(
+        is_active=True, active_modules_count__gt=0
+    ).annotate(member=F('pk'), score=F('active_modules_count'))
+
+
+def _module_like_scores():
+    AIModule = apps.get_model('ai_modules', 'AIModule')
+    return AIModule.objects.filter(status=ACTIVE_STATUS).annotate(
+        member=F('pk'), score=Count('likes')
+    )
+
+
+def _country_scores():
+    Country = apps.get_model('common', 'Country')
+    return Country.objects.annotate(
+        member=F('pk'),
+        score=Count('country', filter=Q(country__status=ACTIVE_STATUS))
+    ).filter(score__gt=0)
+
+
+def _tag_usage_scores():
+    Tag = apps.get_model('tags', 'Tag')
+    return Tag.objects.filter(is_active=True).annotate(
+        member=F('pk'), score=Count('aimoduletag')
+    )
+
+
+contributors = Leaderboard(
+    'contributors', 'accounts.User', _contributor_scores, ('username', 'organization')
+)
+# Все активные модули, включая модули без лайков: лайки меняют счет через ZADD XX
+most_liked_modules = Leaderboard(
+    'modules', 'ai_modules.AIModule', _module_like_scores, ('name', 'company')
+)
+countries = Leaderboard(
+    'countries', 'common.Country', _country_scores, ('name', 'name_ru', 'code')
+)
+# Все активные теги: использование меняет счет через ZADD XX
+tag_usage = Leaderboard(
+    'tags', 'tags.Tag', _tag_usage_scores, ('name', 'name_ru', 'slug')
+)
+
+LEADERBOARDS = {board.name: board for board in (contributors, most_liked_modules, countries, tag_usage)}
+
+
+# Инкрементальное обновление
+
+def user_saved(sender, instance, created, **kwargs):
+    # Счетчик перечитывается из БД: в объекте он может быть устаревшим (apps.accounts.stats)
+    changes = getattr(instance, 'saved_changes', {})
+    if created or 'is_active' not in changes:
+        return
+    if instance.is_active:
+        score = sender.objects.filter(pk=instance.pk).values_list('active_modules_count', flat=True).first()
+        if score:
+            contributors.set(instance.pk, score)
+    else:
+        contributors.remove(instance.pk)
+
+
+def user_deleted(sender, instance, **kwargs):
+    contributors.remove(instance.pk)
+
+
+def module_saved(sender, instance, created, **kwargs):
+    changes = {} if created else getattr(instance, 'saved_changes', {})
+    is_active = instance.status == ACTIVE_STATUS
+    was_active = (changes['status'][0] if 'status' in changes else instance.status) == ACTIVE_STATUS
+    if created:
+        was_active = False
+    old_country = changes['country'][0] if 'country' in changes else instance.country_id
+
+    if was_active:
+        countries.incr(old_country, -1)
+    if is_active:
+        countries.incr(instance.country_id, 1)
+
+    if is_active and not was_active:
+        most_liked_modules.set(instance.pk, 0 if created else instance.likes.count())
+    elif was_active and not is_active:
+        most_liked_modules.remove(instance.pk)
+
+
+def module_deleted(sender, instance, **kwargs):
+    if instance.status == ACTIVE_STATUS:
+        countries.incr(instance.country_id, -1)
+        most_liked_modules.remove(instance.pk)
+
+
+def like_saved(sender, instance, created, **kwargs):
+    if created:
+        most_liked_modules.incr_existing(instance.ai_module_id, 1)
+
+
+def like_deleted(sender, instance, **kwargs):
+    most_liked_modules.incr_existing(instance.ai_module_id, -1)
+
+
+def tag_saved(sender, instance, created, **kwargs):
+    changes = getattr(instance, 'saved_changes', {})
+    if created:
+        if instance.is_active:
+            tag_usage.set(instance.pk, 0)
+    elif 'is_active' in changes:
+        if instance.is_active:
+            tag_usage.set(instance.pk, instance.aimoduletag_set.count())
+        else:
+            tag_usage.remove(instance.pk)
+
+
+def tag_deleted(sender, instance, **kwargs):
+    tag_usage.remove(instance.pk)
+
+
+def module_tag_saved(sender, instance, created, **kwargs):
+    if created:
+        tag_usage.incr_existing(instance.tag_id, 1)
+
+
+def module_tag_deleted(sender, instance, **kwargs):
+    tag_usage.incr_existing(instance.tag_id, -1)
+
+
+def connect_leaderboard_signals():
+    """Подключение сигналов моделей к рейтингам (вызывается из AppConfig.ready)"""
+    receivers = [
+        (post_save, 'accounts.User', user_saved),
+        (post_delete, 'accounts.User', user_deleted),
+        (post_save, 'ai_modules.AIModule', module_saved),
+        (post_delete, 'ai_modules.AIModule', module_deleted),
+        (post_save, 'ai_modules.AIModuleLike', like_saved),
+        (post_delete, 'ai_modules.AIModuleLike', like_deleted),
+        (post_save, 'tags.Tag', tag_saved),
+        (post_delete, 'tags.Tag', tag_deleted),
+        (post_save, 'tags.AIModuleTag', module_tag_saved),
+        (post_delete, 'tags.AIModuleTag', module_tag_deleted),
+    ]
+    for signal, model, receiver in receivers:
+        signal.connect(receiver, sender=model, weak=False, dispatch_uid=f'leaderboard:{model}:{receiver.__name__}')
@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.common.activity import ACTIVITY_RETENTION_DAYS, day_key, month_key, week_key
+from apps.common.models import AuditLog
+from apps.common.redis_utils import get_connection
+
+
+class Command(BaseCommand):
+    help = 'Fill activity HyperLogLogs (DAU/WAU/MAU) from existing AuditLog rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=ACTIVITY_RETENTION_DAYS,
+            help=f'How many days back to backfill (default: {ACTIVITY_RETENTION_DAYS})'
+        )
+
+    def handle(self, *args, **options):
+        client = get_connection()
+        if client is None:
+            raise CommandError('Cache is not Redis: activity is computed from AuditLog directly')
+
+        since = timezone.localdate() - timedelta(days=options['days'])
+        ttl = timedelta(days=ACTIVITY_RETENTION_DAYS)
+
+        # Пары (день, пользователь) без повторов — дедупликация на стороне БД
+        rows = AuditLog.objects.filter(
+            performed_by__isnull=False,
+            timestamp__date__gte=since
+        ).annotate(date=TruncDate('timestamp')).values_list('date', 'performed_by').distinct().order_by('date')
+
+        users_by_day = {}
+        for date, user_id in rows.iterator(chunk_size=5000):
+            users_by_day.setdefault(date, []).append(user_id)
+
+        pipeline = client.pipeline(transaction=False)
+        for date, user_ids in users_by_day.items():
+            for offset in range(0, len(user_ids), 1000):
+                pipeline.pfadd(day_key(date), *user_ids[offset:offset + 1000])
+            pipeline.expire(day_key(date), ttl)
+        pipeline.execute()
+
+        # Недели и месяцы — объединение дней (PFADD идемпотентен, PFMERGE тоже)
+        periods = {}
+        for date in users_by_day:
+            periods.setdefault(week_key(date), []).append(day_key(date))
+            periods.setdefault(month_key(date), []).append(day_key(date))
+        pipeline = client.pipeline(transaction=False)
+        for key, day_keys in periods.items():
+            pipeline.pfmerge(key, *day_keys)
+            pipeline.expire(key, ttl)
+        pipeline.execute()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Backfilled {len(users_by_day)} days, {len(periods)} weeks/months since {since.isoformat()}'
+        ))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.common.leaderboards import LEADERBOARDS, get_connection
+
+
+class Command(BaseCommand):
+    help = 'Rebuild Redis leaderboards from the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help=f'Leaderboards to rebuild (default: all of {", ".join(LEADERBOARDS)})')
+
+    def handle(self, *args, **options):
+        names = options['names'] or list(LEADERBOARDS)
+        unknown = set(names) - set(LEADERBOARDS)
+        if unknown:
+            raise CommandError(f'Unknown leaderboards: {", ".join(sorted(unknown))}')
+        if get_connection() is None:
+            self.stdout.write(self.style.WARNING('Cache is not Redis: leaderboards are read from the database'))
+
+        for name in names:
+            count = LEADERBOARDS[name].rebuild()
+            self.stdout.write(self.style.SUCCESS(f'✓ {name}: {count} members'))
@@ -0,0 +1,97 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from apps.common.replay import Replayer, identity_tokens, load_requests, pg_stats, summarize
+import json
+import sys
+
+
+class Command(BaseCommand):
+    help = (
+        'Replay recorded API traffic (nginx/runserver access log or JSONL) against a running server '
+        'and report per-route latency percentiles, error rates and database load'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('logfile', help='Access log or JSONL file ("-" for stdin)')
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='Server to replay against')
+        parser.add_argument('--speed', type=float, default=1.0, help='Replay speed: 1 = recorded pace, 10 = 10x, 0 = no delays')
+        parser.add_argument('--concurrency', type=int, default=8, help='Parallel connections')
+        parser.add_argument('--limit', type=int, help='Replay at most this many requests')
+        parser.add_argument('--users', type=int, default=50, help='Local users to map recorded identities onto')
+        parser.add_argument('--methods', nargs='*', default=['GET', 'HEAD'], help='Methods to replay (default: GET HEAD)')
+        parser.add_argument('--prefix', default='/api/', help='Replay only paths with this prefix')
+        parser.add_argument('--timeout', type=float, default=30, help='Request timeout, seconds')
+        parser.add_argument('--output', help='Write the report to this JSON file')
+        parser.add_argument('--max-error-rate', type=float, help='Fail if the 5xx/connection error rate is higher')
+
+    def handle(self, *args, **options):
+        if options['speed'] < 0 or options['concurrency'] < 1:
+            raise CommandError('--speed must be >= 0 and --concurrency >= 1')
+        methods = tuple(method.upper() for method in options['methods'])
+        if options['logfile'] == '-':
+            requests, skipped = load_requests(sys.stdin, options['prefix'], methods, options['limit'])
+        else:
+            with open(options['logfile'], encoding='utf-8', errors='replace') as f:
+                requests, skipped = load_requests(f, options['prefix'], methods, options['limit'])
+        if not requests:
+            raise CommandError(f'No requests to replay ({skipped} lines skipped)')
+
+        tokens = identity_tokens(requests, options['users'])
+        span = requests[-1]['offset']
+        pace = f'{options["speed"]}x' if options['speed'] else 'max speed'
+        self.stdout.write(
+            f'Replaying {len(requests)} requests ({skipped} lines skipped, {len(tokens)} identities) '
+            f'recorded over {span:.0f}s at {pace}, concurrency {options["concurrency"]}'
+        )
+
+        replayer = Replayer(
+            options['base_url'],
+            tokens=tokens,
+            speed=options['speed'],
+            concurrency=options['concurrency'],
+            timeout=options['timeout'],
+            metrics_token=getattr(settings, 'METRICS_TOKEN', ''),
+        )
+        stats_before = pg_stats()
+        results, duration = replayer.run(requests)
+        stats_after = pg_stats()
+
+        report = summarize(results, duration)
+        report['base_url'] = options['base_url']
+        report['speed'] = options['speed']
+        report['concurrency'] = options['concurrency']
+        if stats_before is not None and stats_after is not None:
+            report['database'] = {name: stats_after[name] - stats_before[name] for name in stats_before}
+
+        self._print(report)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+            self.stdout.write(f'Report written to {options["output"]}')
+
+        max_error_rate = options['max_error_rate']
+        if max_error_rate is not None and report['error_rate'] > max_error_rate:
+            raise CommandError(f'Error rate {report["error_rate"]:.2%} exceeds {max_error_rate:.2%}')
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ {report["requests"]} requests in {report["duration_s"]}s '
+            f'({report["throughput_rps"]} req/s), error rate {report["error_rate"]:.2%}'
+        ))
+
+    def _print(self, report):
+        self.stdout.write(
+            f'{"route":<40}{"reqs":>7}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"errors":>8}{"4xx":>6}{"queries":>9}{"db ms":>8}'
+        )
+        for route, row in report['routes'].items():
+            line = (
+                f'{route[:39]:<40}{row["requests"]:>7}{row["p50_ms"]:>9.1f}{row["p95_ms"]:>9.1f}'
+                f'{row["p99_ms"]:>9.1f}{row["error_rate"]:>8.1%}{row["client_errors"]:>6}'
+                f'{"-" if row["avg_queries"] is None else row["avg_queries"]:>9}'
+                f'{"-" if row["avg_db_ms"] is None else row["avg_db_ms"]:>8}'
+            )
+            self.stdout.write(self.style.ERROR(line) if row['error_rate'] else line)
+        if 'database' in report:
+            self.stdout.write('Database load: ' + ', '.join(f'{name} {value}' for name, value in report['database'].items()))
+        elif not any(row['avg_queries'] is not None for row in report['routes'].values()):
+            self.stdout.write(self.style.WARNING(
+                'No query metrics: set the same METRICS_TOKEN on the server to receive X-Query-Count'
+            ))
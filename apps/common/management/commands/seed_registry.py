@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+from apps.common.synthetic import delete_dataset, generate_dataset
+from datetime import date
+import time
+
+
+class Command(BaseCommand):
+    help = 'Generate a deterministic synthetic registry (countries, users, tags, modules, likes, audit) at scale'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modules', type=int, default=1000, help='Number of modules (default: 1000)')
+        parser.add_argument('--users', type=int, help='Number of users (default: modules / 5)')
+        parser.add_argument('--likes', type=int, help='Number of likes (default: 5 per module)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (same seed, same data)')
+        parser.add_argument('--years', type=int, default=3, help='Spread creation dates over this many years')
+        parser.add_argument(
+            '--until', type=date.fromisoformat,
+            help='Dates end at the start of this day, YYYY-MM-DD (default: today; fix it for identical data)'
+        )
+        parser.add_argument('--no-audit', action='store_true', help='Do not generate audit history')
+        parser.add_argument('--no-copy', action='store_true', help='Use batched INSERT instead of COPY on PostgreSQL')
+        parser.add_argument('--clear', action='store_true', help='Delete previously generated data first')
+        parser.add_argument('--clear-only', action='store_true', help='Only delete previously generated data')
+        parser.add_argument('--force', action='store_true', help='Allow running with DEBUG=False')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError('Refusing to write synthetic data with DEBUG=False (use --force)')
+
+        if options['clear'] or options['clear_only']:
+            start_time = time.perf_counter()
+            deleted = delete_dataset()
+            self.stdout.write(f'Deleted {deleted} synthetic rows in {time.perf_counter() - start_time:.1f}s')
+            if options['clear_only']:
+                return
+
+        start_time = time.perf_counter()
+        try:
+            counts = generate_dataset(
+                modules=options['modules'],
+                users=options['users'],
+                likes=options['likes'],
+                seed=options['seed'],
+                years=options['years'],
+                until=options['until'],
+                use_copy=not options['no_copy'],
+                audit=not options['no_audit'],
+            )
+        except IntegrityError as e:
+            raise CommandError(f'Generation failed (use --clear to replace data of the same seed): {e}')
+
+        for name, count in counts.items():
+            self.stdout.write(f'  {name}: {count}')
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Generated {sum(counts.values())} rows in {time.perf_counter() - start_time:.1f}s (seed {options["seed"]})'
+        ))
@@ -0,0 +1,174 @@
+"""
+Метрики Prometheus.
+
+Экспортируются на /metrics:
+- http_request_duration_seconds / http_requests_total по маршруту и статусу;
+- db_queries_per_request, db_query_duration_seconds_total по маршруту;
+- cache_requests_total по пространству ключей (префикс до ':') и результату;
+- celery_queue_length (LLEN очередей брокера Redis на момент опроса);
+- export_duration_seconds по формату экспорта.
+
+Запросные метрики пишет RequestInstrumentationMiddleware
+(apps.common.instrumentation). Для нескольких воркеров gunicorn задайте
+PROMETHEUS_MULTIPROC_DIR (пустой каталог, общий для воркеров) до запуска —
+значения будут агрегироваться по всем процессам (config/gunicorn.conf.py).
+
+Без пакета prometheus_client запись метрик ничего не делает, а /metrics
+отвечает 503. Доступ — по Authorization: Bearer METRICS_TOKEN или
+администраторам; без заданного METRICS_TOKEN сборщик метрик получит 401.
+"""
+import os
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+
+try:
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Histogram, multiprocess
+    from prometheus_client.core import GaugeMetricFamily
+except ImportError:  # pragma: no cover
+    prometheus_client = None
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+EXPORT_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+if prometheus_client is not None:
+    REQUEST_LATENCY = Histogram(
+        'http_request_duration_seconds', 'Request latency',
+        ['method', 'route'], buckets=LATENCY_BUCKETS
+    )
+    REQUESTS = Counter(
+        'http_requests', 'Requests by status',
+        ['method', 'route', 'status']
+    )
+    DB_QUERIES = Histogram(
+        'db_queries_per_request', 'SQL queries per request',
+        ['route'], buckets=QUERY_COUNT_BUCKETS
+    )
+    DB_TIME = Counter(
+        'db_query_duration_seconds', 'Time spent in SQL queries',
+        ['route']
+    )
+    CACHE_REQUESTS = Counter(
+        'cache_requests', 'Cache lookups by key namespace',
+        ['namespace', 'result']
+    )
+    EXPORT_DURATION = Histogram(
+        'export_duration_seconds', 'Export generation time',
+        ['format'], buckets=EXPORT_BUCKETS
+    )
+
+
+def is_available():
+    return prometheus_client is not None
+
+
+def observe_request(method, route, status, duration, queries, db_time):
+    if prometheus_client is None:
+        return
+    REQUEST_LATENCY.labels(method, route).observe(duration)
+    REQUESTS.labels(method, route, str(status)).inc()
+    DB_QUERIES.labels(route).observe(queries)
+    DB_TIME.labels(route).inc(db_time)
+
+
+def observe_cache(key, hits, misses):
+    """
+    Попадания в кеш по пространству ключей — части ключа до первого ':'
+    (api_response, data_version, similar_modules, detail_lookups).
+    Ключи без префикса учитываются как 'other'.
+    """
+    if prometheus_client is None:
+        return
+    namespace = str(key).split(':', 1)[0] if ':' in str(key) else 'other'
+    if hits:
+        CACHE_REQUESTS.labels(namespace, 'hit').inc(hits)
+    if misses:
+        CACHE_REQUESTS.labels(namespace, 'miss').inc(misses)
+
+
+def _observe_export(export_format, start):
+    if prometheus_client is not None:
+        EXPORT_DURATION.labels(export_format).observe(time.perf_counter() - start)
+
+
+def _observe_stream(content, export_format, start):
+    try:
+        yield from content
+    finally:
+        _observe_export(export_format, start)
+
+
+def timed_export(export_format):
+    """
+    Декоратор метода экспорта: время построения ответа,
+    для потоковых ответов — до выдачи последнего фрагмента.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            response = func(*args, **kwargs)
+            if getattr(response, 'streaming', False):
+                response.streaming_content = _observe_stream(response.streaming_content, export_format, start)
+            else:
+                _observe_export(export_format, start)
+            return response
+        return wrapper
+    return decorator
+
+
+class CeleryQueueCollector:
+    """Длина очередей Celery в брокере Redis на момент опроса"""
+
+    def collect(self):
+        from .redis_utils import RedisError
+
+        gauge = GaugeMetricFamily('celery_queue_length', 'Messages waiting in Celery queues', labels=['queue'])
+        broker_url = getattr(settings, 'CELERY_BROKER_URL', None)
+        if broker_url and broker_url.startswith(('redis://', 'rediss://')):
+            import redis
+
+            try:
+                client = redis.Redis.from_url(broker_url, socket_timeout=1)
+                for queue in getattr(settings, 'CELERY_METRICS_QUEUES', ['celery']):
+                    gauge.add_metric([queue], client.llen(queue))
+            except RedisError:
+                pass
+        yield gauge
+
+
+def _metrics_view_allowed(request):
+    """Администратору или по Authorization: Bearer METRICS_TOKEN (пустой токен не принимается)"""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated and user.is_admin():
+        return True
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    return bool(token) and constant_time_compare(request.META.get('HTTP_AUTHORIZATION', ''), f'Bearer {token}')
+
+
+def metrics_view(request):
+    """GET /metrics в формате Prometheus (Authorization: Bearer METRICS_TOKEN или администратор)"""
+    if prometheus_client is None:
+        return HttpResponse('prometheus_client is not installed', status=503, content_type='text/plain')
+
+    if not _metrics_view_allowed(request):
+        return HttpResponse(status=401)
+
+    registry = CollectorRegistry()
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    output = prometheus_client.generate_latest(registry)
+    output += prometheus_client.generate_latest(_celery_registry)
+    return HttpResponse(output, content_type=prometheus_client.CONTENT_TYPE_LATEST)
+
+
+if prometheus_client is not None:
+    _celery_registry = CollectorRegistry()
+    _celery_registry.register(CeleryQueueCollector())
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0004_alter_country_code'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.TextField()),
+                ('sql', models.TextField()),
+                ('params', models.JSONField(blank=True, default=list)),
+                ('duration_ms', models.FloatField()),
+                ('database', models.CharField(default='default', max_length=50)),
+                ('view', models.CharField(blank=True, max_length=200)),
+                ('path', models.CharField(blank=True, max_length=500)),
+                ('location', models.CharField(blank=True, max_length=300)),
+                ('stack', models.TextField(blank=True)),
+                ('plan', models.JSONField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Slow query',
+                'verbose_name_plural': 'Slow queries',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['view', 'created_at'], name='common_slow_view_36ca14_idx'), models.Index(fields=['duration_ms'], name='common_slow_duratio_10d7ab_idx')],
+            },
+        ),
+    ]
@@ -62,3 +62,31 @@ class Country(models.Model):
     
     def __str__(self):
         return self.name
+
+
+class SlowQuery(models.Model):
+    """Медленный SQL-запрос с планом выполнения (apps.common.slow_queries)"""
+
+    fingerprint = models.TextField()  # SQL без значений
+    sql = models.TextField()
+    params = models.JSONField(default=list, blank=True)
+    duration_ms = models.FloatField()
+    database = models.CharField(max_length=50, default='default')
+    view = models.CharField(max_length=200, blank=True)  # имя маршрута запроса
+    path = models.CharField(max_length=500, blank=True)
+    location = models.CharField(max_length=300, blank=True)  # строка кода проекта
+    stack = models.TextField(blank=True)
+    plan = models.JSONField(null=True, blank=True)  # EXPLAIN (FORMAT JSON)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _('Slow query')
+        verbose_name_plural = _('Slow queries')
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['view', 'created_at']),
+            models.Index(fields=['duration_ms']),
+        ]
+
+    def __str__(self):
+        return f'{self.duration_ms:.0f} ms: {self.fingerprint[:80]}'
@@ -0,0 +1,19 @@
+"""
+Прямой доступ к Redis кеша default (структуры, которых нет в API кеша Django).
+"""
+try:
+    from django_redis import get_redis_connection
+    from redis.exceptions import RedisError
+except ImportError:  # pragma: no cover
+    get_redis_connection = None
+    RedisError = Exception
+
+
+def get_connection():
+    """Клиент Redis кеша default или None, если кеш не на Redis"""
+    if get_redis_connection is None:
+        return None
+    try:
+        return get_redis_connection('default')
+    except NotImplementedError:
+        return None
@@ -0,0 +1,293 @@
+"""
+Воспроизведение записанного трафика против локального сервера.
+
+Источники (формат определяется по строке):
+- access-лог nginx (combined) и runserver Django:
+  ... [19/Oct/2026:10:00:00 +0000] "GET /api/v1/ai-modules/?page=2 HTTP/1.1" 200 ...
+- JSONL: {"time": "2026-10-19T10:00:00+00:00" | 1760868000.0, "method": "GET",
+  "path": "/api/v1/...", "user": "<любой идентификатор>", "body": {...}}
+
+Авторизация обезличивается: заголовки и токены из записи не используются,
+каждый исходный пользователь (remote_user nginx, поле user JSONL)
+стабильно отображается на локального пользователя из пула, для которого
+выпускается JWT. Чувствительные параметры строки запроса удаляются.
+
+Запросы отправляются с исходными интервалами, ускоренными в speed раз
+(0 — без пауз), в concurrency потоков. Итог — перцентили задержки,
+доля ошибок и SQL на запрос по маршрутам (view_name), плюс нагрузка
+на PostgreSQL (pg_stat_database) за время прогона.
+
+Команда: python manage.py replay_traffic
+"""
+import hashlib
+import http.client
+import json
+import re
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from django.db import connection
+from django.urls import Resolver404, resolve
+
+LOG_PATTERN = re.compile(
+    r'(?:\S+ \S+ (?P<user>\S+) )?\[(?P<time>[^\]]+)\] '
+    r'"(?P<method>[A-Z]+) (?P<path>\S+)(?: HTTP/[\d.]+)?" (?P<status>\d{3})'
+)
+LOG_TIME_FORMATS = ('%d/%b/%Y:%H:%M:%S %z', '%d/%b/%Y %H:%M:%S')
+
+# Параметры строки запроса, которые не воспроизводятся
+SENSITIVE_PARAMS = {'token', 'access', 'access_token', 'refresh', 'api_key', 'key', 'password', 'email', 'signature'}
+
+SERVER_TIMING_DB = re.compile(r'(?:^|,\s*)db;dur=([\d.]+)')
+
+PG_STAT_FIELDS = ('xact_commit', 'xact_rollback', 'tup_returned', 'tup_fetched', 'blks_read', 'blks_hit', 'temp_bytes')
+
+
+def _parse_time(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        pass
+    for time_format in LOG_TIME_FORMATS:
+        try:
+            return datetime.strptime(value, time_format).timestamp()
+        except ValueError:
+            continue
+    raise ValueError(f'Unknown time format: {value}')
+
+
+def anonymize_path(path):
+    """Путь без чувствительных параметров строки запроса"""
+    parts = urlsplit(path)
+    if not parts.query:
+        return parts.path
+    params = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+              if key.lower() not in SENSITIVE_PARAMS]
+    return f'{parts.path}?{urlencode(params)}' if params else parts.path
+
+
+def parse_line(line):
+    """
+    Returns:
+        dict | None: time, method, path, user, body — или None для нераспознанной строки
+    """
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith('{'):
+        record = json.loads(line)
+        return {
+            'time': _parse_time(record['time']),
+            'method': record.get('method', 'GET').upper(),
+            'path': record['path'],
+            'user': record.get('user'),
+            'body': record.get('body'),
+        }
+    match = LOG_PATTERN.search(line)
+    if match is None:
+        return None
+    user = match.group('user')
+    return {
+        'time': _parse_time(match.group('time')),
+        'method': match.group('method'),
+        'path': match.group('path'),
+        'user': None if user in (None, '-') else user,
+        'body': None,
+    }
+
+
+def load_requests(lines, prefix='/api/', methods=('GET', 'HEAD'), limit=None):
+    """
+    Разобрать записи и отсортировать по времени.
+
+    Returns:
+        tuple: (запросы со смещением 'offset' в секундах от первого, число пропущенных строк)
+    """
+    requests, skipped = [], 0
+    for line in lines:
+        try:
+            record = parse_line(line)
+        except (ValueError, KeyError):
+            record = None
+        if record is None or record['method'] not in methods or not record['path'].startswith(prefix):
+            skipped += 1
+            continue
+        record['path'] = anonymize_path(record['path'])
+        requests.append(record)
+        if limit and len(requests) >= limit:
+            break
+    requests.sort(key=lambda record: record['time'])
+    if requests:
+        first = requests[0]['time']
+        for record in requests:
+            record['offset'] = record['time'] - first
+    return requests, skipped
+
+
+def route_name(method, path):
+    """Маршрут как в метриках Prometheus; метод — только для изменяющих запросов"""
+    try:
+        match = resolve(urlsplit(path).path)
+        name = match.view_name or match.route
+    except Resolver404:
+        name = 'unmatched'
+    return name if method in ('GET', 'HEAD') else f'{method} {name}'
+
+
+def identity_tokens(requests, pool_size=50):
+    """
+    Отобразить исходных пользователей на локальных и выпустить им JWT.
+
+    Returns:
+        dict: исходный идентификатор -> access-токен
+    """
+    from django.contrib.auth import get_user_model
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    identities = sorted({record['user'] for record in requests if record['user'] is not None})
+    if not identities:
+        return {}
+    User = get_user_model()
+    pool = list(User.objects.filter(
+        is_active=True, is_blocked=False, is_superuser=False
+    ).order_by('pk')[:pool_size])
+    if not pool:
+        return {}
+    tokens = {}
+    for identity in identities:
+        # Стабильное отображение: один исходный пользователь — один локальный
+        index = int(hashlib.sha256(str(identity).encode()).hexdigest(), 16) % len(pool)
+        tokens[identity] = str(RefreshToken.for_user(pool[index]).access_token)
+    return tokens
+
+
+def pg_stats():
+    """Счетчики pg_stat_database текущей БД (None не на PostgreSQL)"""
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT {", ".join(PG_STAT_FIELDS)} FROM pg_stat_database WHERE datname = current_database()'
+        )
+        return dict(zip(PG_STAT_FIELDS, cursor.fetchone()))
+
+
+def _percentile(values, percent):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[percent - 1]
+
+
+class Replayer:
+    """Отправка запросов по расписанию в пуле потоков"""
+
+    def __init__(self, base_url, tokens=None, speed=1.0, concurrency=8, timeout=30, metrics_token=''):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.netloc = parts.netloc
+        self.base_path = parts.path.rstrip('/')
+        self.tokens = tokens or {}
+        self.speed = speed
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.metrics_token = metrics_token
+        self._local = threading.local()
+
+    def _connection(self):
+        # Одно keep-alive соединение на поток
+        conn = getattr(self._local, 'connection', None)
+        if conn is None:
+            conn_class = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+            conn = self._local.connection = conn_class(self.netloc, timeout=self.timeout)
+        return conn
+
+    def send(self, record):
+        headers = {'Accept': 'application/json'}
+        token = self.tokens.get(record['user'])
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        if self.metrics_token:
+            headers['X-Metrics-Token'] = self.metrics_token
+        body = None
+        if record['body'] is not None:
+            body = json.dumps(record['body'])
+            headers['Content-Type'] = 'application/json'
+
+        result = {'route': route_name(record['method'], record['path']), 'status': None, 'queries': None, 'db_ms': None}
+        start = time.perf_counter()
+        try:
+            conn = self._connection()
+            conn.request(record['method'], self.base_path + record['path'], body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            result['status'] = response.status
+            if response.getheader('X-Query-Count'):
+                result['queries'] = int(response.getheader('X-Query-Count'))
+            db_timing = SERVER_TIMING_DB.search(response.getheader('Server-Timing') or '')
+            if db_timing:
+                result['db_ms'] = float(db_timing.group(1))
+        except (OSError, http.client.HTTPException) as e:
+            self._local.connection = None
+            result['error'] = str(e)
+        result['latency_ms'] = (time.perf_counter() - start) * 1000
+        return result
+
+    def run(self, requests):
+        """
+        Returns:
+            tuple: (результаты запросов, длительность прогона в секундах)
+        """
+        futures = []
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for record in requests:
+                if self.speed:
+                    delay = start + record['offset'] / self.speed - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                futures.append(executor.submit(self.send, record))
+        return [future.result() for future in futures], time.monotonic() - start
+
+
+def summarize(results, duration):
+    """
+    Returns:
+        dict: итог прогона и перцентили по маршрутам
+    """
+    routes = {}
+    for result in results:
+        routes.setdefault(result['route'], []).append(result)
+
+    summary = {}
+    for route, items in sorted(routes.items(), key=lambda item: -len(item[1])):
+        latencies = [item['latency_ms'] for item in items]
+        errors = [item for item in items if item['status'] is None or item['status'] >= 500]
+        client_errors = [item for item in items if item['status'] is not None and 400 <= item['status'] < 500]
+        queries = [item['queries'] for item in items if item['queries'] is not None]
+        db_times = [item['db_ms'] for item in items if item['db_ms'] is not None]
+        summary[route] = {
+            'requests': len(items),
+            'p50_ms': round(_percentile(latencies, 50), 1),
+            'p95_ms': round(_percentile(latencies, 95), 1),
+            'p99_ms': round(_percentile(latencies, 99), 1),
+            'max_ms': round(max(latencies), 1),
+            'error_rate': round(len(errors) / len(items), 4),
+            'client_errors': len(client_errors),
+            'avg_queries': round(statistics.mean(queries), 1) if queries else None,
+            'avg_db_ms': round(statistics.mean(db_times), 1) if db_times else None,
+        }
+
+    errors = sum(1 for result in results if result['status'] is None or result['status'] >= 500)
+    return {
+        'requests': len(results),
+        'duration_s': round(duration, 2),
+        'throughput_rps': round(len(results) / duration, 1) if duration else None,
+        'error_rate': round(errors / len(results), 4) if results else 0,
+        'routes': summary,
+    }
@@ -0,0 +1,249 @@
+"""
+Журнал медленных SQL-запросов с планом выполнения.
+
+Каждое соединение с БД получает execute_wrapper (сигнал connection_created),
+который замеряет время запроса. Запрос дольше SLOW_QUERY_THRESHOLD_MS
+с вероятностью SLOW_QUERY_SAMPLE_RATE сохраняется в SlowQuery вместе
+с параметрами, маршрутом, строкой кода и стеком вызовов проекта.
+Для SELECT на PostgreSQL сразу снимается EXPLAIN (ANALYZE off, FORMAT JSON) —
+план без повторного выполнения запроса.
+
+Накладные расходы для быстрых запросов — два вызова perf_counter;
+запись в таблицу откладывается до конца HTTP-запроса (или следующего
+запроса вне транзакции).
+Один отпечаток SQL сохраняется не чаще раза в CAPTURE_INTERVAL секунд
+на процесс, таблица хранит последние SLOW_QUERY_LOG_SIZE записей
+(кольцевой буфер). Просмотр — в админке (Slow queries).
+Запись журнала не входит в метрики запроса (X-Query-Count, Prometheus).
+EXPLAIN, INSERT и очистка буфера выполняются на соединении запроса,
+поэтому по умолчанию сохраняется примерно каждый десятый медленный
+запрос (SLOW_QUERY_SAMPLE_RATE = 0.1).
+
+Настройки: SLOW_QUERY_LOG (вкл/выкл), SLOW_QUERY_THRESHOLD_MS,
+SLOW_QUERY_SAMPLE_RATE, SLOW_QUERY_LOG_SIZE.
+"""
+import json
+import logging
+import os
+import random
+import sys
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import DatabaseError, connections
+from django.db.backends.signals import connection_created
+
+from .instrumentation import PROJECT_ROOT, _WRAPPER_FILES, _capturing, _current, _query_origin, fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Один отпечаток — не чаще раза за интервал (секунды) на процесс
+CAPTURE_INTERVAL = 60
+MAX_PARAM_LENGTH = 200
+MAX_STACK_DEPTH = 15
+
+# Только DML: DDL миграций не журналируется
+RECORDED_STATEMENTS = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE')
+
+_last_captured = {}
+
+
+def _json_safe(value):
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    elif isinstance(value, (bytes, memoryview)):
+        value = f'<{len(value)} bytes>'
+    elif isinstance(value, Decimal):
+        value = str(value)
+    value = str(value)
+    return value if len(value) <= MAX_PARAM_LENGTH else value[:MAX_PARAM_LENGTH] + '…'
+
+
+def _project_stack():
+    """Кадры кода проекта от места вызова запроса (снизу вверх)"""
+    lines = []
+    frame = sys._getframe(2)
+    while frame is not None and len(lines) < MAX_STACK_DEPTH:
+        filename = frame.f_code.co_filename
+        if filename.startswith(PROJECT_ROOT) and filename not in _WRAPPER_FILES:
+            lines.append(f'{os.path.relpath(filename, settings.BASE_DIR)}:{frame.f_lineno} in {frame.f_code.co_name}')
+        frame = frame.f_back
+    return '\n'.join(lines)
+
+
+def _explain(connection, sql, params):
+    """
+    План запроса без выполнения. Курсор бэкенда без CursorWrapper, чтобы
+    EXPLAIN не попадал в execute_wrapper'ы; внутри транзакции — под точкой сохранения, чтобы
+    ошибка EXPLAIN не прервала транзакцию.
+    """
+    vendor = connection.vendor
+    if vendor == 'postgresql':
+        explain_sql = f'EXPLAIN (ANALYZE off, FORMAT JSON) {sql}'
+    elif vendor == 'sqlite':
+        explain_sql = f'EXPLAIN QUERY PLAN {sql}'
+    else:
+        return None
+
+    savepoint = connection.in_atomic_block and vendor == 'postgresql'
+    cursor = connection.create_cursor()
+    try:
+        if savepoint:
+            cursor.execute('SAVEPOINT slow_query_explain')
+        try:
+            if params:
+                cursor.execute(explain_sql, params)
+            else:
+                cursor.execute(explain_sql)
+            rows = cursor.fetchall()
+        except Exception:
+            if savepoint:
+                cursor.execute('ROLLBACK TO SAVEPOINT slow_query_explain')
+            logger.debug('EXPLAIN failed', exc_info=True)
+            return None
+        finally:
+            if savepoint:
+                cursor.execute('RELEASE SAVEPOINT slow_query_explain')
+    finally:
+        cursor.close()
+
+    if vendor == 'sqlite':
+        return [{'id': row[0], 'parent': row[1], 'detail': row[3]} for row in rows]
+    plan = rows[0][0]
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+
+def _save(alias, entries):
+    from .models import SlowQuery
+
+    manager = SlowQuery.objects.using(alias)
+    try:
+        manager.bulk_create([SlowQuery(**values) for values in entries])
+        # Кольцевой буфер: удаляем все, что старше последних SLOW_QUERY_LOG_SIZE
+        size = getattr(settings, 'SLOW_QUERY_LOG_SIZE', 1000)
+        cutoff = manager.order_by('-pk').values_list('pk', flat=True)[size:size + 1]
+        manager.filter(pk__lte=cutoff).delete()
+    except DatabaseError as exc:
+        # Например, до применения миграции с таблицей журнала
+        logger.warning('Slow query was not saved: %s', exc)
+
+
+class SlowQueryRecorder:
+    """
+    execute_wrapper: замер времени и захват медленных запросов.
+
+    Захваченные записи копятся в соединении и сохраняются перед следующим
+    запросом вне транзакции или по окончании HTTP-запроса — не посреди
+    чужого запроса и не в транзакции, которая может откатиться.
+    """
+
+    max_pending = 100
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.threshold = getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 200) / 1000
+        self.sample_rate = getattr(settings, 'SLOW_QUERY_SAMPLE_RATE', 0.1)
+        self.pending = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.pending and not self.connection.in_atomic_block and not _capturing.get():
+            self.flush()
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = time.perf_counter() - start
+        if duration >= self.threshold and not _capturing.get() and random.random() < self.sample_rate:
+            token = _capturing.set(True)
+            try:
+                self.capture(sql, params, many, duration)
+            except Exception:
+                logger.warning('Slow query capture failed', exc_info=True)
+            finally:
+                _capturing.reset(token)
+        return result
+
+    def capture(self, sql, params, many, duration):
+        statement = sql.lstrip()[:6].upper()
+        if not statement.startswith(RECORDED_STATEMENTS) or len(self.pending) >= self.max_pending:
+            return
+        key = fingerprint(sql)
+        now = time.monotonic()
+        if now - _last_captured.get(key, -CAPTURE_INTERVAL) < CAPTURE_INTERVAL:
+            return
+        _last_captured[key] = now
+
+        field, location = _query_origin(depth=3)
+        metrics = _current.get()
+        request = metrics.request if metrics is not None else None
+        match = getattr(request, 'resolver_match', None)
+
+        is_select = statement.startswith(('SELECT', 'WITH'))
+        values = {
+            'fingerprint': key,
+            'sql': sql,
+            'params': [] if many else _json_safe(params or []),
+            'duration_ms': round(duration * 1000, 2),
+            'database': self.connection.alias,
+            'view': (match.view_name if match else '') or '',
+            'path': request.path[:500] if request is not None else '',
+            'location': ' / '.join(filter(None, [location, field]))[:300],
+            'stack': _project_stack(),
+            'plan': _explain(self.connection, sql, params) if is_select and not many else None,
+        }
+        logger.warning(json.dumps({
+            'event': 'slow_query',
+            'duration_ms': values['duration_ms'],
+            'view': values['view'],
+            'location': values['location'],
+            'sql': key,
+        }, ensure_ascii=False))
+        self.pending.append(values)
+
+    def flush(self):
+        entries, self.pending = self.pending, []
+        if not entries:
+            return
+        token = _capturing.set(True)
+        try:
+            _save(self.connection.alias, entries)
+        finally:
+            _capturing.reset(token)
+
+
+def _recorder(connection):
+    for wrapper in connection.execute_wrappers:
+        if isinstance(wrapper, SlowQueryRecorder):
+            return wrapper
+    return None
+
+
+def install_recorder(sender, connection, **kwargs):
+    # В начало списка: connection.execute_wrapper() снимает при выходе последний элемент
+    if _recorder(connection) is None:
+        connection.execute_wrappers.insert(0, SlowQueryRecorder(connection))
+
+
+def flush_pending(**kwargs):
+    """Сохранить захваченные запросы всех соединений потока"""
+    for connection in connections.all(initialized_only=True):
+        recorder = _recorder(connection)
+        if recorder is not None and recorder.pending and not connection.in_atomic_block:
+            recorder.flush()
+
+
+def is_enabled():
+    return getattr(settings, 'SLOW_QUERY_LOG', False)
+
+
+def connect_slow_query_log():
+    """Подключение журнала к новым соединениям (вызывается из AppConfig.ready)"""
+    connection_created.connect(install_recorder, weak=False, dispatch_uid='slow_queries:recorder')
+    request_finished.connect(flush_pending, weak=False, dispatch_uid='slow_queries:flush')
@@ -0,0 +1,409 @@
+"""
+Синтетические данные реестра для нагрузочного тестирования.
+
+Данные детерминированы: один и тот же seed дает одни и те же строки.
+Распределения приближены к реальным: использование тегов, компании,
+популярность модулей и активность пользователей — по закону Ципфа
+(немногие лидеры и длинный хвост).
+
+Строки, id которых нужны дальше (пользователи, теги, модули), вставляются
+через bulk_create; остальные таблицы — COPY на PostgreSQL, иначе INSERT
+пачками (executemany) без экземпляров моделей. Сигналы не срабатывают, поэтому в конце пересчитываются
+счетчики пользователей, рейтинги и версии данных.
+
+Команда: python manage.py seed_registry
+"""
+import csv
+import io
+import json
+import random
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from itertools import accumulate
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.utils import timezone
+
+BATCH_SIZE = 5000
+
+# Префикс всех сгенерированных имен: по нему данные находятся и удаляются
+PREFIX = 'synthetic'
+
+COUNTRIES = [
+    ('Russia', 'Россия', 'RUS', '🇷🇺'),
+    ('China', 'Китай', 'CHN', '🇨🇳'),
+    ('India', 'Индия', 'IND', '🇮🇳'),
+    ('Brazil', 'Бразилия', 'BRA', '🇧🇷'),
+    ('South Africa', 'ЮАР', 'ZAF', '🇿🇦'),
+    ('Egypt', 'Египет', 'EGY', '🇪🇬'),
+    ('Ethiopia', 'Эфиопия', 'ETH', '🇪🇹'),
+    ('Iran', 'Иран', 'IRN', '🇮🇷'),
+    ('United Arab Emirates', 'ОАЭ', 'ARE', '🇦🇪'),
+    ('Indonesia', 'Индонезия', 'IDN', '🇮🇩'),
+]
+TAG_CATEGORIES = [
+    ('Type of service', 'Тип сервиса (Услуги)', 'service-type'),
+    ('Scope of application', 'Область применения', 'application-area'),
+    ('Type of technologes', 'Тип технологии', 'technology-type'),
+]
+WORDS = [
+    'vision', 'speech', 'language', 'forecast', 'search', 'medical', 'agro', 'finance',
+    'retail', 'robot', 'translate', 'detect', 'classify', 'segment', 'recommend', 'assistant',
+    'energy', 'transport', 'security', 'education', 'legal', 'geo', 'climate', 'document',
+]
+COMPANY_SUFFIXES = ['Labs', 'AI', 'Technologies', 'Systems', 'Research', 'Group']
+USAGE_STATUSES = ['Используется', 'Пилот', 'Разработка']
+ABILITIES = ['Коммерческий', 'Открытый', 'Внутренний']
+LICENSES = ['MIT', 'Apache 2.0', 'Proprietary', 'GPL-3.0', 'CC BY 4.0']
+JOURNALS = ['NeurIPS', 'ICML', 'ACL', 'CVPR', 'Doklady Mathematics', 'Journal of AI Research']
+
+# Доли статусов модулей
+STATUS_WEIGHTS = {'active': 80, 'on_review': 8, 'draft': 7, 'rejected': 4, 'blocked': 1}
+
+
+def zipf_cum_weights(count, exponent=1.1):
+    """Накопленные веса закона Ципфа для rng.choices(cum_weights=...)"""
+    return list(accumulate(1 / rank ** exponent for rank in range(1, count + 1)))
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Отключить auto_now / auto_now_add, чтобы записать исторические даты"""
+    saved = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                saved.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _copy_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _prepare(field, value, db):
+    # Числа и строки передаются как есть, остальное (даты, JSON) адаптирует поле
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    return field.get_db_prep_save(value, db)
+
+
+def insert_rows(model, fields, rows, use_copy=True):
+    """
+    Вставить строки без создания экземпляров моделей.
+
+    Args:
+        model: модель
+        fields: имена полей (attname: 'ai_module_id', ...)
+        rows: кортежи значений в порядке fields
+        use_copy: COPY на PostgreSQL (иначе INSERT пачками)
+
+    Returns:
+        int: количество строк
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    opts = model._meta
+    model_fields = [opts.get_field(field) for field in fields]
+    table = connection.ops.quote_name(opts.db_table)
+    columns = ', '.join(connection.ops.quote_name(field.column) for field in model_fields)
+
+    with connection.cursor() as cursor:
+        if use_copy and connection.vendor == 'postgresql':
+            from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+            for offset in range(0, len(rows), BATCH_SIZE * 20):
+                buffer = io.StringIO()
+                # Строки в кавычках, None без кавычек — в формате csv это NULL
+                writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+                for row in rows[offset:offset + BATCH_SIZE * 20]:
+                    writer.writerow([_copy_value(value) for value in row])
+                copy_sql = f'COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)'
+                if is_psycopg3:
+                    with cursor.copy(copy_sql) as copy:
+                        copy.write(buffer.getvalue())
+                else:
+                    buffer.seek(0)
+                    cursor.copy_expert(copy_sql, buffer)
+        else:
+            sql = f'INSERT INTO {table} ({columns}) VALUES ({", ".join(["%s"] * len(fields))})'
+            db = connections[DEFAULT_DB_ALIAS]
+            for offset in range(0, len(rows), BATCH_SIZE):
+                cursor.executemany(sql, [
+                    [_prepare(field, value, db) for field, value in zip(model_fields, row)]
+                    for row in rows[offset:offset + BATCH_SIZE]
+                ])
+    return len(rows)
+
+
+def _random_datetime(rng, start, end):
+    return start + timedelta(seconds=rng.uniform(0, (end - start).total_seconds()))
+
+
+@transaction.atomic
+def delete_dataset():
+    """
+    Удалить ранее сгенерированные данные (по префиксу имен).
+
+    Удаление идет DELETE по таблицам без загрузки объектов и сигналов
+    (на миллионах лайков Collector слишком медленный); производные данные
+    пересчитываются после фиксации.
+
+    Returns:
+        int: количество удаленных строк
+    """
+    from django.contrib.contenttypes.models import ContentType
+
+    from apps.accounts.models import User, UserProfile
+    from apps.ai_modules.models import AIModule, AIModuleDetail, AIModuleLike
+    from apps.common.models import AuditLog
+    from apps.publications.models import Publication
+    from apps.tags.models import AIModuleTag, Tag
+
+    users = User.objects.filter(username__startswith=f'{PREFIX}_')
+    modules = AIModule.objects.filter(slug__startswith=f'{PREFIX}-')
+    tags = Tag.objects.filter(slug__startswith=f'{PREFIX}-')
+    querysets = [
+        AuditLog.objects.filter(performed_by__in=users),
+        AuditLog.objects.filter(
+            content_type=ContentType.objects.get_for_model(AIModule), object_id__in=modules.values('pk')
+        ),
+        AIModuleLike.objects.filter(ai_module__in=modules),
+        AIModuleLike.objects.filter(user__in=users),
+        AIModuleTag.objects.filter(ai_module__in=modules),
+        AIModuleTag.objects.filter(tag__in=tags),
+        Publication.objects.filter(ai_module__in=modules),
+        AIModuleDetail.objects.filter(ai_module__in=modules),
+        UserProfile.objects.filter(user__in=users),
+        tags,
+        modules,
+        users,
+    ]
+    deleted = 0
+    for queryset in querysets:
+        deleted += queryset._raw_delete(queryset.db)
+    transaction.on_commit(_refresh_derived_data)
+    return deleted
+
+
+@transaction.atomic
+def generate_dataset(modules=1000, users=None, likes=None, seed=42, years=3, until=None,
+                     use_copy=True, audit=True):
+    """
+    Заполнить БД синтетическим реестром.
+
+    Args:
+        modules: количество модулей
+        users: количество пользователей (по умолчанию modules // 5, не меньше 20)
+        likes: количество лайков (по умолчанию 5 на модуль)
+        seed: зерно генератора
+        years: за сколько лет распределены даты создания
+        until: дата, до начала которой идут даты (по умолчанию сегодня);
+            при одинаковых seed и until данные совпадают
+        use_copy: COPY на PostgreSQL
+        audit: создавать журнал аудита (создание, модерация, лайки)
+
+    Returns:
+        dict: таблица -> количество созданных строк
+    """
+    from django.contrib.contenttypes.models import ContentType
+
+    from apps.accounts.models import User, UserProfile
+    from apps.ai_modules.models import AIModule, AIModuleDetail, AIModuleLike, Availability, UsageStatus
+    from apps.common.models import AuditLog, Country
+    from apps.publications.models import Publication
+    from apps.tags.models import AIModuleTag, Tag, TagCategory
+
+    rng = random.Random(seed)
+    users = users or max(20, modules // 5)
+    likes = modules * 5 if likes is None else likes
+    until = until or timezone.localdate()
+    now = datetime.combine(until, time.min, tzinfo=dt_timezone.utc)
+    start = now - timedelta(days=365 * years)
+    counts = {}
+
+    countries = []
+    for name, name_ru, code, flag in COUNTRIES:
+        country = Country.objects.filter(code=code).first() or Country.objects.filter(name=name).first()
+        if country is None:
+            country = Country.objects.create(name=name, name_ru=name_ru, code=code, flag_emoji=flag)
+        countries.append(country)
+    country_weights = zipf_cum_weights(len(countries), exponent=0.8)
+    availabilities = [Availability.from_text(value) for value in ABILITIES]
+    usage_statuses = [UsageStatus.from_text(value) for value in USAGE_STATUSES]
+
+    # Пользователи: даты регистрации равномерно, первые — администраторы
+    user_objects = []
+    for index in range(users):
+        country = rng.choices(countries, cum_weights=country_weights)[0]
+        joined = _random_datetime(rng, start, now)
+        user_objects.append(User(
+            username=f'{PREFIX}_{seed}_{index}',
+            email=f'{PREFIX}.{seed}.{index}@example.com',
+            password='!',  # непригодный пароль: входить под этими пользователями нельзя
+            first_name=rng.choice(['Ivan', 'Li', 'Arjun', 'Ana', 'Thabo', 'Omar', 'Sara', 'Reza']),
+            last_name=f'User{index}',
+            role=User.Role.ADMIN if index < max(1, users // 100) else User.Role.USER,
+            organization=f'{rng.choice(WORDS).title()} {rng.choice(COMPANY_SUFFIXES)}',
+            country=country.name,
+            date_joined=joined,
+            created_at=joined,
+            updated_at=joined,
+        ))
+    with explicit_timestamps(User):
+        user_objects = User.objects.bulk_create(user_objects, batch_size=BATCH_SIZE)
+    counts['users'] = len(user_objects)
+    counts['profiles'] = insert_rows(UserProfile, ('user_id', 'bio', 'expertise_areas'), (
+        (user.pk, f'Synthetic profile of {user.first_name}', ', '.join(rng.sample(WORDS, 3)))
+        for user in user_objects
+    ), use_copy)
+    admins = [user for user in user_objects if user.role == User.Role.ADMIN]
+
+    # Теги: по 10 на категорию на каждую 1000 модулей
+    categories = [
+        TagCategory.objects.get_or_create(slug=slug, defaults={'name': name, 'name_ru': name_ru})[0]
+        for name, name_ru, slug in TAG_CATEGORIES
+    ]
+    tags_per_category = max(5, modules // 100)
+    tags = Tag.objects.bulk_create([
+        Tag(
+            category=category,
+            name=f'{rng.choice(WORDS).title()} {index}',
+            name_ru=f'Тег {category.name_ru} {index}',
+            slug=f'{PREFIX}-{seed}-{category.slug}-{index}',
+            color=f'#{rng.randrange(0x1000000):06x}',
+            created_by=rng.choice(admins),
+        )
+        for category in categories
+        for index in range(tags_per_category)
+    ], batch_size=BATCH_SIZE)
+    counts['tags'] = len(tags)
+    # Порядок тегов случаен, веса Ципфа — по позиции: популярные теги в разных категориях
+    rng.shuffle(tags)
+    tag_weights = zipf_cum_weights(len(tags))
+
+    # Компании и авторы — тоже с длинным хвостом
+    companies = [
+        f'{rng.choice(WORDS).title()} {rng.choice(COMPANY_SUFFIXES)} {index}'
+        for index in range(max(10, modules // 10))
+    ]
+    company_weights = zipf_cum_weights(len(companies))
+    author_weights = zipf_cum_weights(len(user_objects))
+    statuses = list(STATUS_WEIGHTS)
+    status_weights = list(STATUS_WEIGHTS.values())
+
+    module_objects = []
+    for index in range(modules):
+        words = rng.sample(WORDS, 3)
+        created_at = _random_datetime(rng, start, now)
+        status = rng.choices(statuses, weights=status_weights)[0]
+        module_objects.append(AIModule(
+            name=f'{" ".join(words).title()} {index}',
+            name_ru=f'Модуль {index}',
+            slug=f'{PREFIX}-{seed}-{index}',
+            company=rng.choices(companies, cum_weights=company_weights)[0],
+            country=rng.choices(countries, cum_weights=country_weights)[0],
+            params_count=int(10 ** rng.uniform(6, 12)),
+            task_short_description=f'Models for {words[0]} and {words[1]} in {words[2]}',
+            license_type=rng.choice(LICENSES),
+            status=status,
+            created_by=rng.choices(user_objects, cum_weights=author_weights)[0],
+            created_at=created_at,
+            updated_at=created_at,
+            published_at=created_at + timedelta(days=rng.randint(1, 30)) if status == 'active' else None,
+            version=f'{rng.randint(1, 5)}.{rng.randint(0, 9)}.{rng.randint(0, 9)}',
+        ))
+    with explicit_timestamps(AIModule):
+        module_objects = AIModule.objects.bulk_create(module_objects, batch_size=BATCH_SIZE)
+    counts['modules'] = len(module_objects)
+
+    details, module_tags, publications = [], [], []
+    for module in module_objects:
+        availability = rng.choice(availabilities)
+        usage_status = rng.choice(usage_statuses)
+        details.append((
+            module.pk, f'{module.name}: {module.task_short_description}', 'Synthetic record',
+            usage_status.name_ru, availability.name_ru, availability.pk, usage_status.pk,
+        ))
+        for tag in {*rng.choices(tags, cum_weights=tag_weights, k=rng.randint(1, 6))}:
+            module_tags.append((module.pk, tag.pk, module.created_at))
+        for number in range(rng.choices([0, 1, 2, 3, 5], weights=[40, 30, 15, 10, 5])[0]):
+            published = module.created_at.date() - timedelta(days=rng.randrange(1000))
+            publications.append((
+                module.pk, f'{module.name}: paper {number + 1}', f'{module.created_by.last_name} et al.',
+                rng.choice(JOURNALS), published, f'10.{rng.randint(1000, 9999)}/{PREFIX}.{module.pk}.{number}',
+                '', module.created_at, module.created_at, module.created_by_id,
+            ))
+    counts['details'] = insert_rows(AIModuleDetail, (
+        'ai_module_id', 'description', 'technical_info', 'status', 'ability', 'availability_id', 'usage_status_id'
+    ), details, use_copy)
+    counts['module_tags'] = insert_rows(AIModuleTag, ('ai_module_id', 'tag_id', 'assigned_at'), module_tags, use_copy)
+    counts['publications'] = insert_rows(Publication, (
+        'ai_module_id', 'title', 'authors', 'journal_conference', 'publication_date', 'doi',
+        'url', 'created_at', 'updated_at', 'added_by_id',
+    ), publications, use_copy)
+
+    # Лайки: модуль и пользователь выбираются по весам Ципфа, повторные пары отбрасываются
+    active_modules = [module for module in module_objects if module.status == 'active']
+    rng.shuffle(active_modules)
+    like_pairs = {}
+    if active_modules:
+        module_weights = zipf_cum_weights(len(active_modules), exponent=0.9)
+        user_weights = zipf_cum_weights(len(user_objects), exponent=0.7)
+        attempts = 0
+        limit = min(likes, len(active_modules) * len(user_objects))
+        while len(like_pairs) < limit and attempts < 5:
+            needed = limit - len(like_pairs)
+            picked_modules = rng.choices(range(len(active_modules)), cum_weights=module_weights, k=needed)
+            picked_users = rng.choices(range(len(user_objects)), cum_weights=user_weights, k=needed)
+            for module_index, user_index in zip(picked_modules, picked_users):
+                like_pairs.setdefault((module_index, user_index), None)
+            attempts += 1
+    like_rows = []
+    for module_index, user_index in like_pairs:
+        module = active_modules[module_index]
+        like_rows.append((user_objects[user_index].pk, module.pk, _random_datetime(rng, module.created_at, now)))
+    counts['likes'] = insert_rows(AIModuleLike, ('user_id', 'ai_module_id', 'created_at'), like_rows, use_copy)
+
+    if audit:
+        module_type = ContentType.objects.get_for_model(AIModule).pk
+        audit_rows = []
+        for module in module_objects:
+            audit_rows.append((module_type, module.pk, 'create', module.created_by_id, module.created_at, '', {}, {}))
+            if module.status in ('active', 'rejected'):
+                audit_rows.append((
+                    module_type, module.pk, 'approve' if module.status == 'active' else 'reject',
+                    rng.choice(admins).pk, module.created_at + timedelta(hours=rng.randint(1, 72)), '',
+                    {'status': 'on_review'}, {'status': module.status},
+                ))
+        for user_id, module_id, created_at in like_rows:
+            audit_rows.append((module_type, module_id, 'like', user_id, created_at, '', {}, {}))
+        counts['audit_logs'] = insert_rows(AuditLog, (
+            'content_type_id', 'object_id', 'action', 'performed_by_id', 'timestamp', 'comment',
+            'old_values', 'new_values',
+        ), audit_rows, use_copy)
+
+    transaction.on_commit(_refresh_derived_data)
+    return counts
+
+
+def _refresh_derived_data():
+    """Счетчики, рейтинги и версии данных после вставки в обход сигналов"""
+    from apps.accounts.stats import recount_user_stats
+    from apps.common import leaderboards
+    from apps.common.versions import VERSION_DEPENDENCIES, bump_versions
+
+    recount_user_stats()
+    for board in leaderboards.LEADERBOARDS.values():
+        board.rebuild()
+    bump_versions(list(VERSION_DEPENDENCIES))
@@ -0,0 +1,105 @@
+"""
+Отслеживание измененных полей модели.
+
+При загрузке из БД (from_db) запоминаются значения загруженных полей;
+перед сохранением они сравниваются с текущими, и разница доступна
+без повторного запроса. Отложенные (defer/only) поля не отслеживаются.
+"""
+import datetime
+import decimal
+import uuid
+
+
+def _json_value(value):
+    """Значение поля в JSON-совместимом виде для AuditLog"""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if hasattr(value, 'name') and hasattr(value, 'url'):
+        # FieldFile
+        return value.name or None
+    return value
+
+
+class FieldTrackerMixin:
+    """
+    Миксин модели: снимок загруженных значений и разница при сохранении.
+
+    Атрибуты:
+        tracker_exclude: поля, не попадающие в разницу (например, auto_now)
+
+    Во время и после save() разница сохранения лежит в saved_changes:
+    {имя поля: (старое значение, новое значение)}.
+    """
+
+    tracker_exclude = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_fields()
+        return instance
+
+    def _tracked_fields(self):
+        deferred = self.get_deferred_fields()
+        return [
+            field for field in self._meta.concrete_fields
+            if field.attname not in deferred and field.name not in self.tracker_exclude
+        ]
+
+    def _snapshot_fields(self):
+        self._loaded_values = {
+            field.attname: field.value_from_object(self) for field in self._tracked_fields()
+        }
+
+    def get_dirty_fields(self):
+        """
+        Returns:
+            dict: {имя поля: (старое значение, новое значение)} для измененных
+            загруженных полей; у нового объекта пусто
+        """
+        loaded = getattr(self, '_loaded_values', None)
+        if not loaded:
+            return {}
+        changes = {}
+        for field in self._tracked_fields():
+            if field.attname not in loaded:
+                continue
+            old = loaded[field.attname]
+            new = field.value_from_object(self)
+            if old != new:
+                changes[field.name] = (old, new)
+        return changes
+
+    def has_changed(self, field_name):
+        return field_name in self.get_dirty_fields()
+
+    def get_loaded_value(self, field_name):
+        """Значение поля на момент загрузки из БД (текущее, если не отслеживается)"""
+        field = self._meta.get_field(field_name)
+        loaded = getattr(self, '_loaded_values', {})
+        return loaded.get(field.attname, field.value_from_object(self))
+
+    def save(self, *args, **kwargs):
+        # Разница доступна и обработчикам pre_save / post_save этого сохранения
+        changes = self.get_dirty_fields()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            changes = {name: value for name, value in changes.items() if name in update_fields}
+        self.saved_changes = changes
+        super().save(*args, **kwargs)
+        self._snapshot_fields()
+
+    def get_audit_values(self, prefix=''):
+        """
+        Разница последнего сохранения для AuditLog.old_values / new_values.
+
+        Returns:
+            tuple: (old_values, new_values) только по измененным полям
+        """
+        old_values, new_values = {}, {}
+        for name, (old, new) in getattr(self, 'saved_changes', {}).items():
+            old_values[prefix + name] = _json_value(old)
+            new_values[prefix + name] = _json_value(new)
+        return old_values, new_values
@@ -11,7 +11,7 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
-def send_notification_email(user, subject, template_name, context=None):
+def send_notification_email(user, subject, template_name, context=None, connection=None):
     """
     Отправка уведомлений по email
     
@@ -20,6 +20,7 @@ def send_notification_email(user, subject, template_name, context=None):
         subject: тема письма
         template_name: имя шаблона без расширения
         context: дополнительный контекст для шаблона
+        connection: открытое соединение почтового бэкенда (для серии писем)
     
     Returns:
         bool: True если письмо отправлено, False если ошибка
@@ -45,6 +46,7 @@ def send_notification_email(user, subject, template_name, context=None):
             from_email=settings.DEFAULT_FROM_EMAIL,
             recipient_list=[user.email],
             fail_silently=False,
+            connection=connection,
         )
         
         logger.info(f"Email sent to {user.email}: {subject}")
@@ -54,6 +56,47 @@ def send_notification_email(user, subject, template_name, context=None):
         logger.error(f"Failed to send email to {user.email}: {str(e)}")
         return False
 
+def send_notification_emails(notifications):
+    """
+    Серия уведомлений через одно соединение почтового бэкенда
+
+    Args:
+        notifications: список (user, subject, template_name, context)
+    """
+    from django.core.mail import get_connection
+    from django.db import connections
+
+    try:
+        with get_connection() as connection:
+            for user, subject, template_name, context in notifications:
+                send_notification_email(user, subject, template_name, context, connection=connection)
+    except Exception as e:
+        logger.error(f"Failed to send notifications: {str(e)}")
+    finally:
+        # Соединения с БД потока, если шаблоны обращались к моделям
+        connections.close_all()
+
+_notification_executor = None
+
+def enqueue_notification_emails(notifications):
+    """
+    Отправить уведомления в фоне после фиксации транзакции
+    (один рабочий поток на процесс, запрос не ждет SMTP)
+
+    Args:
+        notifications: список (user, subject, template_name, context)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from django.db import transaction
+
+    global _notification_executor
+    notifications = list(notifications)
+    if not notifications:
+        return
+    if _notification_executor is None:
+        _notification_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='notifications')
+    transaction.on_commit(lambda: _notification_executor.submit(send_notification_emails, notifications))
+
 def log_user_action(user, action, obj=None, comment=None, request=None):
     """
     Логирование действий пользователя
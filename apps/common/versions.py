@@ -0,0 +1,120 @@
+"""
+Версии данных по группам таблиц.
+
+Каждая группа ('modules', 'tags', ...) хранит в кеше метку времени последнего
+изменения. Метки обновляются сигналами моделей и используются как дешевые
+валидаторы (ETag) без обращения к базе данных.
+
+Для модели можно указать поля: тогда сохранение существующей строки меняет
+версию группы, только если изменилось одно из них (по saved_changes
+apps.common.tracking.FieldTrackerMixin). Так вход пользователя (last_login)
+не сбрасывает ответы со списками модулей.
+
+Метка меняется только после фиксации транзакции: иначе параллельный GET
+увидел бы новую версию со старыми строками и закешировал бы их под ней
+(apps.api.response_cache).
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+VERSION_KEY_PREFIX = 'data_version'
+
+# Группа -> модели (или (модель, поля)), изменения которых меняют версию группы
+VERSION_DEPENDENCIES = {
+    'modules': (
+        'ai_modules.AIModule',
+        'ai_modules.AIModuleDetail',
+        'ai_modules.AIModuleFile',
+        'ai_modules.Availability',
+        'ai_modules.UsageStatus',
+    ),
+    'likes': ('ai_modules.AIModuleLike',),
+    'tags': ('tags.Tag', 'tags.TagCategory', 'tags.AIModuleTag'),
+    'publications': ('publications.Publication',),
+    'countries': ('common.Country',),
+    # Автор модуля в ответах о модулях
+    'authors': (
+        ('accounts.User', ('username', 'first_name', 'last_name', 'email', 'organization')),
+    ),
+    # Пользователи в аналитике; счетчики вклада отмечает apps.accounts.stats
+    'users': (
+        ('accounts.User', ('username', 'role', 'country', 'is_active', 'is_blocked', 'date_joined')),
+    ),
+    'audit': ('common.AuditLog',),
+}
+
+
+def _version_key(name):
+    return f'{VERSION_KEY_PREFIX}:{name}'
+
+
+def get_versions(names):
+    """
+    Текущие версии групп.
+
+    Args:
+        names: список групп из VERSION_DEPENDENCIES
+
+    Returns:
+        dict: группа -> метка времени последнего изменения
+    """
+    keys = {_version_key(name): name for name in names}
+    found = cache.get_many(list(keys))
+    versions = {}
+    for key, name in keys.items():
+        value = found.get(key)
+        if value is None:
+            # Кеш очищен: начинаем отсчет заново, add не перезапишет параллельную запись
+            cache.add(key, time.time(), None)
+            value = cache.get(key) or time.time()
+        versions[name] = value
+    return versions
+
+
+def _set_versions(names):
+    now = time.time()
+    cache.set_many({_version_key(name): now for name in names}, None)
+
+
+def bump_versions(names):
+    """Отметить группы как измененные (после фиксации текущей транзакции; вне транзакции — сразу)"""
+    names = tuple(names)
+    transaction.on_commit(lambda: _set_versions(names))
+
+
+def _changed_fields(instance, created):
+    """Поля, измененные сохранением существующей строки; None — неизвестно"""
+    if created is not False or not hasattr(instance, '_loaded_values'):
+        # Новая или удаленная строка, либо модель без FieldTrackerMixin
+        return None
+    return set(getattr(instance, 'saved_changes', ()))
+
+
+def _make_receiver(groups):
+    def receiver(sender, instance, created=None, **kwargs):
+        changed = _changed_fields(instance, created)
+        names = [
+            name for name, fields in groups
+            if fields is None or changed is None or changed.intersection(fields)
+        ]
+        if names:
+            bump_versions(names)
+    return receiver
+
+
+def connect_version_signals():
+    """Подключение сигналов моделей к версиям групп (вызывается из AppConfig.ready)"""
+    groups_by_model = {}
+    for name, models in VERSION_DEPENDENCIES.items():
+        for model in models:
+            model, fields = (model, None) if isinstance(model, str) else model
+            groups_by_model.setdefault(model, []).append((name, fields))
+
+    for model, groups in groups_by_model.items():
+        receiver = _make_receiver(tuple(groups))
+        uid = f'data_version:{model}'
+        post_save.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+        post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
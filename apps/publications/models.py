@@ -1,10 +1,11 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth import get_user_model
+from apps.common.tracking import FieldTrackerMixin
 
 User = get_user_model()
 
-class Publication(models.Model):
+class Publication(FieldTrackerMixin, models.Model):
     """Научная публикация, связанная с ИИ-моделью"""
     
     ai_module = models.ForeignKey(
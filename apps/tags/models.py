@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
+from apps.common.tracking import FieldTrackerMixin
 
 
 User = get_user_model()
@@ -23,7 +24,7 @@ class TagCategory(models.Model):
     def __str__(self):
         return self.name
 
-class Tag(models.Model):
+class Tag(FieldTrackerMixin, models.Model):
     """Теги для ИИ-моделей"""
     
     category = models.ForeignKey(
@@ -0,0 +1,66 @@
+"""
+Синхронизация набора тегов модуля.
+
+Вместо удаления всех связей и повторного создания считается разница
+с текущими назначениями: новые связи добавляются одним bulk_create,
+лишние удаляются одним отфильтрованным DELETE. У сохранившихся связей
+остаются assigned_at / assigned_by.
+
+Используется API (PUT/PATCH /ai-modules/{id}/tags/, AIModuleUpdateSerializer),
+админкой модулей и импортом.
+"""
+from collections import Counter
+
+from django.db import transaction
+
+from apps.common import leaderboards
+from apps.common.versions import bump_versions
+
+from .models import AIModuleTag, Tag
+
+
+def tags_assigned(links):
+    """
+    То, что делает post_save AIModuleTag, для связей из bulk_create:
+    рейтинг использования тегов и версия группы 'tags'.
+    """
+    for tag_id, count in Counter(link.tag_id for link in links).items():
+        leaderboards.tag_usage.incr_existing(tag_id, count)
+    if links:
+        bump_versions(['tags'])
+
+
+@transaction.atomic
+def sync_module_tags(ai_module, tag_ids=None, add=(), remove=(), assigned_by=None, only_active=True):
+    """
+    Привести теги модуля к набору tag_ids или изменить текущий набор (add / remove).
+
+    Args:
+        ai_module: модуль (или его id)
+        tag_ids: итоговый набор ID тегов; None — текущий набор + add - remove
+        add, remove: ID тегов, которые нужно добавить / убрать
+        assigned_by: пользователь для новых связей
+        only_active: отбросить несуществующие и неактивные теги
+            (False — ID уже проверены вызывающим кодом)
+
+    Returns:
+        dict: tag_ids — итоговый набор, added / removed — изменения (отсортированные ID)
+    """
+    module_id = getattr(ai_module, 'pk', ai_module)
+    current = set(AIModuleTag.objects.filter(ai_module_id=module_id).values_list('tag_id', flat=True))
+    desired = set(tag_ids) if tag_ids is not None else (current | set(add)) - set(remove)
+    if only_active and desired:
+        desired = set(Tag.objects.filter(pk__in=desired, is_active=True).values_list('pk', flat=True))
+
+    added = sorted(desired - current)
+    removed = sorted(current - desired)
+    if removed:
+        # post_delete каждой связи обновляет рейтинг и версию
+        AIModuleTag.objects.filter(ai_module_id=module_id, tag_id__in=removed).delete()
+    if added:
+        links = AIModuleTag.objects.bulk_create([
+            AIModuleTag(ai_module_id=module_id, tag_id=tag_id, assigned_by=assigned_by)
+            for tag_id in added
+        ])
+        tags_assigned(links)
+    return {'tag_ids': sorted(desired), 'added': added, 'removed': removed}
@@ -0,0 +1,15 @@
+# gunicorn -c config/gunicorn.conf.py config.wsgi
+#
+# Для метрик Prometheus с несколькими воркерами задайте PROMETHEUS_MULTIPROC_DIR
+# (пустой каталог при каждом запуске): воркеры пишут значения в файлы,
+# /metrics суммирует их (apps.common.metrics).
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '127.0.0.1:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', 4))
+
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -48,6 +48,7 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'apps.common.instrumentation.RequestInstrumentationMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -111,9 +112,15 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'apps.api.renderers.ORJSONRenderer',
+        'apps.api.renderers.MessagePackRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
     ],
+    'DEFAULT_PARSER_CLASSES': [
+        'apps.api.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     # 'DEFAULT_THROTTLE_CLASSES': [
     #     'rest_framework.throttling.AnonRateThrottle',
@@ -129,6 +136,34 @@ REST_FRAMEWORK = {
     'EXCEPTION_HANDLER': 'apps.api.exceptions.custom_exception_handler',
 }
 
+# Сборка JSON списков модулей на стороне PostgreSQL (apps.api.db_json)
+API_DB_JSON_RENDERING = config('API_DB_JSON_RENDERING', default=False, cast=bool)
+
+# Максимум модулей в одном POST /ai-modules/bulk/
+API_BULK_CREATE_MAX_ITEMS = config('API_BULK_CREATE_MAX_ITEMS', default=500, cast=int)
+# Максимум модулей в одном POST /ai-modules/moderate/
+API_BULK_MODERATE_MAX_ITEMS = config('API_BULK_MODERATE_MAX_ITEMS', default=1000, cast=int)
+
+# Фоновый импорт CSV из админки (apps.ai_modules.import_jobs)
+IMPORT_JOB_CHUNK_SIZE = config('IMPORT_JOB_CHUNK_SIZE', default=50, cast=int)  # строк на транзакцию
+IMPORT_JOB_STALE_AFTER = config('IMPORT_JOB_STALE_AFTER', default=300, cast=int)  # сек. без heartbeat -> задачу можно продолжить
+IMPORT_JOB_MAX_ERRORS = config('IMPORT_JOB_MAX_ERRORS', default=1000, cast=int)  # сколько ошибок строк хранить
+
+# Метрики SQL / кеша / сериализации на запрос (apps.common.instrumentation)
+REQUEST_INSTRUMENTATION = config('REQUEST_INSTRUMENTATION', default=True, cast=bool)
+N_PLUS_ONE_THRESHOLD = config('N_PLUS_ONE_THRESHOLD', default=5, cast=int)
+
+# Журнал медленных запросов с EXPLAIN (apps.common.slow_queries, админка)
+SLOW_QUERY_LOG = config('SLOW_QUERY_LOG', default=True, cast=bool)
+SLOW_QUERY_THRESHOLD_MS = config('SLOW_QUERY_THRESHOLD_MS', default=200, cast=int)
+SLOW_QUERY_SAMPLE_RATE = config('SLOW_QUERY_SAMPLE_RATE', default=0.1, cast=float)  # доля медленных запросов с EXPLAIN и записью
+SLOW_QUERY_LOG_SIZE = config('SLOW_QUERY_LOG_SIZE', default=1000, cast=int)
+
+# Метрики Prometheus (/metrics, apps.common.metrics); без токена /metrics доступен только администраторам
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='')
+CELERY_METRICS_QUEUES = config('CELERY_METRICS_QUEUES', default='celery').split(',')
+
 # JWT Configuration
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
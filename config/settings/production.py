@@ -0,0 +1,13 @@
+from .base import *
+
+DEBUG = False
+
+# В продакшене отдаем только JSON: BrowsableAPIRenderer рендерит HTML-шаблон
+# с формами на каждый запрос из браузера
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': [
+        'apps.api.renderers.ORJSONRenderer',
+        'apps.api.renderers.MessagePackRenderer',
+    ],
+}
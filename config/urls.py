@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from apps.common.metrics import metrics_view
 from drf_spectacular.views import (
     SpectacularAPIView, 
     SpectacularRedocView, 
@@ -25,6 +26,9 @@ urlpatterns = [
     
     # Здоровье приложения
     path('health/', include('apps.common.urls')),
+    
+    # Метрики Prometheus
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 # Статические и медиа файлы для разработки